@@ -0,0 +1,50 @@
+"""Maintenance commands.
+
+Usage (from backend/):
+    python -m app.cli migrate
+    python -m app.cli rebuild-daily-pnl [--user-id ID]
+    python -m app.cli rebuild-trades (--user-id ID | --all)
+"""
+import argparse
+import logging
+
+from sqlalchemy import select
+
+from .crud import daily_pnl as daily_pnl_crud
+from .database.database import SessionLocal, engine
+from .database.migrations import run_migrations
+from .models import User
+from .services import trade_rebuild_service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="Create missing tables and apply pending schema migrations")
+    rebuild = commands.add_parser("rebuild-daily-pnl", help="Recompute the calendar rollup from the trades table")
+    rebuild.add_argument("--user-id", type=int, help="Only this user (default: everyone)")
+    rebuild_trades = commands.add_parser("rebuild-trades", help="Replay the orders and replace the trades")
+    target = rebuild_trades.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user-id", type=int, help="Only this user")
+    target.add_argument("--all", action="store_true", help="Every user")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "migrate":
+        run_migrations(engine)
+    elif args.command == "rebuild-daily-pnl":
+        with SessionLocal() as db:
+            users = daily_pnl_crud.rebuild(db, user_id=args.user_id)
+            db.commit()
+        logging.info("Rebuilt daily P&L for %d user(s)", users)
+    elif args.command == "rebuild-trades":
+        with SessionLocal() as db:
+            user_ids = [args.user_id] if args.user_id is not None else db.scalars(select(User.id)).all()
+            for user_id in user_ids:
+                result = trade_rebuild_service.rebuild_trades(db, user_id=user_id)
+                logging.info("User %s: %d orders -> %d trades in %.3fs", user_id, result["orders"], result["trades"], result["seconds"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import gzip
+import os
+from typing import Optional
+
+import brotli
+from fastapi import Request
+
+# Bodies below this size go out uncompressed; the headers would eat most of the saving
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Content codings this server can produce, most preferred first."""
+    return ("br", "gzip")
+
+
+def negotiate(request: Request) -> Optional[str]:
+    """The content coding to use for this request's response, or None for identity."""
+    header = request.headers.get("accept-encoding")
+    if not header:
+        return None
+
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    best = None
+    for coding in supported_encodings():
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[1]):
+            best = (coding, weight)
+    return best[0] if best else None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
@@ -0,0 +1,8 @@
+import datetime
+
+def as_utc(value: datetime.datetime) -> datetime.datetime:
+    """Timestamps are stored in UTC, but SQLite hands them back naive; this makes either
+    kind an aware UTC-comparable value."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
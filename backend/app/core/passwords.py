@@ -0,0 +1,122 @@
+# backend/app/core/passwords.py
+#
+# bcrypt hashing and verification run in a dedicated process pool so a burst of logins
+# burns CPU there instead of holding the GIL on the request threadpool. This module is
+# what the spawned workers import, so it must stay free of app and database imports.
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from .processes import spawn_context
+
+load_dotenv()
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 0 hashes inline on the calling thread
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+
+# Hashes with a different cost are still accepted; pinning min and max flags them for a rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS, bcrypt__min_rounds=BCRYPT_ROUNDS, bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, mp_context=spawn_context())
+        return _executor
+
+
+def _discard_executor(broken: ProcessPoolExecutor):
+    global _executor
+    with _executor_lock:
+        # Another request may already have replaced it
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(function: Callable, *args):
+    if PASSWORD_HASH_WORKERS <= 0:
+        return function(*args)
+
+    # A worker that dies (OOM kill, crash) breaks the whole pool for good, so a broken
+    # pool is replaced and the call tried once more on the new one
+    for _ in range(2):
+        executor = _get_executor()
+        try:
+            return _call(executor, function, *args)
+        except BrokenProcessPool:
+            _discard_executor(executor)
+    raise HTTPException(
+        status_code=503,
+        detail="Password check failed. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _call(executor: ProcessPoolExecutor, function: Callable, *args):
+    if not _pending.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many login attempts in progress. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = executor.submit(function, *args)
+    except Exception:
+        _pending.release()
+        raise
+    # A timed-out call keeps its slot until the worker is actually done with it
+    future.add_done_callback(lambda _: _pending.release())
+
+    try:
+        return future.result(timeout=PASSWORD_HASH_TIMEOUT_SECONDS)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Password check timed out. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+
+def hash_password(password: str) -> str:
+    return _run(_hash, password)
+
+
+def verify_password(password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+    """Returns whether the password matches and, if the hash uses outdated settings,
+    a replacement hash to store."""
+    return _run(_verify_and_update, password, password_hash)
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -0,0 +1,9 @@
+# Kept free of app imports: process-pool workers import the modules that use it.
+
+import multiprocessing
+from multiprocessing.context import BaseContext
+
+def spawn_context() -> BaseContext:
+    """Start method for the app's process pools. Forking a process that holds database
+    connections and threads is unsafe, so workers start fresh interpreters."""
+    return multiprocessing.get_context("spawn")
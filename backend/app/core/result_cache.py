@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..crud import user as user_crud
+from ..database.database import run_in_session
+from . import compression, serialization
+from .cache import ByteLRUCache
+
+CACHE_CONTROL = "private, no-cache"
+
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Serialized read results keyed by (user, path, query, data version). A write bumps the
+# user's data version in the same transaction, so stale entries are never looked up
+# again and age out of the LRU. Each worker process has its own cache.
+cache = ByteLRUCache(max_bytes=RESULT_CACHE_MAX_BYTES)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+@lru_cache(maxsize=None)
+def _schema_digest(response_model) -> str:
+    # Part of the ETag, so a deploy that changes the response shape revalidates clients
+    schema = json.dumps(_adapter(response_model).json_schema(), sort_keys=True)
+    return hashlib.blake2b(schema.encode(), digest_size=8).hexdigest()
+
+
+def etag(key: tuple, data_version: int, response_model) -> str:
+    """Strong validator for a response: it only changes when the user's data, the request
+    or the response schema does."""
+    source = repr((*key, data_version, _schema_digest(response_model))).encode()
+    return '"' + hashlib.blake2b(source, digest_size=16).hexdigest() + '"'
+
+
+def _if_none_match(request: Request) -> set[str]:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    header = request.headers.get("if-none-match")
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+async def cached_json(
+    request: Request,
+    db: Union[Session, AsyncSession],
+    user_id: int,
+    response_model,
+    load: Callable[[Session], tuple[Any, dict]],
+) -> Response:
+    """Serves the response for this request from the cache, or calls `load(db)`, which
+    returns the payload and extra response headers, and caches its JSON, compressed when
+    the client accepts it. A matching If-None-Match is answered with 304 after reading
+    only the user's data version."""
+    key = (user_id, request.url.path, tuple(sorted(request.query_params.multi_items())))
+    client_tags = _if_none_match(request)
+    coding = compression.negotiate(request)
+
+    def lookup(session: Session) -> tuple[str, Optional[bytes], dict]:
+        data_version = user_crud.get_data_version(session, user_id)
+        tag = etag(key, data_version, response_model)
+        # Any coding of the same data is still valid for the client. `*` is not honoured:
+        # it would answer 304 before load() could find that the resource is missing.
+        matched = client_tags & {tag, *(_encoded_tag(tag, c) for c in compression.supported_encodings())}
+        if matched:
+            return matched.pop(), None, {}
+
+        # Entries are stored as sent, so a hit is compressed once, not per request
+        versioned_key = (*key, data_version, coding)
+        entry = cache.get(versioned_key)
+        if entry is None:
+            payload, headers = load(session)
+            body = serialization.dump_json(response_model, payload)
+            if coding is not None and len(body) >= compression.COMPRESSION_MIN_BYTES:
+                body, headers = compression.compress(body, coding), {**headers, "Content-Encoding": coding}
+            entry = (body, headers)
+            cache.set(versioned_key, *entry)
+        body, headers = entry
+        if "Content-Encoding" in headers:
+            tag = _encoded_tag(tag, headers["Content-Encoding"])
+        return tag, body, headers
+
+    tag, body, headers = await run_in_session(db, lookup)
+    validators = {"ETag": tag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if body is None:
+        return Response(status_code=304, headers=validators)
+    return Response(content=body, media_type="application/json", headers={**headers, **validators})
+
+
+def _encoded_tag(tag: str, coding: str) -> str:
+    # A strong ETag has to differ between content codings of the same data
+    return f'{tag[:-1]}-{coding}"'
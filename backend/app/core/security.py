@@ -6,11 +6,14 @@ from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
 from ..crud.base import get_user_by_email
-from ..database.database import get_db
+from ..database.database import get_session, run_in_session
+from ..models import User
+from ..schemas import user as user_schema
+from .cache import TTLCache
 
 
 load_dotenv()
@@ -18,17 +21,14 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login/access-token")
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
+# Resolved users keyed by token subject. Each worker process has its own cache: changes
+# made in this process are invalidated immediately, others within USER_CACHE_TTL_SECONDS.
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -40,7 +40,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -53,7 +53,34 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user_by_email(db, email=email)
-    if user is None:
+
+    user_id = payload.get("uid")
+    cached = user_cache.get(email)
+    if cached is not None:
+        # The address may since have passed to another account; the token is not theirs
+        if user_id is not None and cached.id != user_id:
+            raise credentials_exception
+        return cached
+
+    user = await run_in_session(db, _load_user, user_id=user_id, email=email)
+    if user is None or user.email != email:
         raise credentials_exception
-    return user
\ No newline at end of file
+
+    current_user = user_schema.User(id=user.id, email=user.email)
+    user_cache.set(email, current_user)
+    return current_user
+
+
+def _load_user(db: Session, user_id: Optional[int], email: str) -> Optional[User]:
+    # Tokens issued before the "uid" claim existed fall back to the email lookup
+    if user_id is not None:
+        return db.get(User, user_id)
+    return get_user_by_email(db, email=email)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    history = inspect(target).attrs.email.history
+    for email in (target.email, *(history.deleted or ())):
+        user_cache.pop(email)
\ No newline at end of file
@@ -0,0 +1,120 @@
+import datetime
+import types
+import typing
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Optional
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+# Read responses are built from rows this app wrote itself: imports reject non-finite
+# numbers and bad dates before storing them. Validating every attribute of every nested
+# order again on the way out was most of the cost of a large GET /trades, so trusted
+# payloads are converted straight from attributes to plain values by a per-schema plan,
+# and encoded with orjson. The output matches pydantic's JSON for these schemas.
+
+Converter = Callable[[Any], Any]
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def dump_json(response_model, payload: Any) -> bytes:
+    """JSON for `payload` shaped by `response_model`, which may be a pydantic model or a
+    List/dict of them. Falls back to pydantic validation for anything the fast path does
+    not understand."""
+    convert = _plan(response_model)
+    if convert is not None:
+        try:
+            return orjson.dumps(convert(payload), option=orjson.OPT_UTC_Z)
+        except (TypeError, AttributeError, orjson.JSONEncodeError):
+            pass
+    adapter = _adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+
+
+@lru_cache(maxsize=None)
+def _plan(annotation) -> Optional[Converter]:
+    try:
+        return _converter(annotation)
+    except TypeError:
+        return None
+
+
+def _same(value):
+    return value
+
+
+def _to_float(value):
+    return value if value is None or type(value) is float else float(value)
+
+
+def _converter(annotation) -> Converter:
+    """Raises TypeError for annotations the plan cannot express."""
+    # Scalars orjson already writes the way pydantic does
+    if annotation in (str, int, bool, datetime.datetime, datetime.date, Any):
+        return _same
+    if annotation is float:
+        return _to_float
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Literal:
+        return _same
+    if origin in (typing.Union, types.UnionType):
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) != 1:
+            raise TypeError(f"Unsupported union {annotation}")
+        convert = _converter(members[0])
+        return _same if convert is _same else (lambda value: None if value is None else convert(value))
+    if origin in (list, typing.List):
+        convert = _converter(args[0])
+        if convert is _same:
+            return list
+        return lambda values: [convert(value) for value in values]
+    if origin in (dict, typing.Dict):
+        convert = _converter(args[1])
+        return lambda values: {key: convert(value) for key, value in values.items()}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _model_converter(annotation)
+    raise TypeError(f"Unsupported annotation {annotation}")
+
+
+def _model_converter(model: type[BaseModel]) -> Converter:
+    decorators = model.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers or any(
+        field.alias or field.serialization_alias for field in model.model_fields.values()
+    ):
+        raise TypeError(f"{model.__name__} customizes its serialization")
+
+    names = tuple(model.model_fields)
+    defaults = tuple(
+        None if field.is_required() else field.get_default(call_default_factory=True)
+        for field in model.model_fields.values()
+    )
+    converters = [(name, convert) for name, field in model.model_fields.items()
+                  if (convert := _converter(field.annotation)) is not _same]
+    get_attributes = attrgetter(*names)
+    get_items = itemgetter(*names)
+    if len(names) == 1:
+        get_attributes = (lambda get: lambda obj: (get(obj),))(get_attributes)
+        get_items = (lambda get: lambda obj: (get(obj),))(get_items)
+
+    def convert(obj):
+        if isinstance(obj, dict):
+            values = dict(zip(names, (obj.get(name, default) for name, default in zip(names, defaults))))
+        else:
+            try:
+                # Loaded ORM attributes sit in the instance dict; reading them there skips
+                # the instrumented descriptors. Anything unloaded goes through getattr.
+                values = dict(zip(names, get_items(obj.__dict__)))
+            except (KeyError, AttributeError):
+                values = dict(zip(names, get_attributes(obj)))
+        for name, convert_value in converters:
+            values[name] = convert_value(values[name])
+        return values
+
+    return convert
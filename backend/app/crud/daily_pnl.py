@@ -0,0 +1,96 @@
+import datetime
+import os
+from collections import defaultdict
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.datetimes import as_utc
+from app.models import DailyPnl, Trade, User
+
+# Used until the user's first upload tells us their timezone
+DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "America/New_York")
+
+ClosedTrade = tuple[datetime.datetime, float]  # (exit_timestamp, pnl)
+
+def user_timezone(db: Session, user_id: int) -> ZoneInfo:
+    name = db.scalar(select(User.timezone).where(User.id == user_id)) or DEFAULT_TIMEZONE
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+def trade_day(exit_timestamp: datetime.datetime, zone: ZoneInfo) -> datetime.date:
+    return as_utc(exit_timestamp).astimezone(zone).date()
+
+def closed_trade(trade: Trade) -> Optional[ClosedTrade]:
+    """A trade's contribution to the rollup, or None if it has no realized P&L."""
+    if trade.status != 'CLOSED' or trade.pnl is None or trade.exit_timestamp is None:
+        return None
+    return trade.exit_timestamp, trade.pnl
+
+def add_closed_trades(db: Session, user_id: int, closed: Iterable[ClosedTrade], sign: int = 1):
+    """Adds (sign=1) or removes (sign=-1) closed trades from the user's daily rows."""
+    zone = user_timezone(db, user_id)
+    deltas = defaultdict(lambda: [0.0, 0, 0, 0])
+    for exit_timestamp, pnl in closed:
+        day = deltas[trade_day(exit_timestamp, zone)]
+        day[0] += sign * pnl
+        day[1] += sign
+        day[2] += sign * (pnl > 0)
+        day[3] += sign * (pnl < 0)
+    if not deltas:
+        return
+
+    _upsert(db, [
+        {"user_id": user_id, "date": date, "pnl": pnl, "trades": trades, "wins": wins, "losses": losses}
+        for date, (pnl, trades, wins, losses) in deltas.items()
+    ])
+    # Days whose last trade was removed
+    db.execute(delete(DailyPnl).where(
+        DailyPnl.user_id == user_id, DailyPnl.date.in_(list(deltas)), DailyPnl.trades <= 0
+    ))
+
+def replace_closed_trade(db: Session, user_id: int, before: Optional[ClosedTrade], after: Optional[ClosedTrade]):
+    if before == after:
+        return
+    if before:
+        add_closed_trades(db, user_id, [before], sign=-1)
+    if after:
+        add_closed_trades(db, user_id, [after])
+
+def get_days(db: Session, user_id: int, start: datetime.date, end: datetime.date) -> list[DailyPnl]:
+    return db.query(DailyPnl).filter(
+        DailyPnl.user_id == user_id, DailyPnl.date >= start, DailyPnl.date < end
+    ).order_by(DailyPnl.date).all()
+
+def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+    """Recomputes the rollup from the trades table, for one user or everyone. Does not commit."""
+    user_ids = [user_id] if user_id is not None else db.scalars(select(User.id)).all()
+    for uid in user_ids:
+        db.execute(delete(DailyPnl).where(DailyPnl.user_id == uid))
+        closed = db.execute(
+            select(Trade.exit_timestamp, Trade.pnl)
+            .where(Trade.user_id == uid, Trade.status == 'CLOSED', Trade.pnl.is_not(None), Trade.exit_timestamp.is_not(None))
+            .execution_options(yield_per=10_000)
+        )
+        add_closed_trades(db, uid, (tuple(row) for row in closed))
+    return len(user_ids)
+
+def _upsert(db: Session, rows: list[dict]):
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = insert(DailyPnl).values(rows)
+    excluded = statement.excluded
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[DailyPnl.user_id, DailyPnl.date],
+        set_={
+            "pnl": DailyPnl.pnl + excluded.pnl,
+            "trades": DailyPnl.trades + excluded.trades,
+            "wins": DailyPnl.wins + excluded.wins,
+            "losses": DailyPnl.losses + excluded.losses,
+        },
+    ))
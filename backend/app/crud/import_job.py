@@ -0,0 +1,44 @@
+import datetime
+import uuid
+
+from sqlalchemy.orm import Session
+from app.models import import_job as import_job_model
+
+UNFINISHED_STAGES = ('QUEUED', 'PARSING', 'MATCHING')
+
+def create_import_job(db: Session, user_id: int, filename: str, worker: str = None):
+    db_job = import_job_model.ImportJob(id=uuid.uuid4().hex, user_id=user_id, filename=filename, worker=worker)
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def get_import_job(db: Session, job_id: str, user_id: int):
+    # Job rows are written by the import workers, so always re-read them
+    return db.query(import_job_model.ImportJob).filter(
+        import_job_model.ImportJob.id == job_id,
+        import_job_model.ImportJob.user_id == user_id
+    ).execution_options(populate_existing=True).first()
+
+def update_import_job(db: Session, job_id: str, **values):
+    db.query(import_job_model.ImportJob).filter(import_job_model.ImportJob.id == job_id).update(values)
+    db.commit()
+
+def mark_started(db: Session, job_id: str):
+    update_import_job(db, job_id, stage='PARSING', started_at=datetime.datetime.utcnow())
+
+def mark_finished(db: Session, job_id: str, rows_processed: int, duplicates_skipped: int = 0, error: str = None):
+    update_import_job(
+        db, job_id,
+        stage='FAILED' if error else 'COMPLETED',
+        rows_processed=rows_processed,
+        duplicates_skipped=duplicates_skipped,
+        error=error,
+        finished_at=datetime.datetime.utcnow(),
+    )
+
+def get_unfinished_jobs(db: Session):
+    """(id, worker) of every job that has not completed or failed."""
+    return db.query(import_job_model.ImportJob.id, import_job_model.ImportJob.worker).filter(
+        import_job_model.ImportJob.stage.in_(UNFINISHED_STAGES)
+    ).all()
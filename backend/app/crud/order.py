@@ -1,6 +1,8 @@
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from app.models import order as order_model
 from app.schemas import order as order_schema
+from app.crud import pagination
 
 def create_order(db: Session, order: order_schema.OrderCreate, user_id: int):
     db_order = order_model.Order(**order.model_dump(), user_id=user_id)
@@ -9,5 +11,48 @@ def create_order(db: Session, order: order_schema.OrderCreate, user_id: int):
     db.refresh(db_order)
     return db_order
 
+def create_orders_bulk(db: Session, orders: list[dict], user_id: int) -> list[int]:
+    # Single set-based INSERT ... RETURNING id (batched executemany), ids in input order.
+    # The caller owns the transaction, so nothing is committed here.
+    if not orders:
+        return []
+    rows = [{**order, "user_id": user_id} for order in orders]
+    stmt = insert(order_model.Order).returning(order_model.Order.id, sort_by_parameter_order=True)
+    return db.execute(stmt, rows).scalars().all()
+
+def get_fingerprints(db: Session, user_id: int, start, end) -> set[str]:
+    """Fingerprints of the user's orders executed between `start` and `end`, inclusive."""
+    Order = order_model.Order
+    return set(db.scalars(
+        select(Order.fingerprint).where(
+            Order.user_id == user_id, Order.execution_time >= start, Order.execution_time <= end,
+            Order.fingerprint.is_not(None),
+        )
+    ))
+
 def get_orders_by_user(db: Session, user_id: int):
     return db.query(order_model.Order).filter(order_model.Order.user_id == user_id).all()
+
+def get_orders_page(
+    db: Session,
+    user_id: int,
+    filters: order_schema.OrderFilters,
+    limit: int,
+    cursor: str = None,
+    total: str = "none",
+):
+    Order = order_model.Order
+    query = db.query(Order).filter(Order.user_id == user_id)
+    if filters.symbol:
+        query = query.filter(Order.symbol == filters.symbol)
+    if filters.side:
+        query = query.filter(Order.side == filters.side)
+    if filters.position_effect:
+        query = query.filter(Order.position_effect == filters.position_effect)
+    if filters.start:
+        query = query.filter(Order.execution_time >= filters.start)
+    if filters.end:
+        query = query.filter(Order.execution_time < filters.end)
+
+    orders, next_cursor = pagination.keyset_page(query, Order.execution_time, Order.id, limit, cursor)
+    return orders, next_cursor, pagination.count_rows(db, query, total)
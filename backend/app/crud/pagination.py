@@ -0,0 +1,65 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Query, Session
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query: Query, time_column, id_column, limit: int, cursor: Optional[str] = None):
+    """Newest-first page of `query` ordered by (time_column, id_column).
+
+    The cursor is the position of the last row of the previous page, so each page is a
+    range scan on the (user_id, time, id) index no matter how deep the client has paged.
+    Returns the rows and the cursor for the next page (None on the last page).
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            time_column < timestamp,
+            and_(time_column == timestamp, id_column < row_id),
+        ))
+
+    rows = query.order_by(time_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, time_column.key), getattr(last, id_column.key))
+
+
+def count_rows(db: Session, query: Query, mode: str) -> Optional[int]:
+    """Row count for `query`: 'exact', 'estimate' (planner estimate on PostgreSQL) or 'none'."""
+    if mode == "none":
+        return None
+    if mode == "estimate" and db.get_bind().dialect.name == "postgresql":
+        statement = query.statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return query.order_by(None).count()
+
+
+def page_headers(next_cursor: Optional[str], count: Optional[int]) -> dict:
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if count is not None:
+        headers["X-Total-Count"] = str(count)
+    return headers
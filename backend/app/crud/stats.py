@@ -0,0 +1,88 @@
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.models import trade as trade_model
+from app.schemas import stats as stats_schema
+
+DIRECTIONS = ("LONG", "SHORT")
+STATUSES = ("OPEN", "CLOSED")
+
+def get_summary(db: Session, user_id: int, filters: stats_schema.StatsFilters) -> dict:
+    Trade = trade_model.Trade
+    pnl = Trade.pnl
+
+    # 1. One grouped scan, at most one row per direction and status. Grouping on plain
+    # columns lets ix_trades_user_id_stats serve it in index order without a sort.
+    query = db.query(
+        Trade.direction,
+        Trade.status,
+        func.count().label("count"),
+        func.count(pnl).label("trades"),
+        func.count(case((pnl > 0, 1))).label("wins"),
+        func.count(case((pnl < 0, 1))).label("losses"),
+        func.coalesce(func.sum(case((pnl > 0, pnl))), 0).label("gross_profit"),
+        func.coalesce(func.sum(case((pnl < 0, -pnl))), 0).label("gross_loss"),
+        func.max(pnl).label("largest"),
+        func.min(pnl).label("smallest"),
+    ).filter(Trade.user_id == user_id)
+    rows = _apply_filters(query, filters).group_by(Trade.direction, Trade.status).all()
+
+    # 2. Combine the groups; P&L figures only come from closed trades
+    closed = [row for row in rows if row.status == 'CLOSED']
+    by_status = dict.fromkeys(STATUSES, 0)
+    for row in rows:
+        by_status[row.status] = by_status.get(row.status, 0) + row.count
+
+    return {
+        **_pnl_stats(closed),
+        "by_direction": {
+            direction: _pnl_stats([row for row in closed if row.direction == direction])
+            for direction in DIRECTIONS
+        },
+        "by_status": by_status,
+    }
+
+def get_closed_pnl_series(db: Session, user_id: int, filters: stats_schema.StatsFilters) -> list[tuple]:
+    """(exit_timestamp, pnl) of the closed trades, in exit order."""
+    Trade = trade_model.Trade
+    query = db.query(Trade.exit_timestamp, Trade.pnl).filter(
+        Trade.user_id == user_id, Trade.status == 'CLOSED',
+        Trade.pnl.is_not(None), Trade.exit_timestamp.is_not(None),
+    )
+    return [tuple(row) for row in _apply_filters(query, filters).order_by(Trade.exit_timestamp, Trade.id)]
+
+def _apply_filters(query, filters: stats_schema.StatsFilters):
+    Trade = trade_model.Trade
+    if filters.symbol:
+        query = query.filter(Trade.symbol == filters.symbol)
+    if filters.start:
+        query = query.filter(Trade.entry_timestamp >= filters.start)
+    if filters.end:
+        query = query.filter(Trade.entry_timestamp < filters.end)
+    return query
+
+def _pnl_stats(rows) -> dict:
+    trades = sum(row.trades for row in rows)
+    wins = sum(row.wins for row in rows)
+    losses = sum(row.losses for row in rows)
+    gross_profit = float(sum(row.gross_profit for row in rows))
+    gross_loss = float(sum(row.gross_loss for row in rows))
+    net_pnl = gross_profit - gross_loss
+    largest = max((row.largest for row in rows if row.largest is not None), default=None)
+    smallest = min((row.smallest for row in rows if row.smallest is not None), default=None)
+
+    return {
+        "trades": trades,
+        "wins": wins,
+        "losses": losses,
+        "breakeven": trades - wins - losses,
+        "win_rate": wins / trades if trades else None,
+        "net_pnl": net_pnl,
+        "gross_profit": gross_profit,
+        "gross_loss": gross_loss,
+        "profit_factor": gross_profit / gross_loss if gross_loss else None,
+        "expectancy": net_pnl / trades if trades else None,
+        "average_win": gross_profit / wins if wins else None,
+        "average_loss": -gross_loss / losses if losses else None,
+        "largest_win": largest if largest is not None and largest > 0 else None,
+        "largest_loss": smallest if smallest is not None and smallest < 0 else None,
+    }
@@ -1,47 +1,130 @@
-from sqlalchemy.orm import Session
+from typing import Optional, Sequence
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models import trade as trade_model
 from app.models import order as order_model
+from app.models.trade_order import trade_orders
 from app.schemas import trade as trade_schema
+from app.crud import daily_pnl as daily_pnl_crud
+from app.crud import user as user_crud
+from app.crud import pagination
 
-def get_trade_by_id(db: Session, trade_id: int, user_id: int):
-    return db.query(trade_model.Trade).filter(trade_model.Trade.id == trade_id, trade_model.Trade.user_id == user_id).first()
+# Loading strategies for Trade.orders. Read paths pick one explicitly so serializing the
+# nested orders never falls back to one lazy SELECT per trade.
+ORDERS_LOADING = {
+    "selectin": selectinload(trade_model.Trade.orders),  # one extra IN query for all trades
+    "joined": joinedload(trade_model.Trade.orders),      # single query, best for one trade
+}
 
-def get_trades_by_user(db: Session, user_id: int):
-    return db.query(trade_model.Trade).filter(trade_model.Trade.user_id == user_id).all()
+OPEN_POSITION_BATCH = 1000
 
-def get_open_trade_by_symbol(db: Session, user_id: int, symbol: str):
-    return db.query(trade_model.Trade).filter(
-        trade_model.Trade.user_id == user_id,
-        trade_model.Trade.symbol == symbol,
-        trade_model.Trade.status == 'OPEN'
+def get_trade_by_id(db: Session, trade_id: int, user_id: int, orders_loading: str = "joined"):
+    return db.query(trade_model.Trade).options(ORDERS_LOADING[orders_loading]).filter(
+        trade_model.Trade.id == trade_id, trade_model.Trade.user_id == user_id
     ).first()
 
-def get_open_trades_by_symbols(db: Session, user_id: int, symbols: list[str]):
-    return db.query(trade_model.Trade).filter(
-        trade_model.Trade.user_id == user_id,
-        trade_model.Trade.symbol.in_(symbols),
-        trade_model.Trade.status == 'OPEN'
+def get_trades_by_user(db: Session, user_id: int, orders_loading: str = "selectin"):
+    return db.query(trade_model.Trade).options(ORDERS_LOADING[orders_loading]).filter(
+        trade_model.Trade.user_id == user_id
     ).all()
 
-def create_trade(db: Session, trade: trade_schema.TradeCreate, orders: list[order_model.Order], user_id: int):
+def get_trade_orders(db: Session, trade_id: int, user_id: int):
+    """The trade's orders in execution order, or None if the user has no such trade."""
+    Order = order_model.Order
+    orders = db.query(Order).join(trade_orders, trade_orders.c.order_id == Order.id).filter(
+        trade_orders.c.trade_id == trade_id, Order.user_id == user_id
+    ).order_by(Order.execution_time, Order.id).all()
+    if orders:
+        return orders
+    # Manual trades have no orders; only a missing trade is None
+    exists = db.query(trade_model.Trade.id).filter(
+        trade_model.Trade.id == trade_id, trade_model.Trade.user_id == user_id
+    ).first()
+    return [] if exists else None
+
+def get_trades_page(
+    db: Session,
+    user_id: int,
+    filters: trade_schema.TradeFilters,
+    limit: int,
+    cursor: str = None,
+    orders_loading: str = "selectin",
+    total: str = "none",
+    columns: Optional[Sequence[str]] = None,
+):
+    """Trades as ORM objects with their orders, or, given `columns`, as rows of just those
+    columns (plus the keyset columns) without touching the orders."""
+    Trade = trade_model.Trade
+    if columns is None:
+        query = db.query(Trade).options(ORDERS_LOADING[orders_loading])
+    else:
+        query = db.query(*[getattr(Trade, name) for name in dict.fromkeys([*columns, "entry_timestamp", "id"])])
+    query = query.filter(Trade.user_id == user_id)
+    if filters.symbol:
+        query = query.filter(Trade.symbol == filters.symbol)
+    if filters.status:
+        query = query.filter(Trade.status == filters.status)
+    if filters.direction:
+        query = query.filter(Trade.direction == filters.direction)
+    if filters.start:
+        query = query.filter(Trade.entry_timestamp >= filters.start)
+    if filters.end:
+        query = query.filter(Trade.entry_timestamp < filters.end)
+
+    trades, next_cursor = pagination.keyset_page(query, Trade.entry_timestamp, Trade.id, limit, cursor)
+    return trades, next_cursor, pagination.count_rows(db, query, total)
+
+def get_open_positions_by_contracts(db: Session, user_id: int, contract_keys: list[str]):
+    # Plain rows (no ORM instances) with the columns the matching engine needs. Each key
+    # is one probe into ix_trades_open_user_id_contract_key; batches keep the IN list
+    # within the drivers' parameter limits.
+    Trade = trade_model.Trade
+    columns = [
+        Trade.id.label("trade_id"), Trade.symbol, Trade.contract_key, Trade.direction,
+        Trade.status, Trade.volume, Trade.avg_entry_price,
+        Trade.entry_timestamp, Trade.executions_count,
+        Trade.entry_quantity, Trade.entry_notional,
+        Trade.exit_quantity, Trade.exit_notional,
+    ]
+    rows = []
+    for start in range(0, len(contract_keys), OPEN_POSITION_BATCH):
+        rows.extend(db.query(*columns).filter(
+            Trade.user_id == user_id,
+            Trade.contract_key.in_(contract_keys[start:start + OPEN_POSITION_BATCH]),
+            Trade.status == 'OPEN'
+        ).all())
+    return rows
+
+def create_trade(db: Session, trade: trade_schema.TradeCreate, user_id: int, orders: list[order_model.Order] = None):
     db_trade = trade_model.Trade(**trade.model_dump(), user_id=user_id)
-    db_trade.orders.extend(orders)
+    db_trade.contract_key = db_trade.contract_key or db_trade.symbol
+    if orders:
+        db_trade.orders.extend(orders)
     db.add(db_trade)
+    daily_pnl_crud.replace_closed_trade(db, user_id, None, daily_pnl_crud.closed_trade(db_trade))
+    user_crud.bump_data_version(db, user_id)
     db.commit()
-    db.refresh(db_trade)
-    return db_trade
+    return _reload_with_orders(db, db_trade)
 
 def update_trade(db: Session, db_trade: trade_model.Trade, trade_update: trade_schema.TradeUpdate, new_orders: list[order_model.Order] = None):
+    before = daily_pnl_crud.closed_trade(db_trade)
     update_data = trade_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_trade, key, value)
     
     if new_orders:
         db_trade.orders.extend(new_orders)
-        
+
+    daily_pnl_crud.replace_closed_trade(db, db_trade.user_id, before, daily_pnl_crud.closed_trade(db_trade))
+    user_crud.bump_data_version(db, db_trade.user_id)
     db.commit()
-    db.refresh(db_trade)
-    return db_trade
+    return _reload_with_orders(db, db_trade)
+
+def _reload_with_orders(db: Session, db_trade: trade_model.Trade):
+    """Re-reads a just-committed trade with its orders loaded. In async mode the response
+    is serialized after the session call returns, where a lazy load cannot run."""
+    return db.query(trade_model.Trade).options(ORDERS_LOADING["joined"]).populate_existing().filter(
+        trade_model.Trade.id == db_trade.id
+    ).one()
 
 def delete_trade(db: Session, trade_id: int, user_id: int):
     db_trade = get_trade_by_id(db, trade_id, user_id)
@@ -52,5 +135,7 @@ def delete_trade(db: Session, trade_id: int, user_id: int):
         for order in db_trade.orders:
             db.delete(order)
         db.delete(db_trade)
+        daily_pnl_crud.replace_closed_trade(db, user_id, daily_pnl_crud.closed_trade(db_trade), None)
+        user_crud.bump_data_version(db, user_id)
         db.commit()
     return db_trade
\ No newline at end of file
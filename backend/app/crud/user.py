@@ -2,11 +2,11 @@ from sqlalchemy.orm import Session
 
 from ..models import User
 from ..schemas import user as user_schema
-from ..core.security import get_password_hash, verify_password
+from ..core.passwords import hash_password, verify_password
 from .base import get_user_by_email
 
 def create_user(db: Session, user: user_schema.UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = hash_password(user.password)
     db_user = User(email=user.email, password_hash=hashed_password)
     db.add(db_user)
     db.commit()
@@ -17,6 +17,28 @@ def authenticate_user(db: Session, email: str, password: str):
     user = get_user_by_email(db, email)
     if not user:
         return False
-    if not verify_password(password, user.password_hash):
+    valid, new_hash = verify_password(password, user.password_hash)
+    if not valid:
         return False
-    return user
\ No newline at end of file
+    # Rehash with the current cost setting while the plain password is at hand
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
+    return user
+
+def set_timezone(db: Session, user_id: int, timezone: str) -> bool:
+    """Stores the user's timezone; returns whether it changed. Does not commit."""
+    changed = db.query(User).filter(User.id == user_id, User.timezone.is_distinct_from(timezone)).update(
+        {User.timezone: timezone}, synchronize_session=False
+    )
+    return bool(changed)
+
+def get_data_version(db: Session, user_id: int) -> int:
+    return db.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+def bump_data_version(db: Session, user_id: int):
+    """Marks the user's trades and orders as changed, so cached reads are recomputed. Call it
+    in the transaction that makes the change. Does not commit."""
+    db.query(User).filter(User.id == user_id).update(
+        {User.data_version: User.data_version + 1}, synchronize_session=False
+    )
@@ -1,30 +1,93 @@
+from typing import Callable, TypeVar, Union
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 import os
 
+from .pool import MeteredAsyncAdaptedQueuePool, MeteredQueuePool
+
 ENVIRONMENT = os.getenv("ENVIRONMENT")
 POSTGRES_USER = os.getenv("POSTGRES_USER")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 POSTGRES_DB = os.getenv("POSTGRES_DB")
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
+# "sync" serves every route from a threadpool; "async" awaits the database on the event loop
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+# Pools are per process: every uvicorn worker (uvicorn reads WEB_CONCURRENCY as its
+# worker count) holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle before server or load balancer idle timeouts drop the connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
 
 if ENVIRONMENT == 'production':
     if not all([POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_DB]):
         raise ValueError("One or more PostgreSQL environment variables are not set.")
 
-DATABASE_URL = f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+# e.g. sqlite+aiosqlite:///./trades.db for local runs
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, poolclass=MeteredQueuePool, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# The sync engine stays in use in async mode: login and sign-up wait on the password pool,
+# and background imports and migrations run on their own threads.
+if DB_MODE == "async":
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=MeteredAsyncAdaptedQueuePool, **POOL_OPTIONS)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Creates a connection to the Production Database.
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Creates an async session; only used when DB_MODE is "async".
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Session for routes that support both modes; pair with run_in_session.
+get_session = get_async_db if DB_MODE == "async" else get_db
+
+# Connections this process may hold; multiply by the worker count to size max_connections.
+def connection_budget() -> int:
+    engines = 2 if DB_MODE == "async" else 1
+    return engines * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+
+# Session factory for work that outlives the request, such as background imports.
+def get_session_factory():
+    return SessionLocal
+
+
+T = TypeVar("T")
+
+async def run_in_session(db: Union[Session, AsyncSession], function: Callable[..., T], *args, **kwargs) -> T:
+    """Calls a sync crud function `function(db, *args, **kwargs)` without blocking the event loop.
+
+    With an AsyncSession it runs through run_sync, so the same crud code issues its
+    queries on the async driver; with a sync Session it runs on the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: function(session, *args, **kwargs))
+    return await run_in_threadpool(function, db, *args, **kwargs)
@@ -0,0 +1,197 @@
+import datetime
+import logging
+from collections import Counter
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .database import Base
+
+logger = logging.getLogger(__name__)
+
+# Kept out of Base.metadata so create_all/drop_all never touch it
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime, default=datetime.datetime.utcnow),
+)
+
+
+def _add_column(conn: Connection, table: str, ddl: str):
+    # Fresh databases get new columns from create_all, so only add what is missing
+    name = ddl.split()[0]
+    if name not in {c["name"] for c in inspect(conn).get_columns(table)}:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl}"))
+
+
+def _0001_trade_running_totals(conn: Connection):
+    for ddl in (
+        "entry_quantity INTEGER NOT NULL DEFAULT 0",
+        "entry_notional FLOAT NOT NULL DEFAULT 0",
+        "exit_quantity INTEGER NOT NULL DEFAULT 0",
+        "exit_notional FLOAT NOT NULL DEFAULT 0",
+    ):
+        _add_column(conn, "trades", ddl)
+
+    # Backfill the totals from the executions already linked to each trade
+    def total(expression: str, effect: str) -> str:
+        return (
+            f"COALESCE((SELECT SUM({expression}) FROM orders o "
+            f"JOIN trade_orders t ON t.order_id = o.id "
+            f"WHERE t.trade_id = trades.id AND o.position_effect = '{effect}'), 0)"
+        )
+
+    conn.execute(text(
+        "UPDATE trades SET "
+        f"entry_quantity = {total('ABS(o.quantity)', 'TO OPEN')}, "
+        f"entry_notional = {total('ABS(o.quantity * o.price)', 'TO OPEN')}, "
+        f"exit_quantity = {total('ABS(o.quantity)', 'TO CLOSE')}, "
+        f"exit_notional = {total('ABS(o.quantity * o.price)', 'TO CLOSE')}"
+    ))
+
+
+QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_orders_user_id_execution_time ON orders (user_id, execution_time, id)",
+    "CREATE INDEX IF NOT EXISTS ix_trades_user_id_entry_timestamp ON trades (user_id, entry_timestamp, id)",
+    "CREATE INDEX IF NOT EXISTS ix_trades_user_id_symbol_entry_timestamp ON trades (user_id, symbol, entry_timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_trades_open_user_id_symbol ON trades (user_id, symbol) WHERE status = 'OPEN'",
+    "CREATE INDEX IF NOT EXISTS ix_trade_orders_order_id ON trade_orders (order_id)",
+]
+
+
+def _0002_query_indexes(conn: Connection):
+    # Every read is scoped to one user, so a symbol-only index is never the best choice
+    conn.execute(text("DROP INDEX IF EXISTS ix_trades_symbol"))
+
+    # Duplicate or dangling links would block the primary key
+    if not inspect(conn).get_pk_constraint("trade_orders")["constrained_columns"]:
+        conn.execute(text("DELETE FROM trade_orders WHERE trade_id IS NULL OR order_id IS NULL"))
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(
+                "DELETE FROM trade_orders a USING trade_orders b "
+                "WHERE a.ctid < b.ctid AND a.trade_id = b.trade_id AND a.order_id = b.order_id"
+            ))
+            conn.execute(text("ALTER TABLE trade_orders ADD PRIMARY KEY (trade_id, order_id)"))
+        else:
+            # SQLite cannot add a primary key in place, so rebuild the table
+            conn.execute(text("ALTER TABLE trade_orders RENAME TO trade_orders_old"))
+            conn.execute(text(
+                "CREATE TABLE trade_orders ("
+                "trade_id INTEGER NOT NULL REFERENCES trades (id), "
+                "order_id INTEGER NOT NULL REFERENCES orders (id), "
+                "PRIMARY KEY (trade_id, order_id))"
+            ))
+            conn.execute(text("INSERT INTO trade_orders SELECT DISTINCT trade_id, order_id FROM trade_orders_old"))
+            conn.execute(text("DROP TABLE trade_orders_old"))
+
+    for ddl in QUERY_INDEXES:
+        conn.execute(text(ddl))
+
+
+def _0003_trade_stats_index(conn: Connection):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_trades_user_id_stats ON trades (user_id, direction, status, pnl)"))
+
+
+def _0004_daily_pnl(conn: Connection):
+    # create_all has already added the daily_pnl table
+    _add_column(conn, "users", "timezone VARCHAR")
+
+    from ..crud import daily_pnl as daily_pnl_crud
+    daily_pnl_crud.rebuild(Session(bind=conn))
+
+
+def _0005_user_data_version(conn: Connection):
+    _add_column(conn, "users", "data_version INTEGER NOT NULL DEFAULT 0")
+
+
+def _0006_order_fingerprints(conn: Connection):
+    _add_column(conn, "orders", "fingerprint VARCHAR(32)")
+    _add_column(conn, "import_jobs", "duplicates_skipped INTEGER NOT NULL DEFAULT 0")
+
+    # Orders uploaded twice before this migration are kept: their ordinals tell them apart
+    from ..services.order_normalization_service import fingerprint, order_identity
+    rows = conn.execute(text(
+        "SELECT id, user_id, execution_time, symbol, side, quantity, position_effect, price, "
+        "expiration_date, strike_price, option_type FROM orders WHERE fingerprint IS NULL "
+        "ORDER BY user_id, execution_time, id"
+    ))
+    occurrences, batch = Counter(), []
+    for row in rows:
+        execution_time, expiration_date = row.execution_time, row.expiration_date
+        if isinstance(execution_time, str):  # raw SQLite text
+            execution_time = datetime.datetime.fromisoformat(execution_time)
+            expiration_date = expiration_date and datetime.date.fromisoformat(expiration_date)
+        identity = order_identity(
+            execution_time, row.symbol, row.side, row.quantity, row.position_effect, row.price,
+            expiration_date, row.strike_price, row.option_type,
+        )
+        occurrences[row.user_id, identity] += 1
+        batch.append({"id": row.id, "fingerprint": fingerprint(identity, occurrences[row.user_id, identity])})
+    if batch:
+        conn.execute(text("UPDATE orders SET fingerprint = :fingerprint WHERE id = :id"), batch)
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_orders_user_id_fingerprint ON orders (user_id, fingerprint)"
+    ))
+
+
+def _0007_trade_contract_key(conn: Connection):
+    _add_column(conn, "trades", "contract_key VARCHAR")
+
+    # Key each trade by the contract of its first order; trades without orders by symbol.
+    # Trades that merged several option legs before this migration keep the first leg's
+    # key until `python -m app.cli rebuild-trades` splits them.
+    from ..models import Order
+    from ..models.trade_order import trade_orders
+    from ..services.matching_engine import contract_key
+    first_orders = (
+        select(trade_orders.c.trade_id, func.min(trade_orders.c.order_id).label("order_id"))
+        .group_by(trade_orders.c.trade_id).subquery()
+    )
+    rows = conn.execute(
+        select(first_orders.c.trade_id, Order.symbol, Order.expiration_date, Order.strike_price, Order.option_type, Order.spread)
+        .join(Order, Order.id == first_orders.c.order_id)
+    )
+    keys = [
+        {"id": row.trade_id, "key": contract_key(row.symbol, row.expiration_date, row.strike_price, row.option_type, row.spread)}
+        for row in rows
+    ]
+    if keys:
+        conn.execute(text("UPDATE trades SET contract_key = :key WHERE id = :id"), keys)
+    conn.execute(text("UPDATE trades SET contract_key = symbol WHERE contract_key IS NULL"))
+
+    conn.execute(text("DROP INDEX IF EXISTS ix_trades_open_user_id_symbol"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_trades_open_user_id_contract_key ON trades (user_id, contract_key) "
+        "WHERE status = 'OPEN'"
+    ))
+
+
+def _0008_import_job_worker(conn: Connection):
+    _add_column(conn, "import_jobs", "worker VARCHAR")
+
+
+MIGRATIONS: list[tuple[str, Callable[[Connection], None]]] = [
+    ("0001_trade_running_totals", _0001_trade_running_totals),
+    ("0002_query_indexes", _0002_query_indexes),
+    ("0003_trade_stats_index", _0003_trade_stats_index),
+    ("0004_daily_pnl", _0004_daily_pnl),
+    ("0005_user_data_version", _0005_user_data_version),
+    ("0006_order_fingerprints", _0006_order_fingerprints),
+    ("0007_trade_contract_key", _0007_trade_contract_key),
+    ("0008_import_job_worker", _0008_import_job_worker),
+]
+
+
+def run_migrations(engine: Engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        applied = set(conn.scalars(select(schema_migrations.c.version)))
+        for version, migrate in MIGRATIONS:
+            if version in applied:
+                continue
+            logger.info("Applying migration %s", version)
+            migrate(conn)
+            conn.execute(schema_migrations.insert().values(version=version))
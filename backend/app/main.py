@@ -1,13 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
-from .database.database import Base, engine
-from .routers import orders, user, trades
+from .core import passwords
+from .database.database import SessionLocal, engine
+from .database.migrations import run_migrations
+from .services import import_service
+from .routers import orders, user, trades, imports, metrics, stats, calendar, export
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    passwords.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 if os.environ.get("ENVIRONMENT") == "production":
-    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    import_service.fail_interrupted_jobs(SessionLocal)
 
 # Set up CORS
 origins = [
@@ -22,8 +35,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 )
 
 app.include_router(user.router, prefix="/api/v1", tags=["users"])
 app.include_router(orders.router, prefix="/api/v1", tags=["orders"])
 app.include_router(trades.router, prefix="/api/v1", tags=["trades"])
+app.include_router(imports.router, prefix="/api/v1", tags=["imports"])
+app.include_router(stats.router, prefix="/api/v1", tags=["stats"])
+app.include_router(calendar.router, prefix="/api/v1", tags=["calendar"])
+app.include_router(export.router, prefix="/api/v1", tags=["export"])
+app.include_router(metrics.router, prefix="/api/v1", tags=["metrics"])
@@ -2,3 +2,5 @@ from .user import User
 from .order import Order
 from .trade import Trade
 from .trade_order import trade_orders
+from .import_job import ImportJob
+from .daily_pnl import DailyPnl
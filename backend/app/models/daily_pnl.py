@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Date, Float, ForeignKey
+
+from ..database.database import Base
+
+# Realized P&L of the trades closed on each day, in the user's timezone. Maintained
+# incrementally by trade matching and trade edits; `python -m app.cli rebuild-daily-pnl`
+# recomputes it from the trades table.
+class DailyPnl(Base):
+    __tablename__ = "daily_pnl"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    pnl = Column(Float, default=0.0, nullable=False)
+    trades = Column(Integer, default=0, nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+import datetime
+
+from ..database.database import Base
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    filename = Column(String, nullable=True)
+
+    # QUEUED -> PARSING -> MATCHING -> COMPLETED | FAILED
+    stage = Column(String, default='QUEUED', nullable=False)
+    rows_processed = Column(Integer, default=0, nullable=False)
+    # Rows of the file that matched orders already stored, and were not imported again
+    duplicates_skipped = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    # host:pid of the process whose executor runs the job (see fail_interrupted_jobs)
+    worker = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
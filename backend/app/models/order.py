@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Float, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database.database import Base
 import datetime
@@ -23,9 +23,18 @@ class Order(Base):
     net_price = Column(Float, nullable=False)
     order_type = Column(String, nullable=True)
     notes = Column(Text, nullable=True)
+    # Hash of the execution's fields and its ordinal among identical fills of the upload;
+    # re-uploading an overlapping export skips the orders already stored
+    fingerprint = Column(String(32), nullable=True)
     
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     owner = relationship("User", back_populates="orders")
     trades = relationship("Trade", secondary=trade_orders, back_populates="orders")
+
+    __table_args__ = (
+        # Per-user listings and keyset pages ordered by execution time
+        Index("ix_orders_user_id_execution_time", "user_id", "execution_time", "id"),
+        Index("ux_orders_user_id_fingerprint", "user_id", "fingerprint", unique=True),
+    )
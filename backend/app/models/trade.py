@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database.database import Base
@@ -9,7 +9,10 @@ class Trade(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    symbol = Column(String, index=True, nullable=False)
+    symbol = Column(String, nullable=False)
+    # Instrument the position is held in: the symbol for stock, symbol|expiration|strike|type
+    # for an option leg (see matching_engine.contract_key)
+    contract_key = Column(String, nullable=True)
     status = Column(String, default='OPEN', nullable=False)
     direction = Column(String, nullable=False)
     
@@ -23,7 +26,28 @@ class Trade(Base):
     pnl = Column(Float, nullable=True)
     
     executions_count = Column(Integer, nullable=False)
+
+    # Running totals maintained per execution; volume, average prices and pnl derive from them
+    entry_quantity = Column(Integer, default=0, nullable=False)
+    entry_notional = Column(Float, default=0.0, nullable=False)
+    exit_quantity = Column(Integer, default=0, nullable=False)
+    exit_notional = Column(Float, default=0.0, nullable=False)
+
     notes = Column(Text, nullable=True)
 
     owner = relationship("User", back_populates="trades")
     orders = relationship("Order", secondary=trade_orders, back_populates="trades")
+
+    __table_args__ = (
+        # Per-user listings and keyset pages ordered by entry time
+        Index("ix_trades_user_id_entry_timestamp", "user_id", "entry_timestamp", "id"),
+        # Covers the /stats/summary aggregation: index-only, already grouped
+        Index("ix_trades_user_id_stats", "user_id", "direction", "status", "pnl"),
+        # Listings filtered by symbol
+        Index("ix_trades_user_id_symbol_entry_timestamp", "user_id", "symbol", "entry_timestamp"),
+        # Open-position lookups during matching; only open trades are indexed
+        Index(
+            "ix_trades_open_user_id_contract_key", "user_id", "contract_key",
+            postgresql_where=text("status = 'OPEN'"), sqlite_where=text("status = 'OPEN'"),
+        ),
+    )
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, ForeignKey, Table
+from sqlalchemy import Column, Integer, ForeignKey, Index, Table
 from ..database.database import Base
 
 trade_orders = Table('trade_orders', Base.metadata,
-    Column('trade_id', Integer, ForeignKey('trades.id')),
-    Column('order_id', Integer, ForeignKey('orders.id'))
+    Column('trade_id', Integer, ForeignKey('trades.id'), primary_key=True),
+    Column('order_id', Integer, ForeignKey('orders.id'), primary_key=True),
+    # The primary key serves trade -> orders; this serves order -> trades
+    Index('ix_trade_orders_order_id', 'order_id'),
 )
@@ -0,0 +1,31 @@
+import datetime
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from app.database import database
+from app.core import result_cache, security
+from app.schemas import calendar as calendar_schema
+from app.crud import daily_pnl as daily_pnl_crud
+from app.models import user as user_model
+
+router = APIRouter()
+
+@router.get("/calendar", response_model=calendar_schema.CalendarMonth)
+async def get_calendar(
+    request: Request,
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"),
+    db: Session = Depends(database.get_session),
+    current_user: user_model.User = Depends(security.get_current_user)
+):
+    start = datetime.date.fromisoformat(f"{month}-01")
+    end = (start + datetime.timedelta(days=32)).replace(day=1)
+
+    def load(session: Session):
+        days = daily_pnl_crud.get_days(session, user_id=current_user.id, start=start, end=end)
+        return {
+            "month": month,
+            "pnl": sum(day.pnl for day in days),
+            "trades": sum(day.trades for day in days),
+            "days": days,
+        }, {}
+
+    return await result_cache.cached_json(request, db, current_user.id, calendar_schema.CalendarMonth, load)
@@ -0,0 +1,24 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import sessionmaker
+from app.database import database
+from app.core import security
+from app.models import user as user_model
+from app.services import export_service
+
+router = APIRouter()
+
+@router.get("/export/{kind}", response_class=StreamingResponse)
+def export(
+    kind: Literal["trades", "orders"],
+    format: Literal["csv", "parquet"] = Query("csv"),
+    session_factory: sessionmaker = Depends(database.get_session_factory),
+    current_user: user_model.User = Depends(security.get_current_user)
+):
+    # The sync generator is iterated on the threadpool, one fetched batch per chunk
+    return StreamingResponse(
+        export_service.stream(session_factory, user_id=current_user.id, kind=kind, file_format=format),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'},
+    )
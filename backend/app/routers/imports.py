@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import database
+from app.core import security
+from app.schemas import import_job as import_job_schema
+from app.models import user as user_model
+from app.services import import_service
+
+router = APIRouter()
+
+@router.get("/imports/{job_id}", response_model=import_job_schema.ImportJob)
+async def get_import(
+    job_id: str,
+    db: Session = Depends(database.get_session),
+    current_user: user_model.User = Depends(security.get_current_user)
+):
+    job = await database.run_in_session(db, import_service.get_job_status, job_id=job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from app.core import result_cache, security
+from app.database import database
+from app.models import user as user_model
+
+router = APIRouter()
+
+# Pool sizing and cache hit rates describe the deployment; keep them away from anonymous callers
+@router.get("/metrics")
+def get_metrics(current_user: user_model.User = Depends(security.get_current_user)):
+    pools = {"sync": database.engine.pool.stats()}
+    if database.DB_MODE == "async":
+        pools["async"] = database.async_engine.pool.stats()
+
+    connections_per_worker = database.connection_budget()
+    return {
+        "pools": pools,
+        "web_concurrency": database.WEB_CONCURRENCY,
+        "connections_per_worker": connections_per_worker,
+        # Lower bound for Postgres max_connections, before admin and migration sessions
+        "max_connections_required": connections_per_worker * database.WEB_CONCURRENCY,
+        "result_cache": result_cache.cache.stats(),
+    }
@@ -1,65 +1,44 @@
-import pandas as pd
-import io
-from typing import List
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Query, Request
+from sqlalchemy.orm import Session, sessionmaker
 from app.database import database
-from app.core import security
+from app.core import result_cache, security
 from app.schemas import order as order_schema
+from app.schemas import import_job as import_job_schema
 from app.crud import order as order_crud
+from app.crud import pagination
 from app.models import user as user_model
-from app.services import trade_service, file_processing_service
+from app.services import import_service
 
 router = APIRouter()
 
-@router.post("/orders/upload", status_code=201)
-async def upload_orders(
+@router.post("/orders/upload", status_code=202, response_model=import_job_schema.ImportJobCreated)
+def upload_orders(
     file: UploadFile = File(...),
     timezone: str = Form(...),
     db: Session = Depends(database.get_db),
+    session_factory: sessionmaker = Depends(database.get_session_factory),
     current_user: user_model.User = Depends(security.get_current_user)
 ):
-    df = file_processing_service.process_file(file)
-
-    # Rename columns to match the schema
-    df.columns = [
-        "execution_time", "spread", "side", "quantity", "position_effect", "symbol",
-        "expiration_date", "strike_price", "option_type", "price", "net_price", "order_type"
-    ]
-
-    # Check for missing values in required columns
-    required_cols = ["side", "position_effect", "symbol", "price", "net_price"]
-    for col in required_cols:
-        if df[col].isnull().any():
-            raise HTTPException(status_code=400, detail=f"Missing values in required column: '{col}'")
-
-    # Convert date columns
-    df['execution_time'] = pd.to_datetime(df['execution_time']).dt.tz_localize(timezone).dt.tz_convert('UTC')
-    df['expiration_date'] = pd.to_datetime(df['expiration_date']).dt.date
-
-    # Replace NaT with None for nullable date fields
-    df['expiration_date'] = df['expiration_date'].replace({pd.NaT: None})
-
-    # Replace inf and -inf with None
-    df.replace([float('inf'), float('-inf')], None, inplace=True)
-
-    # Convert quantity to integer, filling missing with 0
-    df['quantity'] = df['quantity'].fillna(0).astype(int)
-
-    new_orders = []
-    for _, row in df.iterrows():
-        order_data = order_schema.OrderCreate(**row.to_dict())
-        db_order = order_crud.create_order(db=db, order=order_data, user_id=current_user.id)
-        new_orders.append(db_order)
-
-    # Process the new orders to create or update trades
-    trade_service.process_new_orders(db=db, user_id=current_user.id, new_orders=new_orders)
-
-    return {"message": f"{len(df)} orders have been successfully uploaded and processed."}
+    job = import_service.submit_import(
+        db=db, session_factory=session_factory, file=file, timezone=timezone, user_id=current_user.id
+    )
+    return {"job_id": job.id, "status_url": f"/api/v1/imports/{job.id}"}
 
 @router.get("/orders", response_model=List[order_schema.Order])
-def get_orders(
-    db: Session = Depends(database.get_db),
+async def get_orders(
+    request: Request,
+    filters: order_schema.OrderFilters = Depends(),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    total: Literal["none", "exact", "estimate"] = "none",
+    db: Session = Depends(database.get_session),
     current_user: user_model.User = Depends(security.get_current_user)
 ):
-    return order_crud.get_orders_by_user(db=db, user_id=current_user.id)
\ No newline at end of file
+    def load(session: Session):
+        orders, next_cursor, count = order_crud.get_orders_page(
+            session, user_id=current_user.id, filters=filters, limit=limit, cursor=cursor, total=total
+        )
+        return orders, pagination.page_headers(next_cursor, count)
+
+    return await result_cache.cached_json(request, db, current_user.id, List[order_schema.Order], load)
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from app.database import database
+from app.core import result_cache, security
+from app.schemas import stats as stats_schema
+from app.crud import stats as stats_crud
+from app.models import user as user_model
+from app.services import equity_curve_service
+
+router = APIRouter()
+
+@router.get("/stats/summary", response_model=stats_schema.StatsSummary)
+async def get_stats_summary(
+    request: Request,
+    filters: stats_schema.StatsFilters = Depends(),
+    db: Session = Depends(database.get_session),
+    current_user: user_model.User = Depends(security.get_current_user)
+):
+    def load(session: Session):
+        return stats_crud.get_summary(session, user_id=current_user.id, filters=filters), {}
+
+    return await result_cache.cached_json(request, db, current_user.id, stats_schema.StatsSummary, load)
+
+@router.get("/stats/equity-curve", response_model=stats_schema.EquityCurve)
+async def get_equity_curve(
+    request: Request,
+    filters: stats_schema.StatsFilters = Depends(),
+    points: int = Query(500, ge=3, le=10000, description="Maximum number of points in the series"),
+    max_periods: int = Query(10, ge=0, le=1000, description="Number of deepest underwater periods to return"),
+    db: Session = Depends(database.get_session),
+    current_user: user_model.User = Depends(security.get_current_user)
+):
+    def load(session: Session):
+        return equity_curve_service.get_equity_curve(
+            session, user_id=current_user.id, filters=filters, points=points, max_periods=max_periods,
+        ), {}
+
+    return await result_cache.cached_json(request, db, current_user.id, stats_schema.EquityCurve, load)
@@ -1,59 +1,128 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.database import database
-from app.core import security
+from app.core import result_cache, security
+from app.schemas import order as order_schema
 from app.schemas import trade as trade_schema
 from app.crud import trade as trade_crud
+from app.crud import pagination
 from app.models import user as user_model
+from app.services import trade_rebuild_service
 
 router = APIRouter()
 
 @router.post("/trades", response_model=trade_schema.Trade)
-def create_trade(
+async def create_trade(
     trade: trade_schema.TradeCreate,
-    db: Session = Depends(database.get_db),
+    db: Session = Depends(database.get_session),
     current_user: user_model.User = Depends(security.get_current_user)
 ):
-    return trade_crud.create_trade(db=db, trade=trade, user_id=current_user.id)
+    return await database.run_in_session(db, trade_crud.create_trade, trade=trade, user_id=current_user.id)
 
-@router.get("/trades", response_model=List[trade_schema.Trade])
-def get_trades(
+@router.post("/trades/rebuild", response_model=trade_schema.TradeRebuild)
+def rebuild_trades(
     db: Session = Depends(database.get_db),
     current_user: user_model.User = Depends(security.get_current_user)
 ):
-    return trade_crud.get_trades_by_user(db=db, user_id=current_user.id)
+    # CPU-bound replay: a sync route keeps it on the threadpool, off the event loop
+    return trade_rebuild_service.rebuild_trades(db, user_id=current_user.id)
+
+@router.get("/trades", response_model=Union[List[trade_schema.Trade], List[trade_schema.TradeSummary]])
+async def get_trades(
+    request: Request,
+    filters: trade_schema.TradeFilters = Depends(),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    total: Literal["none", "exact", "estimate"] = "none",
+    view: Literal["summary", "full"] = Query("full", description="summary leaves out the orders of each trade"),
+    fields: Optional[str] = Query(None, description="Comma-separated trade columns to return; implies view=summary"),
+    db: Session = Depends(database.get_session),
+    current_user: user_model.User = Depends(security.get_current_user)
+):
+    # Summary and sparse views select only their columns and never load the orders
+    if fields is not None:
+        columns = _trade_fields(fields)
+        response_model = List[trade_schema.trade_fields_model(columns)]
+    elif view == "summary":
+        columns = trade_schema.TRADE_FIELDS
+        response_model = List[trade_schema.TradeSummary]
+    else:
+        columns = None
+        response_model = List[trade_schema.Trade]
+
+    def load(session: Session):
+        trades, next_cursor, count = trade_crud.get_trades_page(
+            session, user_id=current_user.id, filters=filters, limit=limit, cursor=cursor,
+            orders_loading="selectin", total=total, columns=columns,
+        )
+        return trades, pagination.page_headers(next_cursor, count)
+
+    return await result_cache.cached_json(request, db, current_user.id, response_model, load)
+
+def _trade_fields(fields: str) -> tuple[str, ...]:
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(trade_schema.TRADE_FIELDS)
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown)) or '(none given)'}; "
+                   f"choose from {', '.join(trade_schema.TRADE_FIELDS)}",
+        )
+    # Schema order, so the same set always shares one response model
+    return tuple(name for name in trade_schema.TRADE_FIELDS if name in requested)
 
 @router.get("/trades/{trade_id}", response_model=trade_schema.Trade)
-def get_trade(
+async def get_trade(
+    request: Request,
     trade_id: int,
-    db: Session = Depends(database.get_db),
+    db: Session = Depends(database.get_session),
     current_user: user_model.User = Depends(security.get_current_user)
 ):
-    db_trade = trade_crud.get_trade_by_id(db=db, trade_id=trade_id, user_id=current_user.id)
-    if db_trade is None:
-        raise HTTPException(status_code=404, detail="Trade not found")
-    return db_trade
+    def load(session: Session):
+        db_trade = trade_crud.get_trade_by_id(session, trade_id=trade_id, user_id=current_user.id, orders_loading="joined")
+        if db_trade is None:
+            raise HTTPException(status_code=404, detail="Trade not found")
+        return db_trade, {}
+
+    return await result_cache.cached_json(request, db, current_user.id, trade_schema.Trade, load)
+
+@router.get("/trades/{trade_id}/orders", response_model=List[order_schema.Order])
+async def get_trade_orders(
+    request: Request,
+    trade_id: int,
+    db: Session = Depends(database.get_session),
+    current_user: user_model.User = Depends(security.get_current_user)
+):
+    def load(session: Session):
+        orders = trade_crud.get_trade_orders(session, trade_id=trade_id, user_id=current_user.id)
+        if orders is None:
+            raise HTTPException(status_code=404, detail="Trade not found")
+        return orders, {}
+
+    return await result_cache.cached_json(request, db, current_user.id, List[order_schema.Order], load)
 
 @router.put("/trades/{trade_id}", response_model=trade_schema.Trade)
-def update_trade(
+async def update_trade(
     trade_id: int,
     trade: trade_schema.TradeUpdate,
-    db: Session = Depends(database.get_db),
+    db: Session = Depends(database.get_session),
     current_user: user_model.User = Depends(security.get_current_user)
 ):
-    db_trade = trade_crud.update_trade(db=db, trade_id=trade_id, trade=trade, user_id=current_user.id)
+    db_trade = await database.run_in_session(
+        db, trade_crud.get_trade_by_id, trade_id=trade_id, user_id=current_user.id, orders_loading="joined"
+    )
     if db_trade is None:
         raise HTTPException(status_code=404, detail="Trade not found")
-    return db_trade
+    return await database.run_in_session(db, trade_crud.update_trade, db_trade=db_trade, trade_update=trade)
 
 @router.delete("/trades/{trade_id}", response_model=trade_schema.Trade)
-def delete_trade(
+async def delete_trade(
     trade_id: int,
-    db: Session = Depends(database.get_db),
+    db: Session = Depends(database.get_session),
     current_user: user_model.User = Depends(security.get_current_user)
 ):
-    db_trade = trade_crud.delete_trade(db=db, trade_id=trade_id, user_id=current_user.id)
+    db_trade = await database.run_in_session(db, trade_crud.delete_trade, trade_id=trade_id, user_id=current_user.id)
     if db_trade is None:
         raise HTTPException(status_code=404, detail="Trade not found")
     return db_trade
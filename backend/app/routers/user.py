@@ -30,10 +30,10 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
         )
     access_token_expires = timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/users/me", response_model=user_schema.User)
-def read_users_me(current_user: user_schema.User = Depends(security.get_current_user)):
+async def read_users_me(current_user: user_schema.User = Depends(security.get_current_user)):
     return current_user
\ No newline at end of file
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import date
+from typing import List
+
+class CalendarDay(BaseModel):
+    date: date
+    pnl: float
+    trades: int
+    wins: int
+    losses: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CalendarMonth(BaseModel):
+    month: str  # YYYY-MM
+    pnl: float
+    trades: int
+    days: List[CalendarDay]  # only days with closed trades
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class ImportJobCreated(BaseModel):
+    job_id: str
+    status_url: str
+
+class ImportJob(BaseModel):
+    id: str
+    filename: Optional[str] = None
+    stage: str
+    rows_processed: int
+    rows_per_second: Optional[float] = None
+    duplicates_skipped: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
 from datetime import datetime, date
-from typing import Optional
+from typing import Literal, Optional
 import math
 
 class OrderBase(BaseModel):
@@ -42,3 +42,10 @@ class Order(OrderBase):
 
     class Config:
         from_attributes = True  # replaces orm_mode in Pydantic v2
+
+class OrderFilters(BaseModel):
+    symbol: Optional[str] = None
+    side: Optional[Literal['BUY', 'SELL']] = None
+    position_effect: Optional[Literal['TO OPEN', 'TO CLOSE']] = None
+    start: Optional[datetime] = None  # execution_time >= start
+    end: Optional[datetime] = None    # execution_time < end
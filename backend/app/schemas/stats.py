@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class StatsFilters(BaseModel):
+    symbol: Optional[str] = None
+    start: Optional[datetime] = None  # entry_timestamp >= start
+    end: Optional[datetime] = None    # entry_timestamp < end
+
+# Computed over closed trades; ratios are None when their denominator is zero
+class PnlStats(BaseModel):
+    trades: int
+    wins: int
+    losses: int
+    breakeven: int
+    win_rate: Optional[float] = None
+    net_pnl: float
+    gross_profit: float
+    gross_loss: float
+    profit_factor: Optional[float] = None
+    expectancy: Optional[float] = None
+    average_win: Optional[float] = None
+    average_loss: Optional[float] = None
+    largest_win: Optional[float] = None
+    largest_loss: Optional[float] = None
+
+class StatsSummary(PnlStats):
+    by_direction: dict[str, PnlStats]
+    by_status: dict[str, int]  # all trades, open and closed
+
+class EquityPoint(BaseModel):
+    timestamp: datetime  # exit time of the trade
+    equity: float        # cumulative realized P&L
+    drawdown: float      # equity minus the running peak, <= 0
+
+class UnderwaterPeriod(BaseModel):
+    start: datetime            # first trade below the previous peak
+    end: Optional[datetime]    # trade that made a new peak, None while still underwater
+    depth: float               # deepest drawdown in the period
+    trades: int
+    duration_seconds: float
+
+class EquityCurve(BaseModel):
+    trades: int
+    net_pnl: float
+    max_drawdown: float
+    max_drawdown_at: Optional[datetime] = None
+    longest_drawdown_seconds: float
+    current_drawdown: float
+    underwater_periods: List[UnderwaterPeriod]  # the deepest ones, in time order
+    points: List[EquityPoint]                   # downsampled series
@@ -1,10 +1,12 @@
-from pydantic import BaseModel, ConfigDict
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, create_model
 from datetime import datetime
-from typing import Optional, List
+from typing import Literal, Optional, List
 from .order import Order
 
 class TradeBase(BaseModel):
     symbol: str
+    contract_key: Optional[str] = None  # defaults to the symbol
     status: str
     direction: str
     volume: int
@@ -21,6 +23,7 @@ class TradeCreate(TradeBase):
 
 class TradeUpdate(BaseModel):
     symbol: Optional[str] = None
+    contract_key: Optional[str] = None
     status: Optional[str] = None
     direction: Optional[str] = None
     volume: Optional[int] = None
@@ -32,9 +35,36 @@ class TradeUpdate(BaseModel):
     executions_count: Optional[int] = None
     notes: Optional[str] = None
 
-class Trade(TradeBase):
+class TradeSummary(TradeBase):
     id: int
     user_id: int
-    orders: List[Order] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+class Trade(TradeSummary):
+    orders: List[Order] = []
+
+# Columns a sparse GET /trades?fields= may ask for, in response order
+TRADE_FIELDS = tuple(TradeSummary.model_fields)
+
+@lru_cache(maxsize=None)
+def trade_fields_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """TradeSummary restricted to `fields` (a subset of TRADE_FIELDS)."""
+    return create_model(
+        "TradeFields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (TradeSummary.model_fields[name].annotation, TradeSummary.model_fields[name]) for name in fields},
+    )
+
+class TradeFilters(BaseModel):
+    symbol: Optional[str] = None
+    status: Optional[Literal['OPEN', 'CLOSED']] = None
+    direction: Optional[Literal['LONG', 'SHORT']] = None
+    start: Optional[datetime] = None  # entry_timestamp >= start
+    end: Optional[datetime] = None    # entry_timestamp < end
+
+class TradeRebuild(BaseModel):
+    orders: int       # orders replayed
+    trades: int       # trades written
+    open_trades: int
+    seconds: float
@@ -0,0 +1,115 @@
+# backend/app/services/equity_curve_service.py
+#
+# Equity curve, drawdown and underwater periods over closed trades, computed with
+# cumulative NumPy operations and downsampled with LTTB for charting.
+
+import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from ..crud import stats as stats_crud
+from ..schemas import stats as stats_schema
+
+
+def get_equity_curve(
+    db: Session,
+    user_id: int,
+    filters: stats_schema.StatsFilters,
+    points: int,
+    max_periods: int,
+) -> dict:
+    # 1. Closed trades in exit order, as arrays
+    rows = stats_crud.get_closed_pnl_series(db, user_id=user_id, filters=filters)
+    if not rows:
+        return {
+            "trades": 0, "net_pnl": 0.0, "max_drawdown": 0.0, "max_drawdown_at": None,
+            "longest_drawdown_seconds": 0.0, "current_drawdown": 0.0, "underwater_periods": [], "points": [],
+        }
+    # utc=True reads naive values as UTC, like core.datetimes.as_utc
+    times = pd.to_datetime([row[0] for row in rows], utc=True).as_unit("us").asi8
+    pnl = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+
+    # 2. Equity, running peak (starting from flat) and drawdown from that peak
+    equity = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+    drawdown = equity - peak
+
+    # 3. Underwater periods: runs of trades below the previous peak
+    periods = _underwater_periods(drawdown, times)
+    deepest = sorted(periods, key=lambda p: p["depth"])[:max_periods]
+    trough = int(np.argmin(drawdown))
+
+    # 4. Chart-ready series
+    keep = lttb(times.astype(np.float64), equity, points)
+    return {
+        "trades": len(pnl),
+        "net_pnl": float(equity[-1]),
+        "max_drawdown": float(drawdown[trough]),
+        "max_drawdown_at": _to_datetime(times[trough]) if drawdown[trough] < 0 else None,
+        "longest_drawdown_seconds": max((p["duration_seconds"] for p in periods), default=0.0),
+        "current_drawdown": float(drawdown[-1]),
+        "underwater_periods": sorted(deepest, key=lambda p: p["start"]),
+        "points": [
+            {"timestamp": _to_datetime(times[i]), "equity": float(equity[i]), "drawdown": float(drawdown[i])}
+            for i in keep
+        ],
+    }
+
+
+def _underwater_periods(drawdown: np.ndarray, times: np.ndarray) -> list[dict]:
+    underwater = (drawdown < 0).astype(np.int8)
+    edges = np.diff(underwater, prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)  # index of the trade that recovered, or len() if still underwater
+    if not len(starts):
+        return []
+
+    depths = np.minimum.reduceat(drawdown, starts)
+    recovered = ends < len(drawdown)
+    end_times = np.where(recovered, times[np.minimum(ends, len(times) - 1)], times[-1])
+    durations = (end_times - times[starts]) / 1e6
+
+    return [
+        {
+            "start": _to_datetime(times[start]),
+            "end": _to_datetime(times[end]) if is_recovered else None,
+            "depth": float(depth),
+            "trades": int(end - start),
+            "duration_seconds": float(duration),
+        }
+        for start, end, depth, is_recovered, duration in zip(starts, ends, depths, recovered, durations)
+    ]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the shape of
+    the series. Always keeps the first and last points."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    # Bucket boundaries over the points between the first and the last
+    bounds = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        # Average of the next bucket is the third vertex of the triangle
+        next_start, next_end = end, bounds[i + 2] if i + 2 < len(bounds) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def _to_datetime(microseconds: int) -> datetime.datetime:
+    return datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(microseconds=int(microseconds))
@@ -0,0 +1,245 @@
+# backend/app/services/import_service.py
+
+import datetime
+import glob
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import Headers
+
+from ..crud import daily_pnl as daily_pnl_crud
+from ..crud import import_job as import_job_crud
+from ..crud import order as order_crud
+from ..crud import user as user_crud
+from ..models import import_job as import_job_model
+from . import file_processing_service, order_normalization_service, trade_service
+from .matching_engine import OrderRecord, contract_key
+
+logger = logging.getLogger(__name__)
+
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "2"))
+IMPORT_MAX_PENDING = int(os.getenv("IMPORT_MAX_PENDING", "16"))
+IMPORT_UPLOAD_DIR = os.getenv("IMPORT_UPLOAD_DIR") or tempfile.gettempdir()
+
+_executor = ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="import")
+_pending = threading.BoundedSemaphore(IMPORT_MAX_PENDING)
+
+# Live progress of the jobs running in this process: job_id -> (stage, rows_processed).
+# The import itself is a single transaction, so intermediate counts are not written to the
+# job row; the row records the stage transitions and the final result.
+_progress: dict[str, tuple[str, int]] = {}
+
+# Jobs only run in the executor of the process that accepted them
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+INTERRUPTED_ERROR = "The import was interrupted by a server restart. Please upload the file again."
+
+
+def import_orders(
+    db: Session,
+    file: UploadFile,
+    timezone: str,
+    user_id: int,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> tuple[int, int]:
+    """Returns the number of rows read and how many of them were already stored."""
+    started = time.perf_counter()
+    rows_processed = duplicates = 0
+    occurrences = Counter()
+    new_orders = []
+
+    # Each chunk is validated and inserted before the next one is parsed. Everything runs
+    # in one transaction, so a bad row anywhere in the file leaves nothing behind.
+    try:
+        for frame in file_processing_service.iter_file_chunks(file):
+            records = order_normalization_service.normalize_orders(frame, timezone, row_offset=rows_processed)
+            rows_processed += len(records)
+
+            # Drop executions a previous, overlapping upload already stored
+            order_normalization_service.add_fingerprints(records, occurrences)
+            times = [r["execution_time"] for r in records]
+            existing = order_crud.get_fingerprints(db, user_id=user_id, start=min(times), end=max(times)) if records else set()
+            if existing:
+                records = [r for r in records if r["fingerprint"] not in existing]
+                duplicates += len(times) - len(records)
+
+            order_ids = order_crud.create_orders_bulk(db=db, orders=records, user_id=user_id)
+            # Keep only the compact records the matching engine needs
+            new_orders.extend(
+                OrderRecord(
+                    order_id, r["execution_time"], r["symbol"], r["side"], r["quantity"], r["position_effect"], r["price"],
+                    contract_key(r["symbol"], r["expiration_date"], r["strike_price"], r["option_type"], r["spread"]),
+                )
+                for order_id, r in zip(order_ids, records)
+            )
+            if progress:
+                progress('PARSING', rows_processed)
+
+        if progress:
+            progress('MATCHING', rows_processed)
+        # Calendar days are cut in the timezone of the latest upload
+        timezone_changed = user_crud.set_timezone(db, user_id=user_id, timezone=timezone)
+        if timezone_changed:
+            daily_pnl_crud.rebuild(db, user_id=user_id)
+        if new_orders or timezone_changed:
+            user_crud.bump_data_version(db, user_id=user_id)
+        trade_service.process_new_orders(db=db, user_id=user_id, new_orders=new_orders)
+    except Exception:
+        db.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Ingested %d orders (%d already stored) for user %s in %.3fs (%.0f rows/sec)",
+        rows_processed, duplicates, user_id, elapsed, rows_processed / elapsed if elapsed else 0.0,
+    )
+    return rows_processed, duplicates
+
+
+def submit_import(
+    db: Session,
+    session_factory: sessionmaker,
+    file: UploadFile,
+    timezone: str,
+    user_id: int,
+) -> import_job_model.ImportJob:
+    file_processing_service.validate_file(file)
+
+    if not _pending.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail="Too many imports in progress. Please try again shortly.")
+
+    try:
+        job = import_job_crud.create_import_job(db, user_id=user_id, filename=file.filename, worker=WORKER_ID)
+        try:
+            path = _store_upload(file, job.id)
+        except Exception:
+            import_job_crud.mark_finished(db, job.id, rows_processed=0, error="The upload could not be stored.")
+            raise
+        _executor.submit(
+            _run_import_job, session_factory, job.id, path, file.filename, file.content_type, timezone, user_id
+        )
+    except Exception:
+        _pending.release()
+        raise
+    return job
+
+
+def get_job_status(db: Session, job_id: str, user_id: int) -> Optional[dict]:
+    job = import_job_crud.get_import_job(db, job_id=job_id, user_id=user_id)
+    if job is None:
+        return None
+
+    stage, rows_processed = _progress.get(job.id, (job.stage, job.rows_processed))
+    rows_per_second = None
+    if job.started_at:
+        elapsed = ((job.finished_at or datetime.datetime.utcnow()) - job.started_at).total_seconds()
+        rows_per_second = round(rows_processed / elapsed, 1) if elapsed > 0 else None
+
+    return {
+        "id": job.id,
+        "filename": job.filename,
+        "stage": stage,
+        "rows_processed": rows_processed,
+        "rows_per_second": rows_per_second,
+        "duplicates_skipped": job.duplicates_skipped,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def fail_interrupted_jobs(session_factory: sessionmaker) -> int:
+    """Fails the unfinished jobs whose process is gone and removes their uploads. Called
+    at startup: a job's progress lives only in the executor that ran it, so after a
+    restart it would otherwise stay QUEUED or PARSING forever."""
+    host = socket.gethostname()
+    with session_factory() as db:
+        interrupted = [
+            job_id for job_id, worker in import_job_crud.get_unfinished_jobs(db) if _worker_gone(worker, host)
+        ]
+        for job_id in interrupted:
+            import_job_crud.mark_finished(db, job_id, rows_processed=0, error=INTERRUPTED_ERROR)
+            for path in glob.glob(_upload_path(job_id, "*")):
+                os.remove(path)
+    if interrupted:
+        logger.warning("Marked %d interrupted import job(s) as failed", len(interrupted))
+    return len(interrupted)
+
+
+def _worker_gone(worker: Optional[str], host: str) -> bool:
+    if worker is None:  # accepted before jobs recorded their worker
+        return True
+    worker_host, _, pid = worker.rpartition(":")
+    if worker_host != host:
+        # Another host's job; that host fails its own when it restarts
+        return False
+    if int(pid) == os.getpid():
+        # A previous process with our pid; this one has not accepted any jobs yet
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def _upload_path(job_id: str, suffix: str) -> str:
+    return os.path.join(IMPORT_UPLOAD_DIR, f"import-{job_id}{suffix}")
+
+
+def _store_upload(file: UploadFile, job_id: str) -> str:
+    path = _upload_path(job_id, os.path.splitext(file.filename or "")[1])
+    with open(path, "xb") as stored:
+        file.file.seek(0)
+        shutil.copyfileobj(file.file, stored)
+    return path
+
+
+def _run_import_job(
+    session_factory: sessionmaker,
+    job_id: str,
+    path: str,
+    filename: str,
+    content_type: str,
+    timezone: str,
+    user_id: int,
+):
+    def report(stage: str, rows_processed: int):
+        _progress[job_id] = (stage, rows_processed)
+
+    rows_processed, duplicates, error = 0, 0, None
+    try:
+        with session_factory() as db:
+            import_job_crud.mark_started(db, job_id)
+        report('PARSING', 0)
+
+        with open(path, "rb") as stored, session_factory() as db:
+            upload = UploadFile(file=stored, filename=filename, headers=Headers({"content-type": content_type or ""}))
+            rows_processed, duplicates = import_orders(db, upload, timezone, user_id, progress=report)
+    except HTTPException as e:
+        error = e.detail
+    except Exception as e:
+        logger.exception("Import job %s failed", job_id)
+        error = f"Unexpected error while importing: {e}"
+    finally:
+        try:
+            with session_factory() as db:
+                import_job_crud.mark_finished(
+                    db, job_id, rows_processed=rows_processed, duplicates_skipped=duplicates, error=error
+                )
+        finally:
+            _progress.pop(job_id, None)
+            _pending.release()
+            os.remove(path)
@@ -0,0 +1,205 @@
+# backend/app/services/matching_engine.py
+#
+# Pure-Python trade matching. Works on compact records instead of ORM objects so large
+# imports avoid attribute instrumentation and the unit of work; trade_service persists
+# the result with a few bulk statements.
+
+import logging
+import os
+from array import array
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+logger.disabled = True
+
+# Keep legs opened as part of a multi-leg spread apart from the same contract held alone.
+# Off by default: brokers often label a leg closed on its own as SINGLE.
+POSITION_GROUP_BY_SPREAD = os.getenv("POSITION_GROUP_BY_SPREAD", "false").lower() in ("1", "true", "yes")
+SINGLE_LEG_SPREADS = {"STOCK", "SINGLE"}
+
+
+def contract_key(symbol: str, expiration_date: Optional[date] = None, strike_price: Optional[float] = None,
+                 option_type: Optional[str] = None, spread: Optional[str] = None) -> str:
+    """Canonical key of the instrument a position is held in. Stock keeps the bare symbol;
+    an option leg adds its expiration, strike and type, e.g. 'SPY|2025-10-17|500.0|CALL'."""
+    key = symbol
+    if expiration_date is not None or strike_price:
+        expiration = expiration_date.isoformat() if expiration_date else ""
+        key = f"{symbol}|{expiration}|{float(strike_price or 0.0)!r}|{option_type or ''}"
+    if POSITION_GROUP_BY_SPREAD and spread and spread not in SINGLE_LEG_SPREADS:
+        key = f"{key}|{spread}"
+    return key
+
+
+class OrderRecord:
+    __slots__ = ("id", "execution_time", "symbol", "side", "quantity", "position_effect", "price", "contract_key")
+
+    def __init__(self, id: int, execution_time: datetime, symbol: str, side: str,
+                 quantity: int, position_effect: str, price: float, contract_key: Optional[str] = None):
+        self.id = id
+        self.execution_time = execution_time
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.position_effect = position_effect
+        self.price = price
+        self.contract_key = contract_key or symbol
+
+
+class Position:
+    """An open (or just closed) trade in one contract.
+
+    `trade_id` is None for positions opened during this run. `order_ids` holds only the
+    executions matched during this run, i.e. the trade_orders links still to be written.
+    """
+    __slots__ = (
+        "trade_id", "symbol", "contract_key", "direction", "status", "volume", "avg_entry_price", "avg_exit_price",
+        "entry_timestamp", "exit_timestamp", "pnl", "executions_count",
+        "entry_quantity", "entry_notional", "exit_quantity", "exit_notional", "order_ids",
+    )
+
+    def __init__(self, symbol: str, direction: str, trade_id: Optional[int] = None, status: str = 'OPEN',
+                 volume: int = 0, avg_entry_price: float = 0.0, avg_exit_price: Optional[float] = None,
+                 entry_timestamp: Optional[datetime] = None, exit_timestamp: Optional[datetime] = None,
+                 pnl: Optional[float] = None, executions_count: int = 0,
+                 entry_quantity: int = 0, entry_notional: float = 0.0,
+                 exit_quantity: int = 0, exit_notional: float = 0.0, contract_key: Optional[str] = None):
+        self.trade_id = trade_id
+        self.symbol = symbol
+        self.contract_key = contract_key or symbol
+        self.direction = direction
+        self.status = status
+        self.volume = volume
+        self.avg_entry_price = avg_entry_price
+        self.avg_exit_price = avg_exit_price
+        self.entry_timestamp = entry_timestamp
+        self.exit_timestamp = exit_timestamp
+        self.pnl = pnl
+        self.executions_count = executions_count
+        self.entry_quantity = entry_quantity
+        self.entry_notional = entry_notional
+        self.exit_quantity = exit_quantity
+        self.exit_notional = exit_notional
+        self.order_ids = array('q')
+
+    def trade_values(self) -> dict:
+        return {
+            "symbol": self.symbol,
+            "contract_key": self.contract_key,
+            "status": self.status,
+            "direction": self.direction,
+            "volume": self.volume,
+            "avg_entry_price": self.avg_entry_price,
+            "avg_exit_price": self.avg_exit_price,
+            "entry_timestamp": self.entry_timestamp,
+            "exit_timestamp": self.exit_timestamp,
+            "pnl": self.pnl,
+            "executions_count": self.executions_count,
+            "entry_quantity": self.entry_quantity,
+            "entry_notional": self.entry_notional,
+            "exit_quantity": self.exit_quantity,
+            "exit_notional": self.exit_notional,
+        }
+
+
+def match_orders(orders: list[OrderRecord], open_positions: Iterable[Position]) -> list[Position]:
+    """Match executions into positions and return every position that changed.
+
+    Positions with `trade_id is None` are new trades; the others already exist.
+    """
+    positions = {position.contract_key: position for position in open_positions}
+    touched: dict[int, Position] = {}
+
+    # Sort orders chronologically
+    for order in sorted(orders, key=lambda o: o.execution_time):
+        position = positions.get(order.contract_key)
+
+        if order.position_effect == 'TO OPEN':
+            direction = 'LONG' if order.side == 'BUY' else 'SHORT'
+            if position is None:
+                position = _open_position(order, direction)
+                positions[order.contract_key] = position
+            elif position.direction == direction:
+                _add_execution(position, order)
+            else:
+                logger.error(
+                    f"Data anomaly: Received a 'TO OPEN' order (ID: {order.id}) for {order.contract_key} "
+                    f"with direction {direction}, but an open trade (ID: {position.trade_id}) "
+                    f"already exists in the opposite direction ({position.direction}). "
+                    f"This order will be ignored."
+                )
+                continue
+        elif order.position_effect == 'TO CLOSE':
+            if position is None:
+                logger.warning(f"Orphan closing order found (no open trade): {order.id} for {order.contract_key}")
+                continue
+            _add_execution(position, order)
+            if _close_if_fully_exited(position, order):
+                del positions[order.contract_key]
+        else:
+            continue
+
+        touched[id(position)] = position
+
+    return list(touched.values())
+
+
+def _open_position(order: OrderRecord, direction: str) -> Position:
+    quantity = abs(order.quantity)
+    position = Position(
+        symbol=order.symbol,
+        contract_key=order.contract_key,
+        direction=direction,
+        volume=quantity,
+        avg_entry_price=order.price,
+        entry_timestamp=order.execution_time,
+        executions_count=1,
+        entry_quantity=quantity,
+        entry_notional=abs(order.quantity * order.price),
+    )
+    position.order_ids.append(order.id)
+    return position
+
+
+def _add_execution(position: Position, order: OrderRecord):
+    position.order_ids.append(order.id)
+    position.executions_count += 1
+
+    quantity = abs(order.quantity)
+    notional = abs(order.quantity * order.price)
+    if order.position_effect == 'TO OPEN':
+        position.entry_quantity += quantity
+        position.entry_notional += notional
+        position.avg_entry_price = round(position.entry_notional / position.entry_quantity, 5)
+        position.volume = position.entry_quantity
+    else:
+        position.exit_quantity += quantity
+        position.exit_notional += notional
+
+
+def _close_if_fully_exited(position: Position, order: OrderRecord) -> bool:
+    if position.entry_quantity != position.exit_quantity or position.entry_quantity <= 0:
+        return False
+
+    position.status = 'CLOSED'
+    # Orders are processed chronologically, so the closing order is the latest exit
+    position.exit_timestamp = order.execution_time
+    position.avg_exit_price = position.exit_notional / position.exit_quantity
+
+    if position.direction == 'LONG':
+        position.pnl = round(((position.avg_exit_price - position.avg_entry_price) * position.volume), 5)
+    else: # SHORT
+        position.pnl = round(((position.avg_entry_price - position.avg_exit_price) * position.volume), 5)
+    return True
+
+
+def replay_partitions(partitions: list[list[tuple]]) -> list[Position]:
+    """Match complete order histories from scratch. Each partition holds the
+    (id, execution_time, symbol, side, quantity, position_effect, price, contract_key)
+    rows of one contract in execution order; contracts never share state, so partitions
+    can be replayed in separate processes."""
+    positions = []
+    for rows in partitions:
+        positions.extend(match_orders([OrderRecord(*row) for row in rows], []))
+    return positions
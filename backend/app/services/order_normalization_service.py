@@ -0,0 +1,140 @@
+# backend/app/services/order_normalization_service.py
+
+import datetime
+import hashlib
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+
+from ..core.datetimes import as_utc
+
+ORDER_COLUMNS = [
+    "execution_time", "spread", "side", "quantity", "position_effect", "symbol",
+    "expiration_date", "strike_price", "option_type", "price", "net_price", "order_type"
+]
+REQUIRED_COLUMNS = ["execution_time", "side", "position_effect", "symbol", "price", "net_price"]
+OPTIONAL_TEXT_COLUMNS = ["spread", "option_type", "order_type"]
+MAX_REPORTED_ROWS = 10
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _format_rows(mask: pd.Series, row_offset: int) -> str:
+    # Row numbers are 1-based data rows (the header is not counted)
+    positions = np.flatnonzero(mask.to_numpy()) + row_offset + 1
+    rows = ", ".join(str(p) for p in positions[:MAX_REPORTED_ROWS])
+    if len(positions) > MAX_REPORTED_ROWS:
+        rows += f" and {len(positions) - MAX_REPORTED_ROWS} more"
+    return rows
+
+
+def _raise_for_rows(message: str, column: str, mask: pd.Series, row_offset: int):
+    if mask.any():
+        raise HTTPException(
+            status_code=400,
+            detail=f"{message}: '{column}' (rows: {_format_rows(mask, row_offset)})"
+        )
+
+
+def _to_number(df: pd.DataFrame, column: str, row_offset: int) -> pd.Series:
+    values = pd.to_numeric(df[column], errors="coerce")
+    _raise_for_rows("Invalid number in column", column, values.isna() & df[column].notna(), row_offset)
+    return values.astype("float64")
+
+
+def _with_none(values: pd.Series, present: pd.Series) -> list:
+    return values.astype(object).where(present, None).tolist()
+
+
+def normalize_orders(df: pd.DataFrame, timezone: str, row_offset: int = 0) -> list[dict]:
+    """Validate and convert a broker export frame column by column.
+
+    Returns one dict per row with plain Python values, ready for bulk insertion.
+    `row_offset` is the number of data rows that came before this frame, so chunked
+    callers keep reporting the row numbers of the original file.
+    """
+    df = df.copy()
+    df.columns = ORDER_COLUMNS
+
+    # 1. Required columns
+    for col in REQUIRED_COLUMNS:
+        _raise_for_rows("Missing values in required column", col, df[col].isnull(), row_offset)
+
+    # 2. Numeric columns. NaN/inf mirror the OrderCreate float validators.
+    price = _to_number(df, "price", row_offset)
+    net_price = _to_number(df, "net_price", row_offset)
+    for col, values in (("price", price), ("net_price", net_price)):
+        _raise_for_rows("Invalid number in column", col, ~np.isfinite(values), row_offset)
+
+    strike = _to_number(df, "strike_price", row_offset)
+    strike_is_inf = np.isinf(strike)
+    strike = strike.fillna(0.0).astype(object)
+    strike[strike_is_inf] = None
+
+    quantity = _to_number(df, "quantity", row_offset)
+    _raise_for_rows("Invalid number in column", "quantity", np.isinf(quantity), row_offset)
+    quantity = quantity.fillna(0)
+    _raise_for_rows("Invalid integer in column", "quantity", quantity != quantity.round(), row_offset)
+    quantity = quantity.astype("int64")
+
+    # 3. Dates and timezone conversion
+    local_times = pd.to_datetime(df["execution_time"], errors="coerce")
+    _raise_for_rows("Invalid date in column", "execution_time", local_times.isna(), row_offset)
+    try:
+        utc_times = local_times.dt.tz_localize(timezone, ambiguous="NaT", nonexistent="NaT").dt.tz_convert("UTC")
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone: '{timezone}'")
+    _raise_for_rows("Ambiguous or nonexistent local time in column", "execution_time", utc_times.isna(), row_offset)
+
+    expiration = pd.to_datetime(df["expiration_date"], errors="coerce")
+    _raise_for_rows("Invalid date in column", "expiration_date", expiration.isna() & df["expiration_date"].notna(), row_offset)
+
+    # 4. Assemble typed records
+    columns = {
+        "execution_time": list(utc_times.dt.to_pydatetime()),
+        "side": df["side"].astype(str).tolist(),
+        "quantity": quantity.tolist(),
+        "position_effect": df["position_effect"].astype(str).tolist(),
+        "symbol": df["symbol"].astype(str).tolist(),
+        "expiration_date": _with_none(expiration.dt.date, expiration.notna()),
+        "strike_price": strike.tolist(),
+        "price": price.tolist(),
+        "net_price": net_price.tolist(),
+    }
+    for col in OPTIONAL_TEXT_COLUMNS:
+        columns[col] = _with_none(df[col].astype(str), df[col].notna())
+
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def order_identity(
+    execution_time: datetime.datetime, symbol: str, side: str, quantity: int, position_effect: str,
+    price: float, expiration_date, strike_price, option_type,
+) -> str:
+    """Canonical text of the fields that identify an execution, the same for a freshly
+    normalized row and for the row read back from the database."""
+    return (
+        f"{(as_utc(execution_time) - _EPOCH) // _MICROSECOND}|{symbol}|{side}|{int(quantity)}|{position_effect}|"
+        f"{float(price)!r}|{expiration_date.isoformat() if expiration_date else ''}|"
+        f"{'' if strike_price is None else repr(float(strike_price))}|{option_type or ''}"
+    )
+
+
+def fingerprint(identity: str, ordinal: int) -> str:
+    return hashlib.blake2b(f"{identity}#{ordinal}".encode(), digest_size=16).hexdigest()
+
+
+def add_fingerprints(records: list[dict], occurrences: Counter):
+    """Sets records[i]["fingerprint"]. Identical fills in one file are told apart by their
+    ordinal, so `occurrences` must be shared by all the chunks of that file."""
+    for record in records:
+        identity = order_identity(
+            record["execution_time"], record["symbol"], record["side"], record["quantity"],
+            record["position_effect"], record["price"], record["expiration_date"],
+            record["strike_price"], record["option_type"],
+        )
+        occurrences[identity] += 1
+        record["fingerprint"] = fingerprint(identity, occurrences[identity])
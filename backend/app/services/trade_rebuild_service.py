@@ -0,0 +1,149 @@
+# backend/app/services/trade_rebuild_service.py
+#
+# Recomputes a user's trades from their complete order history, e.g. after a matching
+# fix. Orders are streamed in execution order and split by contract; the contracts are
+# replayed independently, in a process pool for large histories, and the result
+# replaces the user's trades in one transaction.
+
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import delete, exists, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from ..core.processes import spawn_context
+from ..crud import daily_pnl as daily_pnl_crud
+from ..crud import user as user_crud
+from ..models import order as order_model
+from ..models import trade as trade_model
+from ..models.trade_order import trade_orders
+from .matching_engine import Position, contract_key, replay_partitions
+
+logger = logging.getLogger(__name__)
+
+REBUILD_FETCH_SIZE = int(os.getenv("REBUILD_FETCH_SIZE", "10000"))
+# Below this many orders the replay runs inline; starting workers costs more than it saves
+REBUILD_PARALLEL_MIN_ORDERS = int(os.getenv("REBUILD_PARALLEL_MIN_ORDERS", "200000"))
+REBUILD_WORKERS = int(os.getenv("REBUILD_WORKERS", str(os.cpu_count() or 1)))
+
+
+def rebuild_trades(db: Session, user_id: int) -> dict:
+    """Replaces the user's order-backed trades with a fresh replay and commits. Trades
+    entered by hand, without orders, are kept; notes move to the trade that starts with
+    the same order."""
+    started = time.perf_counter()
+
+    try:
+        # Writing first takes SQLite's database write lock (and the user's row lock on
+        # PostgreSQL) before any order is read. Imports bump the same row before matching,
+        # so an import either commits before the orders below are read or waits for the
+        # rebuild and links its orders to the rebuilt trades.
+        user_crud.bump_data_version(db, user_id)
+
+        # 1. Stream the orders in execution order, partitioned by contract
+        Order = order_model.Order
+        partitions: dict[str, list[tuple]] = defaultdict(list)
+        rows = db.execute(
+            select(
+                Order.id, Order.execution_time, Order.symbol, Order.side, Order.quantity, Order.position_effect, Order.price,
+                Order.expiration_date, Order.strike_price, Order.option_type, Order.spread,
+            )
+            .where(Order.user_id == user_id)
+            .order_by(Order.execution_time, Order.id)
+            .execution_options(yield_per=REBUILD_FETCH_SIZE)
+        )
+        for row in rows:
+            key = contract_key(row.symbol, row.expiration_date, row.strike_price, row.option_type, row.spread)
+            partitions[key].append((*row[:7], key))
+        order_count = sum(len(orders) for orders in partitions.values())
+
+        # 2. Replay every contract from scratch
+        positions = _replay(list(partitions.values()), order_count)
+        positions.sort(key=lambda p: (p.entry_timestamp, p.order_ids[0]))
+
+        # 3. Swap the trades in the same transaction
+        notes = _notes_by_first_order(db, user_id)
+        _delete_order_trades(db, user_id)
+        # Ids are reserved up front so trades and links go in as plain executemany batches;
+        # INSERT .. RETURNING in parameter order is row-at-a-time on SQLite
+        trade_ids = _reserve_trade_ids(db, len(positions))
+        if positions:
+            db.execute(insert(trade_model.Trade.__table__), [
+                {**p.trade_values(), "id": trade_id, "user_id": user_id, "notes": notes.get(min(p.order_ids))}
+                for p, trade_id in zip(positions, trade_ids)
+            ])
+            db.execute(insert(trade_orders), [
+                {"trade_id": trade_id, "order_id": order_id}
+                for position, trade_id in zip(positions, trade_ids) for order_id in position.order_ids
+            ])
+        daily_pnl_crud.rebuild(db, user_id=user_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    logger.info("Rebuilt %d trades from %d orders for user %s in %.3fs", len(positions), order_count, user_id, elapsed)
+    return {
+        "orders": order_count,
+        "trades": len(positions),
+        "open_trades": sum(p.status == 'OPEN' for p in positions),
+        "seconds": round(elapsed, 3),
+    }
+
+
+def _replay(partitions: list[list[tuple]], order_count: int) -> list[Position]:
+    workers = min(REBUILD_WORKERS, len(partitions))
+    if order_count < REBUILD_PARALLEL_MIN_ORDERS or workers <= 1:
+        return replay_partitions(partitions)
+
+    # Largest contracts first, each to the currently lightest batch, so batches finish together
+    batches = [[] for _ in range(workers * 4)]
+    sizes = [0] * len(batches)
+    for partition in sorted(partitions, key=len, reverse=True):
+        lightest = sizes.index(min(sizes))
+        batches[lightest].append(partition)
+        sizes[lightest] += len(partition)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=spawn_context()) as executor:
+        results = executor.map(replay_partitions, [batch for batch in batches if batch])
+        return [position for positions in results for position in positions]
+
+
+def _reserve_trade_ids(db: Session, count: int) -> list[int]:
+    if count == 0:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return db.scalars(
+            text("SELECT nextval(pg_get_serial_sequence('trades', 'id')) FROM generate_series(1, :count)"),
+            {"count": count},
+        ).all()
+    # SQLite: the version bump in rebuild_trades holds the write lock, so nobody else can take these
+    first = db.scalar(select(func.coalesce(func.max(trade_model.Trade.id), 0))) + 1
+    return list(range(first, first + count))
+
+
+def _notes_by_first_order(db: Session, user_id: int) -> dict[int, str]:
+    Trade = trade_model.Trade
+    rows = db.execute(
+        select(func.min(trade_orders.c.order_id), Trade.notes)
+        .join(trade_orders, trade_orders.c.trade_id == Trade.id)
+        .where(Trade.user_id == user_id, Trade.notes.is_not(None))
+        .group_by(Trade.id, Trade.notes)
+    )
+    return {order_id: notes for order_id, notes in rows}
+
+
+def _delete_order_trades(db: Session, user_id: int):
+    Trade = trade_model.Trade
+    # Materialize the ids first: the trades are found through the links being deleted
+    trade_ids = db.scalars(
+        select(Trade.id).where(Trade.user_id == user_id, exists().where(trade_orders.c.trade_id == Trade.id))
+    ).all()
+    for start in range(0, len(trade_ids), REBUILD_FETCH_SIZE):
+        batch = trade_ids[start:start + REBUILD_FETCH_SIZE]
+        db.execute(delete(trade_orders).where(trade_orders.c.trade_id.in_(batch)))
+        db.execute(delete(Trade).where(Trade.id.in_(batch)))
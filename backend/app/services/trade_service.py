@@ -1,131 +1,55 @@
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+from ..crud import daily_pnl as daily_pnl_crud
 from ..crud import trade as trade_crud
-from ..models import order as order_model
 from ..models import trade as trade_model
+from ..models.trade_order import trade_orders
+from .matching_engine import OrderRecord, Position, match_orders
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 logger.disabled = True
 
-def process_new_orders(db: Session, user_id: int, new_orders: list[order_model.Order]):
+def process_new_orders(db: Session, user_id: int, new_orders: list[OrderRecord]):
     logger.info("--- Starting in-memory processing of new orders ---")
 
-    # 1. Get unique symbols and fetch all relevant open trades in one go
-    symbols = list(set(o.symbol for o in new_orders))
-    open_trades_from_db = trade_crud.get_open_trades_by_symbols(db, user_id=user_id, symbols=symbols)
-    
-    # 2. Create an in-memory map for active trades being processed, initially populated with current open trades from DB if any.
-    trades_map = {trade.symbol: trade for trade in open_trades_from_db}
-    closed_trades = []
-    
-    # 3. Sort orders chronologically
-    new_orders.sort(key=lambda o: o.execution_time)
+    # 1. Get unique contracts and fetch all relevant open trades in one go
+    contract_keys = list(set(o.contract_key for o in new_orders))
+    open_positions = [
+        Position(**row._mapping)
+        for row in trade_crud.get_open_positions_by_contracts(db, user_id=user_id, contract_keys=contract_keys)
+    ]
 
-    # 4. Process each order in memory
-    for order in new_orders:
-        logger.info(f"Processing order in-memory: {order.id}, {order.symbol}, {order.side}, {order.quantity}")
-        trade = trades_map.get(order.symbol)
+    # 2. Match the orders in memory, without touching ORM objects
+    positions = match_orders(new_orders, open_positions)
 
-        if order.position_effect == 'TO OPEN':
-            direction = 'LONG' if order.side == 'BUY' else 'SHORT'
-            if trade:
-                if trade.status == 'CLOSED':
-                    # This should not happen if the logic is correct
-                    logger.error(f"Found a closed trade in the trades_map for symbol {order.symbol}")
-                    # I will create a new trade anyway
-                    new_trade = _create_new_trade(db, order, user_id)
-                    trades_map[order.symbol] = new_trade
-                elif trade.direction == direction:
-                    # Add to existing open trade
-                    _update_trade_with_order(trade, order)
-                else:
-                    logger.error(
-                        f"Data anomaly: Received a 'TO OPEN' order (ID: {order.id}) for {order.symbol} "
-                        f"with direction {direction}, but an open trade (ID: {trade.id}) "
-                        f"already exists in the opposite direction ({trade.direction}). "
-                        f"This order will be ignored."
-                    )
-            else:
-                # No trade for this symbol, create a new one
-                new_trade = _create_new_trade(db, order, user_id)
-                trades_map[order.symbol] = new_trade
-        
-        elif order.position_effect == 'TO CLOSE':
-            if trade:
-                _update_trade_with_order(trade, order)
-                if _close_trade_if_fully_exited(trade):
-                    closed_trades.append(trade)
-                    del trades_map[order.symbol]
-            else:
-                logger.warning(f"Orphan closing order found (no open trade): {order.id} for {order.symbol}")
-
-    # 5. Batch save all changes to the database
+    # 3. Write new trades, updated trades and trade_orders links in bulk
     logger.info("--- Committing all changes to the database ---")
+    _save_positions(db, user_id, positions)
     db.commit()
     logger.info("--- Database commit successful ---")
 
-def _create_new_trade(db: Session, order: order_model.Order, user_id: int) -> trade_model.Trade:
-    logger.info(f"Creating new trade object in-memory for {order.symbol}")
-    direction = 'LONG' if order.side == 'BUY' else 'SHORT'
-    
-    # Create a new ORM model instance directly
-    new_trade = trade_model.Trade(
-        symbol=order.symbol,
-        user_id=user_id,
-        status='OPEN',
-        direction=direction,
-        volume=order.quantity,
-        avg_entry_price=order.price,
-        entry_timestamp=order.execution_time,
-        executions_count=1
-    )
-    db.add(new_trade)
-    new_trade.orders.append(order)
-    return new_trade
-
-def _update_trade_with_order(trade: trade_model.Trade, order: order_model.Order):
-    logger.info(f"Updating trade in-memory for {trade.symbol} with order {order.id}")
-    
-    trade.orders.append(order)
-    trade.executions_count += 1
+def _save_positions(db: Session, user_id: int, positions: list[Position]):
+    new_positions = [p for p in positions if p.trade_id is None]
+    updated = [{**p.trade_values(), "id": p.trade_id} for p in positions if p.trade_id is not None]
 
-    # Recalculate trade properties
-    total_entry_qty = 0
-    total_entry_value = 0
-    for o in trade.orders:
-        if o.position_effect == 'TO OPEN':
-            total_entry_qty += abs(o.quantity)
-            total_entry_value += abs(o.quantity * o.price)
+    if new_positions:
+        trade_ids = db.execute(
+            insert(trade_model.Trade).returning(trade_model.Trade.id, sort_by_parameter_order=True),
+            [{**p.trade_values(), "user_id": user_id} for p in new_positions],
+        ).scalars().all()
+        for position, trade_id in zip(new_positions, trade_ids):
+            position.trade_id = trade_id
 
-    if total_entry_qty > 0:
-        trade.avg_entry_price = round(total_entry_value / total_entry_qty, 5)
-        trade.volume = total_entry_qty
+    if updated:
+        db.execute(update(trade_model.Trade), updated)
 
-def _close_trade_if_fully_exited(trade: trade_model.Trade) -> bool:
-    logger.info(f"Checking to close trade in-memory for {trade.symbol}")
-    total_entry_qty = abs(sum(o.quantity for o in trade.orders if o.position_effect == 'TO OPEN'))
-    total_exit_qty = abs(sum(o.quantity for o in trade.orders if o.position_effect == 'TO CLOSE'))
+    links = [{"trade_id": p.trade_id, "order_id": order_id} for p in positions for order_id in p.order_ids]
+    if links:
+        db.execute(insert(trade_orders), links)
 
-    logger.info(f"Trade {trade.symbol} quantities: entry={total_entry_qty}, exit={total_exit_qty}")
-
-    if total_entry_qty == total_exit_qty and total_entry_qty > 0:
-        logger.info(f"Closing trade in-memory for {trade.symbol}")
-        trade.status = 'CLOSED'
-        
-        # Find the latest execution time among closing orders for the exit timestamp
-        exit_orders = [o for o in trade.orders if o.position_effect == 'TO CLOSE']
-        trade.exit_timestamp = max(o.execution_time for o in exit_orders)
-
-        total_exit_value = abs(sum(o.quantity * o.price for o in exit_orders))
-        if total_exit_qty > 0:
-            trade.avg_exit_price = total_exit_value / total_exit_qty
-        
-        if trade.direction == 'LONG':
-            pnl = round(((trade.avg_exit_price - trade.avg_entry_price) * trade.volume), 5)
-        else: # SHORT
-            pnl = round(((trade.avg_entry_price - trade.avg_exit_price) * trade.volume), 5)
-        
-        trade.pnl = pnl
-        return True
-    return False
\ No newline at end of file
+    # Closed positions were closed by this run, so each counts once toward its exit day
+    daily_pnl_crud.add_closed_trades(
+        db, user_id, [(p.exit_timestamp, p.pnl) for p in positions if p.status == 'CLOSED']
+    )
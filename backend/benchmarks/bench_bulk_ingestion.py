@@ -0,0 +1,76 @@
+"""Compare per-row order creation against the bulk ingestion path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk_ingestion [rows]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import order as order_crud
+from app.database.database import Base
+from app.models import User
+from app.schemas import order as order_schema
+
+
+def make_rows(count: int) -> list[dict]:
+    start = datetime.datetime(2025, 1, 2, 14, 30, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            "execution_time": start + datetime.timedelta(seconds=i),
+            "spread": "STOCK",
+            "side": "BUY" if i % 2 == 0 else "SELL",
+            "quantity": 100,
+            "position_effect": "TO OPEN" if i % 2 == 0 else "TO CLOSE",
+            "symbol": f"SYM{i % 50}",
+            "expiration_date": None,
+            "strike_price": None,
+            "option_type": "STOCK",
+            "price": 10.0 + (i % 100) / 100,
+            "net_price": 10.0 + (i % 100) / 100,
+            "order_type": "LMT",
+        }
+        for i in range(count)
+    ]
+
+
+def run(count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        rows = make_rows(count)
+
+        with Session() as db:
+            user = User(email="bench@example.com", password_hash="x")
+            db.add(user)
+            db.commit()
+            user_id = user.id
+
+        with Session() as db:
+            started = time.perf_counter()
+            for row in rows:
+                order_crud.create_order(db, order_schema.OrderCreate(**row), user_id=user_id)
+            per_row = time.perf_counter() - started
+
+        with Session() as db:
+            started = time.perf_counter()
+            order_crud.create_orders_bulk(db, rows, user_id=user_id)
+            db.commit()
+            bulk = time.perf_counter() - started
+
+        engine.dispose()
+
+    print(f"rows:      {count}")
+    print(f"per-row:   {per_row:8.3f}s  {count / per_row:10.0f} rows/sec")
+    print(f"bulk:      {bulk:8.3f}s  {count / bulk:10.0f} rows/sec")
+    print(f"speedup:   {per_row / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,70 @@
+"""Peak RSS of parsing + normalizing a broker CSV: whole-file read vs chunked streaming.
+
+Each measurement runs in a fresh interpreter so ru_maxrss reflects only that run.
+
+Usage (from backend/):
+    python -m benchmarks.bench_csv_memory [rows ...]
+"""
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+from starlette.datastructures import Headers, UploadFile
+
+from app.services import file_processing_service, order_normalization_service
+
+HEADER = "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+
+
+def write_csv(path: str, rows: int):
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for i in range(rows):
+            side, effect = ("BUY", "TO OPEN") if i % 2 == 0 else ("SELL", "TO CLOSE")
+            f.write(
+                f"2025-01-02 {9 + i % 7}:{i % 60:02d}:{i % 59:02d},STOCK,{side},100,{effect},"
+                f"SYM{i % 500},,,STOCK,{10 + i % 100 / 100},{10 + i % 100 / 100},LMT\n"
+            )
+
+
+def child(mode: str, path: str):
+    rows = 0
+    with open(path, "rb") as f:
+        if mode == "full":
+            # The previous implementation: bytes + decoded str + one DataFrame for the whole file
+            df = pd.read_csv(io.StringIO(f.read().decode("utf-8")))
+            rows = len(order_normalization_service.normalize_orders(df, "UTC"))
+        else:
+            upload = UploadFile(file=f, filename="orders.csv", headers=Headers({"content-type": "text/csv"}))
+            for frame in file_processing_service.iter_file_chunks(upload):
+                rows += len(order_normalization_service.normalize_orders(frame, "UTC", row_offset=rows))
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{rows} {peak_mb:.1f}")
+
+
+def main(sizes: list[int]):
+    print(f"{'rows':>10} {'file MB':>8} {'full MB':>9} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"orders_{rows}.csv")
+            write_csv(path, rows)
+            peaks = {}
+            for mode in ("full", "stream"):
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_csv_memory", "--child", mode, path],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                peaks[mode] = float(out[1])
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"{rows:>10} {size_mb:>8.1f} {peaks['full']:>9.1f} {peaks['stream']:>10.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main([int(a) for a in sys.argv[1:]] or [50_000, 200_000, 800_000])
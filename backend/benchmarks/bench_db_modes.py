@@ -0,0 +1,118 @@
+"""Throughput and tail latency of GET /trades under concurrency, sync versus async sessions.
+
+Sync mode serves each request on the threadpool (40 threads by default), async mode
+awaits the database on the event loop. The sessions are swapped in through dependency
+overrides, exactly as DB_MODE selects them. Runs on SQLite files by default; set
+BENCH_DATABASE_URL and BENCH_ASYNC_DATABASE_URL to point both modes at PostgreSQL.
+
+Usage (from backend/):
+    python -m benchmarks.bench_db_modes [requests] [concurrency ...]
+"""
+import asyncio
+import datetime
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import security
+from app.database.database import Base, get_db
+from app.main import app
+from app.models import Order, Trade, User
+
+
+def populate(Session) -> str:
+    with Session() as db:
+        user = User(email="bench@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        start = datetime.datetime(2025, 1, 2, 14, 30)
+        for i in range(500):
+            opened = start + datetime.timedelta(minutes=i)
+            orders = [
+                Order(user_id=user.id, execution_time=opened, side="BUY", quantity=100, position_effect="TO OPEN",
+                      symbol=f"SYM{i % 50}", price=10.0, net_price=10.0),
+                Order(user_id=user.id, execution_time=opened, side="SELL", quantity=100, position_effect="TO CLOSE",
+                      symbol=f"SYM{i % 50}", price=11.0, net_price=11.0),
+            ]
+            db.add(Trade(user_id=user.id, symbol=f"SYM{i % 50}", status="CLOSED", direction="LONG", volume=100,
+                         avg_entry_price=10.0, avg_exit_price=11.0, pnl=100.0, executions_count=2,
+                         entry_timestamp=opened, exit_timestamp=opened, orders=orders))
+        db.commit()
+        return security.create_access_token({"sub": user.email, "uid": user.id})
+
+
+async def load(requests: int, concurrency: int, token: str) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get("/api/v1/trades?limit=50", headers=headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200
+
+        await one()  # warm up
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    return requests / elapsed, statistics.quantiles(latencies, n=20)[-1]
+
+
+async def run(requests: int, levels: list[int]):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        sync_url = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{path}"
+        async_url = os.getenv("BENCH_ASYNC_DATABASE_URL") or f"sqlite+aiosqlite:///{path}"
+
+        engine = create_engine(sync_url, pool_size=40, max_overflow=0)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        token = populate(Session)
+        async_engine = create_async_engine(async_url, pool_size=40, max_overflow=0)
+        AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        def sync_db():
+            with Session() as db:
+                yield db
+
+        async def async_db():
+            async with AsyncSession() as db:
+                yield db
+
+        print(f"GET /api/v1/trades?limit=50, {requests} requests, {sync_url.split(':')[0]}")
+        for label, override in (("sync", sync_db), ("async", async_db)):
+            app.dependency_overrides[get_db] = override
+            for concurrency in levels:
+                security.user_cache.clear()
+                throughput, p95 = await load(requests, concurrency, token)
+                print(f"{label:5s} concurrency {concurrency:4d}  {throughput:8.1f} req/s  p95 {p95:8.1f} ms")
+        app.dependency_overrides.clear()
+
+        await async_engine.dispose()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+        [int(level) for level in sys.argv[2:]] or [10, 50, 200],
+    ))
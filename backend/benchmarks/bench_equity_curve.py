@@ -0,0 +1,83 @@
+"""Latency of the /stats/equity-curve computation: the closed-trade query, the cumulative
+drawdown pass and LTTB downsampling to the requested number of points.
+
+Usage (from backend/):
+    python -m benchmarks.bench_equity_curve [trades]
+"""
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.models import User
+from app.schemas.stats import StatsFilters
+from app.services import equity_curve_service
+
+
+def populate(db, count: int) -> int:
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+
+    rng = random.Random(42)
+    start = datetime.datetime(2015, 1, 2, 14, 30)
+    rows = []
+    for i in range(count):
+        opened = start + datetime.timedelta(minutes=10 * i)
+        rows.append({
+            "user_id": user.id, "symbol": f"SYM{rng.randrange(200)}", "entry_timestamp": opened,
+            "exit_timestamp": opened + datetime.timedelta(minutes=5), "pnl": round(rng.gauss(1, 100), 2),
+        })
+    db.execute(text(
+        "INSERT INTO trades (user_id, symbol, status, direction, volume, avg_entry_price, entry_timestamp, "
+        "exit_timestamp, pnl, executions_count, entry_quantity, entry_notional, exit_quantity, exit_notional) "
+        "VALUES (:user_id, :symbol, 'CLOSED', 'LONG', 100, 10.0, :entry_timestamp, :exit_timestamp, :pnl, "
+        "2, 100, 1000, 100, 1000)"
+    ), rows)
+    db.commit()
+    return user.id
+
+
+def time_it(fn, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def run(count: int, repeat: int = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            user_id = populate(db, count)
+            for points in (500, 2000):
+                timings = time_it(lambda: equity_curve_service.get_equity_curve(
+                    db, user_id=user_id, filters=StatsFilters(), points=points, max_periods=10,
+                ), repeat)
+                print(f"get_equity_curve {count} trades -> {points:5d} points  "
+                      f"median {statistics.median(timings):8.2f} ms  max {max(timings):8.2f} ms")
+
+        # The NumPy part alone, without the query
+        equity = np.cumsum(np.random.default_rng(42).normal(1, 100, count))
+        x = np.arange(count, dtype=np.float64)
+        timings = time_it(lambda: equity - np.maximum.accumulate(np.maximum(equity, 0.0)), repeat)
+        print(f"drawdown pass          {statistics.median(timings):8.2f} ms")
+        timings = time_it(lambda: equity_curve_service.lttb(x, equity, 500), repeat)
+        print(f"lttb to 500 points     {statistics.median(timings):8.2f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
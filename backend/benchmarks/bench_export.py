@@ -0,0 +1,67 @@
+"""Memory and time of exporting a user's orders: streamed CSV/Parquet versus the old
+all-rows path (get_orders_by_user serialized to JSON in one piece).
+
+The exports are consumed chunk by chunk the way StreamingResponse sends them, and
+resident memory is sampled after every chunk. The all-rows path runs last because peak
+RSS never goes back down.
+
+Usage (from backend/):
+    python -m benchmarks.bench_export [orders]
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import serialization
+from app.crud import order as order_crud
+from app.database.database import Base
+from app.schemas import order as order_schema
+from app.services import export_service
+from benchmarks.bench_trade_rebuild import populate
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def report(label: str, started: float, baseline: float, peak: float, size: int):
+    print(f"{label:18s} {time.perf_counter() - started:7.2f}s  {size / 2**20:8.1f} MB out  "
+          f"RSS +{peak - baseline:7.1f} MB")
+
+
+def run(count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            user_id = populate(db, count, symbols=500)
+        print(f"{count} orders")
+
+        for file_format in ("csv", "parquet"):
+            baseline = peak = rss_mb()
+            started, size = time.perf_counter(), 0
+            for chunk in export_service.stream(Session, user_id=user_id, kind="orders", file_format=file_format):
+                size += len(chunk)
+                peak = max(peak, rss_mb())
+            report(f"stream {file_format}", started, baseline, peak, size)
+
+        baseline = rss_mb()
+        started = time.perf_counter()
+        with Session() as db:
+            orders = order_crud.get_orders_by_user(db, user_id=user_id)
+            body = serialization.dump_json(List[order_schema.Order], orders)
+            peak = rss_mb()
+        report("all rows as JSON", started, baseline, peak, len(body))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
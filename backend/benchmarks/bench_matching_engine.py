@@ -0,0 +1,49 @@
+"""Throughput of the in-memory matching engine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_matching_engine [orders] [symbols]
+"""
+import datetime
+import random
+import sys
+import time
+
+from app.services.matching_engine import OrderRecord, match_orders
+
+
+def make_orders(count: int, symbols: int) -> list[OrderRecord]:
+    # Round trips of 2-6 executions per symbol: scale in, then scale out
+    rng = random.Random(42)
+    start = datetime.datetime(2020, 1, 2, 14, 30, tzinfo=datetime.timezone.utc)
+    orders = []
+    order_id = 0
+    while len(orders) < count:
+        symbol = f"SYM{rng.randrange(symbols)}"
+        side, close_side = ("BUY", "SELL") if rng.random() < 0.5 else ("SELL", "BUY")
+        legs = [(side, rng.randint(1, 5) * 100, "TO OPEN") for _ in range(rng.randint(1, 3))]
+        legs.append((close_side, sum(quantity for _, quantity, _ in legs), "TO CLOSE"))
+        for leg_side, quantity, effect in legs:
+            order_id += 1
+            orders.append(OrderRecord(
+                order_id, start + datetime.timedelta(seconds=order_id), symbol,
+                leg_side, quantity, effect, 10 + rng.random(),
+            ))
+    return orders[:count]
+
+
+def run(count: int, symbols: int):
+    orders = make_orders(count, symbols)
+    started = time.perf_counter()
+    positions = match_orders(orders, [])
+    elapsed = time.perf_counter() - started
+    closed = sum(1 for p in positions if p.status == "CLOSED")
+    print(f"orders:    {count}")
+    print(f"trades:    {len(positions)} ({closed} closed)")
+    print(f"elapsed:   {elapsed:.3f}s  {count / elapsed:,.0f} orders/sec")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000,
+    )
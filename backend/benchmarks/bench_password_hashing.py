@@ -0,0 +1,68 @@
+"""Login throughput under a burst, inline bcrypt versus the password process pool.
+
+A 40-thread pool (the size of the request threadpool) verifies passwords as fast as it
+can while a probe thread measures how long a trivial pure-Python task takes to get
+scheduled, i.e. how much the burst starves the other sync routes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_password_hashing [logins] [rounds]
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import passwords
+
+
+def probe(stop: threading.Event, latencies: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        sum(range(10_000))
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.005)
+
+
+def burst(logins: int, password_hash: str) -> tuple[float, float]:
+    stop = threading.Event()
+    latencies: list[float] = []
+    prober = threading.Thread(target=probe, args=(stop, latencies))
+    prober.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        results = list(pool.map(lambda _: passwords.verify_password("benchpassword", password_hash), range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    prober.join()
+    assert all(valid for valid, _ in results)
+    return logins / elapsed, statistics.median(latencies)
+
+
+def run(logins: int, rounds: int):
+    password_hash = passwords.pwd_context.handler("bcrypt").using(rounds=rounds).hash("benchpassword")
+    passwords.pwd_context.update(bcrypt__rounds=rounds, bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds)
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)  # read by the spawned workers
+    passwords._pending = threading.BoundedSemaphore(logins)
+    cores = os.cpu_count() or 1
+    print(f"logins: {logins}  bcrypt rounds: {rounds}  cores: {cores}")
+
+    for workers in [0] + sorted({1, 2, 4, cores} & set(range(1, cores + 1))):
+        passwords.shutdown()
+        passwords.PASSWORD_HASH_WORKERS = workers
+        if workers:
+            burst(workers, password_hash)  # start the worker processes
+        throughput, probe_ms = burst(logins, password_hash)
+        label = "inline" if workers == 0 else f"{workers} worker(s)"
+        print(f"{label:12s} {throughput:8.1f} logins/sec   probe median {probe_ms:6.2f} ms")
+    passwords.shutdown()
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 12,
+    )
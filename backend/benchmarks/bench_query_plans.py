@@ -0,0 +1,150 @@
+"""Query plans and latency of the hot read paths before and after migrations 0002 and 0007.
+
+Builds a synthetic SQLite database (default 1M orders across 50 users), drops the
+composite indexes and the trade_orders key to reproduce the old schema, times each
+query, then applies the migrations and times them again.
+
+Usage (from backend/):
+    python -m benchmarks.bench_query_plans [orders] [users]
+"""
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.database.database import Base
+from app.database.migrations import _0002_query_indexes, _0007_trade_contract_key
+from app import models  # noqa: F401  (registers the tables)
+
+USER_ID = 7
+
+QUERIES = {
+    "open trades by contract (matching)": (
+        "SELECT id FROM trades WHERE user_id = :user AND status = 'OPEN' AND contract_key IN ('SYM1', 'SYM2', 'SYM3')"
+    ),
+    "trades page (newest first)": (
+        "SELECT id FROM trades WHERE user_id = :user ORDER BY entry_timestamp DESC, id DESC LIMIT 101"
+    ),
+    "trades page filtered by symbol": (
+        "SELECT id FROM trades WHERE user_id = :user AND symbol = 'SYM5' ORDER BY entry_timestamp DESC LIMIT 101"
+    ),
+    "orders page (newest first)": (
+        "SELECT id FROM orders WHERE user_id = :user ORDER BY execution_time DESC, id DESC LIMIT 101"
+    ),
+    "orders of a trade page (selectin)": (
+        "SELECT o.id FROM orders o JOIN trade_orders t ON t.order_id = o.id "
+        "WHERE t.trade_id IN (SELECT id FROM trades WHERE user_id = :user "
+        "ORDER BY entry_timestamp DESC, id DESC LIMIT 100)"
+    ),
+    "trades of an order": (
+        "SELECT trade_id FROM trade_orders WHERE order_id = :order"
+    ),
+}
+
+
+def populate(conn, order_count: int, users: int):
+    rng = random.Random(42)
+    start = datetime.datetime(2020, 1, 2, 14, 30)
+    conn.execute(
+        text("INSERT INTO users (id, email, password_hash) VALUES (:id, :email, 'x')"),
+        [{"id": user, "email": f"user{user}@example.com"} for user in range(1, users + 1)],
+    )
+
+    # Each trade is an open and a close order; about 2% of trades are still open
+    orders, trades, links = [], [], []
+    order_id = trade_id = 0
+    while order_id < order_count:
+        trade_id += 1
+        user = rng.randint(1, users)
+        symbol = f"SYM{rng.randrange(200)}"
+        opened = start + datetime.timedelta(minutes=trade_id)
+        is_open = rng.random() < 0.02
+        trades.append({
+            "id": trade_id, "user_id": user, "symbol": symbol, "contract_key": symbol,
+            "status": "OPEN" if is_open else "CLOSED", "direction": "LONG",
+            "volume": 100, "avg_entry_price": 10.0, "entry_timestamp": opened,
+        })
+        for effect, offset in (("TO OPEN", 0), ("TO CLOSE", 30)):
+            if effect == "TO CLOSE" and is_open:
+                break
+            order_id += 1
+            orders.append({
+                "id": order_id, "user_id": user, "execution_time": opened + datetime.timedelta(minutes=offset),
+                "side": "BUY", "quantity": 100, "position_effect": effect, "symbol": symbol,
+                "price": 10.0, "net_price": 10.0,
+            })
+            links.append({"trade_id": trade_id, "order_id": order_id})
+
+    conn.execute(text(
+        "INSERT INTO orders (id, user_id, execution_time, side, quantity, position_effect, symbol, price, net_price) "
+        "VALUES (:id, :user_id, :execution_time, :side, :quantity, :position_effect, :symbol, :price, :net_price)"
+    ), orders)
+    conn.execute(text(
+        "INSERT INTO trades (id, user_id, symbol, contract_key, status, direction, volume, avg_entry_price, "
+        "entry_timestamp, executions_count, entry_quantity, entry_notional, exit_quantity, exit_notional) "
+        "VALUES (:id, :user_id, :symbol, :contract_key, :status, :direction, :volume, :avg_entry_price, :entry_timestamp, "
+        "2, 100, 1000, 100, 1000)"
+    ), trades)
+    conn.execute(text("INSERT INTO trade_orders (trade_id, order_id) VALUES (:trade_id, :order_id)"), links)
+    return len(orders), len(trades)
+
+
+def downgrade(conn):
+    for index in ("ix_orders_user_id_execution_time", "ix_trades_user_id_entry_timestamp",
+                  "ix_trades_user_id_symbol_entry_timestamp", "ix_trades_open_user_id_contract_key",
+                  "ix_trade_orders_order_id"):
+        conn.execute(text(f"DROP INDEX {index}"))
+    conn.execute(text("CREATE INDEX ix_trades_symbol ON trades (symbol)"))
+    conn.execute(text("CREATE TABLE trade_orders_old (trade_id INTEGER, order_id INTEGER)"))
+    conn.execute(text("INSERT INTO trade_orders_old SELECT trade_id, order_id FROM trade_orders"))
+    conn.execute(text("DROP TABLE trade_orders"))
+    conn.execute(text("ALTER TABLE trade_orders_old RENAME TO trade_orders"))
+
+
+def measure(conn, label: str, repeat: int = 5) -> dict[str, float]:
+    print(f"\n== {label} ==")
+    params = {"user": USER_ID, "order": 12345}
+    timings = {}
+    for name, sql in QUERIES.items():
+        plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(text(sql), params).all()
+        timings[name] = (time.perf_counter() - started) / repeat * 1000
+        print(f"{name:36s} {timings[name]:9.2f} ms   {' | '.join(plan)}")
+    return timings
+
+
+def run(order_count: int, users: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            started = time.perf_counter()
+            orders, trades = populate(conn, order_count, users)
+            print(f"orders: {orders}  trades: {trades}  users: {users}  "
+                  f"(populated in {time.perf_counter() - started:.1f}s)")
+            downgrade(conn)
+            conn.execute(text("ANALYZE"))
+
+        with engine.begin() as conn:
+            before = measure(conn, "before (single-column indexes, heap trade_orders)")
+            _0002_query_indexes(conn)
+            _0007_trade_contract_key(conn)
+            conn.execute(text("ANALYZE"))
+            after = measure(conn, "after migrations 0002 and 0007")
+
+        print("\nspeedup:")
+        for name in QUERIES:
+            print(f"{name:36s} {before[name] / after[name]:8.1f}x")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
@@ -0,0 +1,82 @@
+"""Re-importing an overlapping broker export: a file whose rows are mostly already stored
+against a file holding only the new rows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_reimport [rows] [new_fraction]
+"""
+import datetime
+import io
+import os
+import sys
+import tempfile
+import time
+
+from fastapi import UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers
+
+from app.database.database import Base
+from app.models import User
+from app.services import import_service
+
+HEADER = "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+
+
+def make_lines(count: int) -> list[str]:
+    start = datetime.datetime(2025, 1, 2, 9, 30)
+    lines = []
+    for i in range(count // 2):
+        opened = start + datetime.timedelta(minutes=i)
+        symbol, price = f"SYM{i % 50}", 10.0 + (i % 100) / 100
+        lines.append(f"{opened:%Y-%m-%d %H:%M:%S},STOCK,BUY,100,TO OPEN,{symbol},,,STOCK,{price},{price},LMT\n")
+        closed = opened + datetime.timedelta(seconds=30)
+        lines.append(f"{closed:%Y-%m-%d %H:%M:%S},STOCK,SELL,-100,TO CLOSE,{symbol},,,STOCK,{price + 0.1},{price + 0.1},LMT\n")
+    return lines
+
+
+def upload(lines: list[str]) -> UploadFile:
+    data = (HEADER + "".join(lines)).encode()
+    return UploadFile(file=io.BytesIO(data), filename="orders.csv", headers=Headers({"content-type": "text/csv"}))
+
+
+def timed_import(Session, user_id: int, lines: list[str]) -> tuple[float, int]:
+    with Session() as db:
+        started = time.perf_counter()
+        _, duplicates = import_service.import_orders(db, upload(lines), "America/New_York", user_id)
+        return time.perf_counter() - started, duplicates
+
+
+def run(count: int, new_fraction: float):
+    lines = make_lines(count)
+    stored = lines[: int(len(lines) * (1 - new_fraction)) // 2 * 2]
+    new = lines[len(stored):]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            users = [User(email=f"bench{i}@example.com", password_hash="x") for i in range(3)]
+            db.add_all(users)
+            db.commit()
+            user_ids = [user.id for user in users]
+
+        for user_id in user_ids[:2]:
+            timed_import(Session, user_id, stored)
+        full, duplicates = timed_import(Session, user_ids[0], lines)
+        only_new, _ = timed_import(Session, user_ids[1], new)
+        # What every re-upload cost before duplicates were detected: all rows stored and matched
+        everything, _ = timed_import(Session, user_ids[2], lines)
+        engine.dispose()
+
+    print(f"full export:   {len(lines):7d} rows, {duplicates:7d} already stored  {full:7.3f}s")
+    print(f"new rows only: {len(new):7d} rows                          {only_new:7.3f}s")
+    print(f"nothing stored:{len(lines):7d} rows                          {everything:7.3f}s")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.05,
+    )
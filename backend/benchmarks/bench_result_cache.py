@@ -0,0 +1,69 @@
+"""Latency of repeated dashboard reads with the result cache cold (cleared before every
+request) and warm.
+
+Usage (from backend/):
+    python -m benchmarks.bench_result_cache [trades] [requests]
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import result_cache, security
+from app.database.database import Base, get_db
+from app.main import app
+from benchmarks.bench_equity_curve import populate
+
+ENDPOINTS = (
+    "/api/v1/stats/summary",
+    "/api/v1/stats/equity-curve",
+    "/api/v1/calendar?month=2015-03",
+    "/api/v1/trades?limit=100",
+)
+
+
+def run(count: int, requests: int):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            user_id = populate(db, count)
+        token = security.create_access_token({"sub": "bench@example.com", "uid": user_id})
+
+        def session():
+            with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = session
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {token}"}
+        for path in ENDPOINTS:
+            timings = {}
+            for label, clear in (("cold", True), ("warm", False)):
+                samples = []
+                for _ in range(requests):
+                    if clear:
+                        result_cache.cache.clear()
+                    started = time.perf_counter()
+                    assert client.get(path, headers=headers).status_code == 200
+                    samples.append((time.perf_counter() - started) * 1000)
+                timings[label] = statistics.median(samples)
+            print(f"{path:34s} cold {timings['cold']:9.2f} ms  warm {timings['warm']:7.2f} ms")
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
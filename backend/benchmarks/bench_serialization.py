@@ -0,0 +1,97 @@
+"""Serialization time and bytes on the wire for a GET /trades payload: trades loaded
+as ORM objects, each with its orders nested.
+
+Compares FastAPI's default response_model path (validate, jsonable_encoder, json.dumps),
+pydantic's validate + dump_json (the result cache before the fast path), and the
+attribute-plan + orjson fast path, then the size of the body per content coding.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [trades] [orders_per_trade] [repeat]
+"""
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import List
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core import compression, serialization
+from app.models.order import Order
+from app.models.trade import Trade
+from app.schemas import trade as trade_schema
+
+RESPONSE_MODEL = List[trade_schema.Trade]
+
+
+def make_trades(count: int, orders_per_trade: int) -> list[Trade]:
+    rng = random.Random(42)
+    start = datetime.datetime(2015, 1, 2, 14, 30)
+    trades = []
+    for i in range(count):
+        opened = start + datetime.timedelta(minutes=10 * i)
+        symbol = f"SYM{rng.randrange(200)}"
+        orders = [
+            Order(
+                id=i * orders_per_trade + j, user_id=1, execution_time=opened + datetime.timedelta(seconds=j),
+                spread="SINGLE", side="BUY" if j < orders_per_trade // 2 else "SELL", quantity=100,
+                position_effect="TO OPEN" if j < orders_per_trade // 2 else "TO CLOSE", symbol=symbol,
+                expiration_date=None, strike_price=None, option_type="STOCK", price=round(rng.uniform(5, 500), 2),
+                net_price=round(rng.uniform(5, 500), 2), order_type="LMT", notes=None, created_at=opened, updated_at=opened,
+            )
+            for j in range(orders_per_trade)
+        ]
+        trades.append(Trade(
+            id=i + 1, user_id=1, symbol=symbol, contract_key=symbol, status="CLOSED", direction="LONG", volume=100,
+            avg_entry_price=orders[0].price, avg_exit_price=orders[-1].price, entry_timestamp=opened,
+            exit_timestamp=opened + datetime.timedelta(minutes=5), pnl=round(rng.gauss(1, 100), 2),
+            executions_count=orders_per_trade, notes=None, orders=orders,
+        ))
+    return trades
+
+
+def time_it(fn, repeat: int) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), body
+
+
+def run(count: int, orders_per_trade: int, repeat: int):
+    trades = make_trades(count, orders_per_trade)
+    adapter = TypeAdapter(RESPONSE_MODEL)
+
+    def fastapi_default():
+        validated = adapter.validate_python(trades, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated), separators=(",", ":")).encode()
+
+    print(f"{count} trades x {orders_per_trade} orders")
+    paths = (
+        ("fastapi default", fastapi_default),
+        ("pydantic dump_json", lambda: adapter.dump_json(adapter.validate_python(trades, from_attributes=True))),
+        ("plan + orjson", lambda: serialization.dump_json(RESPONSE_MODEL, trades)),
+    )
+    for label, fn in paths:
+        elapsed, body = time_it(fn, repeat)
+        print(f"{label:20s} {elapsed:9.1f} ms")
+
+    print(f"{'identity':20s} {len(body):>12,} bytes")
+    for coding in compression.supported_encodings():
+        elapsed, encoded = time_it(lambda: compression.compress(body, coding), repeat)
+        print(f"{coding:20s} {len(encoded):>12,} bytes  {len(encoded) / len(body):6.1%}  {elapsed:7.1f} ms")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 5,
+    )
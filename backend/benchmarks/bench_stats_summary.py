@@ -0,0 +1,72 @@
+"""Latency of the /stats/summary aggregation over a user's trades.
+
+Usage (from backend/):
+    python -m benchmarks.bench_stats_summary [trades]
+"""
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import stats as stats_crud
+from app.database.database import Base
+from app.models import User
+from app.schemas.stats import StatsFilters
+
+
+def populate(db, count: int) -> int:
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+
+    rng = random.Random(42)
+    start = datetime.datetime(2020, 1, 2, 14, 30)
+    rows = []
+    for i in range(count):
+        opened = start + datetime.timedelta(minutes=i)
+        is_open = rng.random() < 0.02
+        rows.append({
+            "user_id": user.id, "symbol": f"SYM{rng.randrange(200)}",
+            "status": "OPEN" if is_open else "CLOSED", "direction": rng.choice(("LONG", "SHORT")),
+            "entry_timestamp": opened, "pnl": None if is_open else round(rng.gauss(5, 100), 2),
+        })
+    db.execute(text(
+        "INSERT INTO trades (user_id, symbol, status, direction, volume, avg_entry_price, entry_timestamp, pnl, "
+        "executions_count, entry_quantity, entry_notional, exit_quantity, exit_notional) "
+        "VALUES (:user_id, :symbol, :status, :direction, 100, 10.0, :entry_timestamp, :pnl, 2, 100, 1000, 100, 1000)"
+    ), rows)
+    db.execute(text("ANALYZE"))  # as autovacuum would on PostgreSQL
+    db.commit()
+    return user.id
+
+
+def run(count: int, repeat: int = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            user_id = populate(db, count)
+            for label, filters in (
+                ("all trades", StatsFilters()),
+                ("one symbol", StatsFilters(symbol="SYM7")),
+                ("one week", StatsFilters(start=datetime.datetime(2020, 1, 6), end=datetime.datetime(2020, 1, 13))),
+            ):
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    summary = stats_crud.get_summary(db, user_id=user_id, filters=filters)
+                    timings.append((time.perf_counter() - started) * 1000)
+                print(f"{label:12s} {summary['trades']:7d} closed trades  "
+                      f"median {statistics.median(timings):7.2f} ms  max {max(timings):7.2f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,64 @@
+"""Full trade rebuild from a user's order history: inline replay against the process pool.
+
+Usage (from backend/):
+    python -m benchmarks.bench_trade_rebuild [orders] [symbols]
+"""
+import datetime
+import os
+import sys
+import tempfile
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.models import Order, User
+from app.services import trade_rebuild_service
+
+
+def populate(db, count: int, symbols: int) -> int:
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+
+    start = datetime.datetime(2015, 1, 2, 14, 30)
+    batch = []
+    for i in range(count // 2):
+        opened = start + datetime.timedelta(seconds=30 * i)
+        symbol, price = f"SYM{i % symbols}", 10.0 + (i % 100) / 100
+        for offset, side, quantity, effect, fill in ((0, "BUY", 100, "TO OPEN", price), (15, "SELL", -100, "TO CLOSE", price + 0.05)):
+            batch.append({
+                "user_id": user.id, "execution_time": opened + datetime.timedelta(seconds=offset), "side": side,
+                "quantity": quantity, "position_effect": effect, "symbol": symbol, "price": fill, "net_price": fill,
+            })
+        if len(batch) >= 50_000:
+            db.execute(insert(Order), batch)
+            batch.clear()
+    if batch:
+        db.execute(insert(Order), batch)
+    db.commit()
+    return user.id
+
+
+def run(count: int, symbols: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            user_id = populate(db, count, symbols)
+
+        print(f"{count} orders over {symbols} symbols, {trade_rebuild_service.REBUILD_WORKERS} worker(s)")
+        for label, threshold in (("inline", count + 1), ("process pool", 0)):
+            trade_rebuild_service.REBUILD_PARALLEL_MIN_ORDERS = threshold
+            with Session() as db:
+                result = trade_rebuild_service.rebuild_trades(db, user_id=user_id)
+            print(f"{label:13s} {result['trades']:8d} trades  {result['seconds']:7.2f}s")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    )
@@ -0,0 +1,78 @@
+"""Per-request latency of authenticated endpoints with and without the user cache.
+
+Runs GET /users/me and GET /trades in-process against a SQLite database. The saving per
+request is one users lookup; against a networked PostgreSQL add one round trip on top.
+
+Usage (from backend/):
+    python -m benchmarks.bench_user_cache [requests]
+"""
+import datetime
+import logging
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core import security
+from app.database.database import Base, get_db
+from app.main import app
+from app.models import Trade, User
+
+
+def run(requests: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            user = User(email="bench@example.com", password_hash="x")
+            db.add(user)
+            db.flush()
+            db.add_all(
+                Trade(user_id=user.id, symbol=f"SYM{i}", status="OPEN", direction="LONG",
+                      volume=100, avg_entry_price=10.0, executions_count=1,
+                      entry_timestamp=datetime.datetime(2025, 1, 2, 14, 30 + i))
+                for i in range(20)
+            )
+            db.commit()
+            token = security.create_access_token({"sub": user.email, "uid": user.id})
+
+        def override_get_db():
+            with Session() as db:
+                yield db
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        app.dependency_overrides[get_db] = override_get_db
+        headers = {"Authorization": f"Bearer {token}"}
+        cache_size = security.user_cache.maxsize
+
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        with TestClient(app) as client:
+            for label, maxsize in (("no cache", 0), ("cached", cache_size)):
+                security.user_cache.clear()
+                security.user_cache.maxsize = maxsize
+                print(f"== {label} ==")
+                for path in ("/api/v1/users/me", "/api/v1/trades"):
+                    client.get(path, headers=headers)  # warm up
+                    statements.clear()
+                    started = time.perf_counter()
+                    for _ in range(requests):
+                        assert client.get(path, headers=headers).status_code == 200
+                    elapsed = time.perf_counter() - started
+                    print(f"GET {path:18s} {elapsed / requests * 1000:7.3f} ms/request  "
+                          f"{len(statements) / requests:.1f} statements/request")
+
+        security.user_cache.maxsize = cache_size
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from starlette import status
+
+from app.crud import daily_pnl as daily_pnl_crud
+from app.models import DailyPnl
+from tests.api.v1.test_user import get_user_token
+from tests.api.v1.test_orders import wait_for_import
+
+CSV_DATA = (
+    "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+    "2025-10-01 15:00:00,STOCK,BUY,10,TO OPEN,AAPL,,,STOCK,10.0,10.0,LMT\n"
+    "2025-10-01 23:30:00,STOCK,SELL,-10,TO CLOSE,AAPL,,,STOCK,11.0,11.0,LMT\n"
+    "2025-10-02 10:00:00,STOCK,BUY,5,TO OPEN,MSFT,,,STOCK,20.0,20.0,LMT\n"
+    "2025-10-02 10:30:00,STOCK,SELL,-5,TO CLOSE,MSFT,,,STOCK,19.0,19.0,LMT\n"
+    "2025-11-03 10:00:00,STOCK,SELL,-3,TO OPEN,TSLA,,,STOCK,10.0,10.0,LMT\n"
+    "2025-11-03 10:30:00,STOCK,BUY,3,TO CLOSE,TSLA,,,STOCK,8.0,8.0,LMT\n"
+)
+
+def days(response) -> dict:
+    return {day["date"]: (day["pnl"], day["trades"], day["wins"], day["losses"]) for day in response.json()["days"]}
+
+def test_calendar_is_maintained_on_import_edit_and_delete(client: TestClient, db_session: Session):
+    # 1. Create a user, get a token and upload orders timestamped in New York time
+    token, user_id = get_user_token(client, "calendar@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        "/api/v1/orders/upload", headers=headers,
+        files={"file": ("orders.csv", CSV_DATA, "text/csv")}, data={"timezone": "America/New_York"},
+    )
+    wait_for_import(client, token, response)
+
+    # 2. AAPL closes at 23:30 New York time (the next day in UTC) and stays on Oct 1
+    october = client.get("/api/v1/calendar", params={"month": "2025-10"}, headers=headers)
+    assert october.status_code == status.HTTP_200_OK
+    assert days(october) == {"2025-10-01": (10.0, 1, 1, 0), "2025-10-02": (-5.0, 1, 0, 1)}
+    assert (october.json()["pnl"], october.json()["trades"]) == (5.0, 2)
+    assert days(client.get("/api/v1/calendar", params={"month": "2025-11"}, headers=headers)) == {
+        "2025-11-03": (6.0, 1, 1, 0)
+    }
+
+    # 3. Editing a trade's P&L moves its contribution; deleting a trade removes it
+    trades = {t["symbol"]: t["id"] for t in client.get("/api/v1/trades", headers=headers).json()}
+    response = client.put(f"/api/v1/trades/{trades['MSFT']}", json={"pnl": 7.0}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    response = client.delete(f"/api/v1/trades/{trades['AAPL']}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    october = client.get("/api/v1/calendar", params={"month": "2025-10"}, headers=headers)
+    assert days(october) == {"2025-10-02": (7.0, 1, 1, 0)}
+
+    # 4. A rebuild from the trades table agrees with the incremental rows
+    def rows():
+        return [
+            (r.date, r.pnl, r.trades, r.wins, r.losses)
+            for r in db_session.query(DailyPnl).filter(DailyPnl.user_id == user_id).order_by(DailyPnl.date)
+        ]
+
+    incremental = rows()
+    daily_pnl_crud.rebuild(db_session, user_id=user_id)
+    db_session.commit()
+    assert rows() == incremental
+
+def test_calendar_rejects_invalid_month(client: TestClient):
+    token, _ = get_user_token(client, "calendar_month@example.com", "testpassword")
+
+    response = client.get("/api/v1/calendar", params={"month": "2025-13"}, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
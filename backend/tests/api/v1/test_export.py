@@ -0,0 +1,45 @@
+import csv
+import io
+
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+from starlette import status
+
+from app.services import export_service
+from tests.api.v1.test_user import get_user_token
+from tests.api.v1.test_stats import CSV_DATA
+from tests.api.v1.test_trades import upload_orders
+
+def test_export_csv(client: TestClient, monkeypatch):
+    # 1. Create a user, get a token and upload orders; small fetches so the export spans batches
+    monkeypatch.setattr(export_service, "EXPORT_FETCH_SIZE", 3)
+    token, _ = get_user_token(client, "export_csv@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    for kind in ("trades", "orders"):
+        # 2. Every row, oldest first, with the same columns as the JSON API
+        response = client.get(f"/api/v1/export/{kind}", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-disposition"] == f'attachment; filename="{kind}.csv"'
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        listed = client.get(f"/api/v1/{kind}", params={"view": "summary", "limit": 1000}, headers=headers).json()
+        assert [int(row["id"]) for row in rows] == [item["id"] for item in reversed(listed)]
+        assert list(rows[0]) == [key for key in listed[0] if key != "orders"]
+
+def test_export_parquet(client: TestClient):
+    token, _ = get_user_token(client, "export_parquet@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    response = client.get("/api/v1/export/trades", params={"format": "parquet"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    table = pq.read_table(io.BytesIO(response.content))
+    trades = client.get("/api/v1/trades", params={"limit": 1000}, headers=headers).json()
+    assert table.num_rows == len(trades)
+    assert sorted(table.column("pnl").to_pylist(), key=lambda x: (x is None, x)) == sorted(
+        (t["pnl"] for t in trades), key=lambda x: (x is None, x)
+    )
+    assert str(table.schema.field("entry_timestamp").type) == "timestamp[us, tz=UTC]"
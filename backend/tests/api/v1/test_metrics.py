@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+from starlette import status
+
+from app.database import database
+from tests.api.v1.test_user import get_user_token
+
+
+def test_metrics_require_authentication(client: TestClient):
+    response = client.get("/api/v1/metrics")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_metrics_report_pools_and_connection_budget(client: TestClient):
+    token, _ = get_user_token(client, "metrics@example.com", "testpassword")
+    response = client.get("/api/v1/metrics", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["pools"]["sync"]["size"] == database.DB_POOL_SIZE
+    assert {"in_use", "overflow", "checkouts", "timeouts", "wait_seconds_max", "wait_histogram"} <= data["pools"]["sync"].keys()
+    assert data["connections_per_worker"] == database.DB_POOL_SIZE + database.DB_MAX_OVERFLOW
+    assert data["max_connections_required"] == data["connections_per_worker"] * data["web_concurrency"]
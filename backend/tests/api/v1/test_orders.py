@@ -1,10 +1,34 @@
+import datetime
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from openpyxl import Workbook
+from sqlalchemy.orm import Session, sessionmaker
 from starlette import status
 
+from app.crud import import_job as import_job_crud
 from app.crud import order as order_crud
+from app.services import import_service
 from tests.api.v1.test_user import get_user_token
 
+# Helper function to wait for a queued import to finish
+def wait_for_import(client: TestClient, token: str, response, timeout: float = 10.0) -> dict:
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    status_url = response.json()["status_url"]
+    deadline = time.monotonic() + timeout
+    while True:
+        job_response = client.get(status_url, headers={"Authorization": f"Bearer {token}"})
+        assert job_response.status_code == status.HTTP_200_OK
+        job = job_response.json()
+        if job["stage"] in ("COMPLETED", "FAILED"):
+            return job
+        assert time.monotonic() < deadline, f"Import did not finish: {job}"
+        time.sleep(0.05)
 
 def test_upload_orders_csv_success(client: TestClient, db_session: Session):
     # 1. Create a user and get a token
@@ -27,9 +51,11 @@ def test_upload_orders_csv_success(client: TestClient, db_session: Session):
         data={"timezone": "UTC"},
     )
 
-    # 4. Assert the response
-    assert response.status_code == status.HTTP_201_CREATED
-    assert response.json() == {"message": "2 orders have been successfully uploaded and processed."}
+    # 4. Assert the import job
+    job = wait_for_import(client, token, response)
+    assert job["stage"] == "COMPLETED"
+    assert job["rows_processed"] == 2
+    assert job["error"] is None
 
     # 5. Verify orders in the database
     user_orders = order_crud.get_orders_by_user(db=db_session, user_id=user_id)
@@ -101,3 +127,146 @@ def test_upload_orders_csv_unauthenticated(client: TestClient):
     # 4. Assert the response
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json() == {"detail": "Not authenticated"}
+
+
+def test_upload_orders_csv_invalid_value_reports_row(client: TestClient, db_session: Session):
+    # 1. Create a user and get a token
+    email = "invalid_value@example.com"
+    password = "testpassword"
+    token, user_id = get_user_token(client, email, password)
+
+    # 2. Prepare CSV data with a non-numeric price on the second data row
+    csv_data = (
+        "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+        "2025-09-30 10:00:00,STOCK,BUY,1,TO OPEN,AAPL,,,STOCK,10.5,10.5,LMT\n"
+        "2025-09-30 10:05:00,STOCK,SELL,1,TO CLOSE,AAPL,,,STOCK,abc,11.0,LMT\n"
+    )
+
+    # 3. Upload the CSV file
+    response = client.post(
+        "/api/v1/orders/upload",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("orders.csv", csv_data, "text/csv")},
+        data={"timezone": "UTC"},
+    )
+
+    # 4. Assert the job error points at the row and column, and nothing was stored
+    job = wait_for_import(client, token, response)
+    assert job["stage"] == "FAILED"
+    assert job["error"] == "Invalid number in column: 'price' (rows: 2)"
+    assert order_crud.get_orders_by_user(db=db_session, user_id=user_id) == []
+
+
+def test_upload_orders_xlsx_reads_only_trade_history_section(client: TestClient, db_session: Session):
+    # 1. Create a user and get a token
+    email = "xlsx_section@example.com"
+    password = "testpassword"
+    token, user_id = get_user_token(client, email, password)
+
+    # 2. Build a statement with other sections around the trade history
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Account Statement for 12345 (Individual)"])
+    sheet.append([])
+    sheet.append(["Cash Balance"])
+    sheet.append([None, "DATE", "TIME", "TYPE"])
+    sheet.append([])
+    sheet.append(["Account Trade History"])
+    sheet.append([None, "Exec Time", "Spread", "Side", "Qty", "Pos Effect", "Symbol", "Exp", "Strike", "Type", "Price", "Net Price", "Order Type"])
+    sheet.append([None, datetime.datetime(2025, 8, 4, 10, 0), "STOCK", "BUY", 10, "TO OPEN", "SNGX", None, None, "STOCK", 4.09, 4.09, "LMT"])
+    sheet.append([None, datetime.datetime(2025, 8, 4, 10, 5), "STOCK", "SELL", -10, "TO CLOSE", "SNGX", None, None, "STOCK", 4.41, 4.41, "LMT"])
+    sheet.append([])
+    sheet.append(["Equities"])
+    sheet.append(["Symbol", "Description", "Qty", "Trade Price"])
+    sheet.append(["ADBE", "ADOBE INC", 850, 339.3194])
+    contents = io.BytesIO()
+    workbook.save(contents)
+
+    # 3. Upload the XLSX file
+    response = client.post(
+        "/api/v1/orders/upload",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("statement.xlsx", contents.getvalue(), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")},
+        data={"timezone": "UTC"},
+    )
+
+    # 4. Only the trade history rows are imported
+    job = wait_for_import(client, token, response)
+    assert job["stage"] == "COMPLETED"
+    assert job["rows_processed"] == 2
+    user_orders = order_crud.get_orders_by_user(db=db_session, user_id=user_id)
+    assert [order.symbol for order in user_orders] == ["SNGX", "SNGX"]
+
+
+def test_reupload_skips_orders_already_stored(client: TestClient, db_session: Session):
+    # 1. Create a user and get a token
+    token, user_id = get_user_token(client, "reupload@example.com", "testpassword")
+    header = "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+    # Two identical fills are separate executions and are both kept
+    week_one = (
+        "2025-10-01 10:00:00,STOCK,BUY,5,TO OPEN,AAPL,,,STOCK,10.0,10.0,LMT\n"
+        "2025-10-01 10:00:00,STOCK,BUY,5,TO OPEN,AAPL,,,STOCK,10.0,10.0,LMT\n"
+        "2025-10-02 10:00:00,STOCK,SELL,-10,TO CLOSE,AAPL,,,STOCK,11.0,11.0,LMT\n"
+    )
+    week_two = "2025-10-03 10:00:00,SINGLE,BUY,1,TO OPEN,SPY,17 OCT 25,500,CALL,1.25,1.25,LMT\n"
+
+    def upload(csv_data):
+        response = client.post(
+            "/api/v1/orders/upload",
+            headers={"Authorization": f"Bearer {token}"},
+            files={"file": ("orders.csv", header + csv_data, "text/csv")},
+            data={"timezone": "America/New_York"},
+        )
+        return wait_for_import(client, token, response)
+
+    # 2. Upload the first export, then an overlapping one, then the same one again
+    first = upload(week_one)
+    overlapping = upload(week_one + week_two)
+    again = upload(week_one + week_two)
+
+    # 3. Only new executions are stored and matched
+    assert (first["rows_processed"], first["duplicates_skipped"]) == (3, 0)
+    assert (overlapping["rows_processed"], overlapping["duplicates_skipped"]) == (4, 3)
+    assert (again["rows_processed"], again["duplicates_skipped"]) == (4, 4)
+    assert len(order_crud.get_orders_by_user(db=db_session, user_id=user_id)) == 4
+
+    trades = client.get("/api/v1/trades", headers={"Authorization": f"Bearer {token}"}).json()
+    assert sorted((t["symbol"], t["status"], t["pnl"]) for t in trades) == [("AAPL", "CLOSED", 10.0), ("SPY", "OPEN", None)]
+
+def test_get_import_not_found(client: TestClient):
+    # 1. Create a user and get a token
+    email = "import_not_found@example.com"
+    password = "testpassword"
+    token, _ = get_user_token(client, email, password)
+
+    # 2. Request a non-existent import job
+    response = client.get("/api/v1/imports/missing", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+def test_interrupted_imports_fail_at_startup(client: TestClient, db_session: Session, tmp_path, monkeypatch):
+    # 1. Jobs left unfinished by a process that has exited, by one still running and by another host
+    monkeypatch.setattr(import_service, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    token, user_id = get_user_token(client, "import_interrupted@example.com", "testpassword")
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    host = socket.gethostname()
+    session_factory = sessionmaker(bind=db_session.get_bind(), autoflush=False)
+
+    interrupted_id, running_id, remote_id = (
+        import_job_crud.create_import_job(db_session, user_id, filename, worker=worker).id
+        for filename, worker in (
+            ("a.csv", f"{host}:{exited.pid}"), ("b.csv", f"{host}:{os.getppid()}"), ("c.csv", f"other-host:{exited.pid}"),
+        )
+    )
+    upload = tmp_path / f"import-{interrupted_id}.csv"
+    upload.write_text("Exec Time\n")
+
+    # 2. Only the job of the exited process fails, and its upload is removed
+    assert import_service.fail_interrupted_jobs(session_factory) == 1
+    assert not upload.exists()
+
+    def job(job_id):
+        return client.get(f"/api/v1/imports/{job_id}", headers={"Authorization": f"Bearer {token}"}).json()
+
+    assert (job(interrupted_id)["stage"], job(interrupted_id)["error"]) == ("FAILED", import_service.INTERRUPTED_ERROR)
+    assert job(running_id)["stage"] == job(remote_id)["stage"] == "QUEUED"
@@ -0,0 +1,161 @@
+from fastapi.testclient import TestClient
+from starlette import status
+
+from app.core.cache import ByteLRUCache
+from tests.api.v1.test_user import get_user_token
+from tests.api.v1.test_stats import CSV_DATA
+from tests.api.v1.test_trades import upload_orders
+
+NEW_TRADE = {
+    "symbol": "AMD", "status": "CLOSED", "direction": "LONG", "volume": 1, "avg_entry_price": 10.0,
+    "avg_exit_price": 12.0, "entry_timestamp": "2025-10-05T14:00:00", "exit_timestamp": "2025-10-05T15:00:00",
+    "pnl": 2.0, "executions_count": 2,
+}
+
+def test_writes_invalidate_cached_reads(client: TestClient):
+    # 1. Create a user, get a token and upload the trades
+    token, _ = get_user_token(client, "result_cache@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    def net_pnl():
+        response = client.get("/api/v1/stats/summary", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()["net_pnl"]
+
+    def cache_stats():
+        return client.get("/api/v1/metrics", headers=headers).json()["result_cache"]
+
+    # 2. The second read is served from the cache
+    assert net_pnl() == 11.0
+    before = cache_stats()
+    assert net_pnl() == 11.0
+    after = cache_stats()
+    assert (after["hits"], after["misses"]) == (before["hits"] + 1, before["misses"])
+
+    # 3. Every write is visible on the next read
+    trade = client.post("/api/v1/trades", json=NEW_TRADE, headers=headers).json()
+    assert net_pnl() == 13.0
+    client.put(f"/api/v1/trades/{trade['id']}", json={"pnl": 4.0}, headers=headers)
+    assert net_pnl() == 15.0
+    client.delete(f"/api/v1/trades/{trade['id']}", headers=headers)
+    assert net_pnl() == 11.0
+    upload_orders(client, token, CSV_DATA.replace("2025-10-0", "2025-11-0"))
+    assert net_pnl() == 22.0
+
+def test_cached_list_keeps_pagination_headers(client: TestClient):
+    token, _ = get_user_token(client, "result_cache_pages@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    first = client.get("/api/v1/trades", params={"limit": 2, "total": "exact"}, headers=headers)
+    second = client.get("/api/v1/trades", params={"limit": 2, "total": "exact"}, headers=headers)
+
+    assert second.json() == first.json()
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert second.headers["X-Total-Count"] == "4"
+
+def test_users_do_not_share_cached_results(client: TestClient):
+    token, _ = get_user_token(client, "result_cache_a@example.com", "testpassword")
+    other, _ = get_user_token(client, "result_cache_b@example.com", "testpassword")
+    upload_orders(client, token, CSV_DATA)
+
+    mine = client.get("/api/v1/stats/summary", headers={"Authorization": f"Bearer {token}"}).json()
+    theirs = client.get("/api/v1/stats/summary", headers={"Authorization": f"Bearer {other}"}).json()
+
+    assert (mine["trades"], theirs["trades"]) == (3, 0)
+
+def test_byte_lru_cache_evicts_least_recently_used():
+    cache = ByteLRUCache(max_bytes=100)
+    cache.set("a", b"x" * 10, {})
+    cache.set("b", b"x" * 10, {})
+    cache.get("a")
+
+    for key in "cdefghijk":
+        cache.set(key, b"x" * 10, {})
+
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.size_bytes == 100
+    cache.set("big", b"x" * 11, {})  # above a tenth of the budget
+    assert cache.get("big") is None
+
+def test_unchanged_reads_are_answered_with_304(client: TestClient, count_queries):
+    # 1. Create a user, get a token and upload the trades
+    token, _ = get_user_token(client, "result_cache_etag@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    first = client.get("/api/v1/trades", headers=headers)
+    tag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    trade_id = first.json()[0]["id"]
+
+    # 2. A matching If-None-Match costs only the data version query
+    with count_queries() as statements:
+        response = client.get("/api/v1/trades", headers={**headers, "If-None-Match": tag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == tag
+    assert len(statements) == 1
+
+    # 3. Other queries and detail endpoints have their own tags
+    other = client.get("/api/v1/trades", params={"limit": 1}, headers={**headers, "If-None-Match": tag})
+    assert other.status_code == status.HTTP_200_OK
+    detail = client.get(f"/api/v1/trades/{trade_id}", headers=headers)
+    assert detail.headers["ETag"] not in (tag, other.headers["ETag"])
+    response = client.get(f"/api/v1/trades/{trade_id}", headers={**headers, "If-None-Match": f'"x", W/{detail.headers["ETag"]}'})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # 4. A missing trade is never "not modified"
+    for path in ("/api/v1/trades/99999", "/api/v1/trades/99999/orders"):
+        response = client.get(path, headers={**headers, "If-None-Match": "*"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # 5. A write changes every tag
+    client.put(f"/api/v1/trades/{trade_id}", json={"notes": "revisited"}, headers=headers)
+    response = client.get("/api/v1/trades", headers={**headers, "If-None-Match": tag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != tag
+    response = client.get(f"/api/v1/trades/{trade_id}", headers={**headers, "If-None-Match": detail.headers["ETag"]})
+    assert response.json()["notes"] == "revisited"
+
+def test_orders_listing_supports_conditional_get(client: TestClient):
+    token, _ = get_user_token(client, "result_cache_etag_orders@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    tag = client.get("/api/v1/orders", headers=headers).headers["ETag"]
+    response = client.get("/api/v1/orders", headers={**headers, "If-None-Match": tag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    upload_orders(client, token, CSV_DATA.replace("2025-10-0", "2025-11-0"))
+    response = client.get("/api/v1/orders", headers={**headers, "If-None-Match": tag})
+    assert response.status_code == status.HTTP_200_OK
+
+def test_large_responses_are_compressed(client: TestClient):
+    token, _ = get_user_token(client, "result_cache_gzip@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    # 1. Compressed when accepted and above the threshold; the ETag names the coding
+    identity = client.get("/api/v1/orders", headers={**headers, "Accept-Encoding": "identity"})
+    compressed = client.get("/api/v1/orders", headers={**headers, "Accept-Encoding": "gzip;q=0.5, br;q=0"})
+    assert "Content-Encoding" not in identity.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert int(compressed.headers["Content-Length"]) < int(identity.headers["Content-Length"])
+    assert compressed.json() == identity.json()
+    assert compressed.headers["ETag"] == identity.headers["ETag"][:-1] + '-gzip"'
+
+    # 2. Either tag revalidates the other coding
+    response = client.get("/api/v1/orders", headers={**headers, "Accept-Encoding": "identity", "If-None-Match": compressed.headers["ETag"]})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # 3. Brotli is preferred when the client accepts both
+    response = client.get("/api/v1/orders", headers={**headers, "Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.headers["ETag"] == identity.headers["ETag"][:-1] + '-br"'
+
+    # 4. Small bodies are sent as they are
+    response = client.get("/api/v1/stats/summary", params={"symbol": "NONE"}, headers={**headers, "Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
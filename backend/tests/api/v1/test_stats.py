@@ -0,0 +1,101 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette import status
+
+from tests.api.v1.test_user import get_user_token
+from tests.api.v1.test_trades import upload_orders
+
+CSV_DATA = (
+    "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+    "2025-10-01 10:00:00,STOCK,BUY,10,TO OPEN,AAPL,,,STOCK,10.0,10.0,LMT\n"
+    "2025-10-01 10:30:00,STOCK,SELL,-10,TO CLOSE,AAPL,,,STOCK,11.0,11.0,LMT\n"
+    "2025-10-02 10:00:00,STOCK,BUY,5,TO OPEN,MSFT,,,STOCK,20.0,20.0,LMT\n"
+    "2025-10-02 10:30:00,STOCK,SELL,-5,TO CLOSE,MSFT,,,STOCK,19.0,19.0,LMT\n"
+    "2025-10-03 10:00:00,STOCK,SELL,-3,TO OPEN,TSLA,,,STOCK,10.0,10.0,LMT\n"
+    "2025-10-03 10:30:00,STOCK,BUY,3,TO CLOSE,TSLA,,,STOCK,8.0,8.0,LMT\n"
+    "2025-10-04 10:00:00,STOCK,BUY,1,TO OPEN,NVDA,,,STOCK,100.0,100.0,LMT\n"
+)
+
+def test_stats_summary(client: TestClient):
+    # 1. Create a user, get a token and upload three closed trades and one open trade
+    token, _ = get_user_token(client, "stats@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    # 2. Get the summary
+    response = client.get("/api/v1/stats/summary", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    # 3. AAPL +10, MSFT -5 (long) and TSLA +6 (short) are closed; NVDA is open
+    assert (data["trades"], data["wins"], data["losses"], data["breakeven"]) == (3, 2, 1, 0)
+    assert data["win_rate"] == pytest.approx(2 / 3)
+    assert (data["gross_profit"], data["gross_loss"], data["net_pnl"]) == (16.0, 5.0, 11.0)
+    assert data["profit_factor"] == pytest.approx(3.2)
+    assert data["expectancy"] == pytest.approx(11 / 3)
+    assert (data["average_win"], data["average_loss"]) == (8.0, -5.0)
+    assert (data["largest_win"], data["largest_loss"]) == (10.0, -5.0)
+    assert data["by_status"] == {"OPEN": 1, "CLOSED": 3}
+
+    long, short = data["by_direction"]["LONG"], data["by_direction"]["SHORT"]
+    assert (long["trades"], long["net_pnl"], long["profit_factor"]) == (2, 5.0, 2.0)
+    assert (short["trades"], short["net_pnl"], short["profit_factor"], short["largest_loss"]) == (1, 6.0, None, None)
+
+def test_stats_summary_filters(client: TestClient):
+    # 1. Create a user, get a token and upload the trades
+    token, _ = get_user_token(client, "stats_filters@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    # 2. Filter by symbol, then by entry date
+    by_symbol = client.get("/api/v1/stats/summary", params={"symbol": "MSFT"}, headers=headers).json()
+    by_date = client.get(
+        "/api/v1/stats/summary", params={"start": "2025-10-02T00:00:00", "end": "2025-10-04T00:00:00"}, headers=headers
+    ).json()
+
+    assert (by_symbol["trades"], by_symbol["net_pnl"], by_symbol["win_rate"]) == (1, -5.0, 0.0)
+    assert by_symbol["by_status"] == {"OPEN": 0, "CLOSED": 1}
+    assert (by_date["trades"], by_date["net_pnl"]) == (2, 1.0)
+
+def test_stats_summary_without_trades(client: TestClient):
+    token, _ = get_user_token(client, "stats_empty@example.com", "testpassword")
+
+    response = client.get("/api/v1/stats/summary", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["trades"], data["net_pnl"], data["win_rate"], data["profit_factor"]) == (0, 0.0, None, None)
+
+def test_equity_curve(client: TestClient):
+    # 1. Create a user, get a token and upload the trades
+    token, _ = get_user_token(client, "equity@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(client, token, CSV_DATA)
+
+    # 2. Get the curve
+    response = client.get("/api/v1/stats/equity-curve", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    # 3. Equity goes 10, 5, 11: one period underwater after MSFT, recovered by TSLA
+    assert (data["trades"], data["net_pnl"], data["max_drawdown"], data["current_drawdown"]) == (3, 11.0, -5.0, 0.0)
+    assert [p["equity"] for p in data["points"]] == [10.0, 5.0, 11.0]
+    assert [p["drawdown"] for p in data["points"]] == [0.0, -5.0, 0.0]
+    assert len(data["underwater_periods"]) == 1
+    period = data["underwater_periods"][0]
+    assert (period["depth"], period["trades"]) == (-5.0, 1)
+    assert period["duration_seconds"] == 24 * 60 * 60
+    assert data["longest_drawdown_seconds"] == 24 * 60 * 60
+
+    # 4. A single winning trade never goes underwater
+    downsampled = client.get("/api/v1/stats/equity-curve", params={"points": 3, "symbol": "AAPL"}, headers=headers).json()
+    assert [p["equity"] for p in downsampled["points"]] == [10.0]
+    assert downsampled["underwater_periods"] == []
+
+def test_equity_curve_without_trades(client: TestClient):
+    token, _ = get_user_token(client, "equity_empty@example.com", "testpassword")
+
+    response = client.get("/api/v1/stats/equity-curve", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["points"] == []
@@ -4,14 +4,16 @@ from starlette import status
 
 from app.crud import trade as trade_crud
 from tests.api.v1.test_user import get_user_token
+from tests.api.v1.test_orders import wait_for_import
 
 def upload_orders(client: TestClient, token: str, csv_data: str):
-    return client.post(
+    response = client.post(
         "/api/v1/orders/upload",
         headers={"Authorization": f"Bearer {token}"},
         files={"file": ("orders.csv", csv_data, "text/csv")},
         data={"timezone": "UTC"},
     )
+    return wait_for_import(client, token, response)
 
 def test_get_trades_unauthenticated(client: TestClient):
     response = client.get("/api/v1/trades")
@@ -30,8 +32,8 @@ def test_get_trades_success(client: TestClient, db_session: Session):
         "2025-10-01 10:00:00,STOCK,BUY,10,TO OPEN,MSFT,,,STOCK,10.0,10.0,LMT\n"
         "2025-10-01 10:05:00,STOCK,SELL,10,TO CLOSE,MSFT,,,STOCK,12.0,12.0,LMT\n"
     )
-    upload_response = upload_orders(client, token, csv_data)
-    assert upload_response.status_code == status.HTTP_201_CREATED
+    upload_job = upload_orders(client, token, csv_data)
+    assert upload_job["stage"] == "COMPLETED"
 
     # 3. Get trades
     response = client.get("/api/v1/trades", headers={"Authorization": f"Bearer {token}"})
@@ -47,6 +49,41 @@ def test_get_trades_success(client: TestClient, db_session: Session):
     assert trade["avg_exit_price"] == 12.0
     assert trade["pnl"] == 20.0
 
+def test_get_trades_query_count_does_not_grow_with_trades(client: TestClient, db_session: Session, count_queries):
+    # 1. Create a user and get a token
+    email = "query_count@example.com"
+    password = "testpassword"
+    token, user_id = get_user_token(client, email, password)
+    header = "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+
+    def round_trips(symbols):
+        return "".join(
+            f"2025-10-01 10:{i:02d}:00,STOCK,BUY,10,TO OPEN,{symbol},,,STOCK,10.0,10.0,LMT\n"
+            f"2025-10-01 10:{i:02d}:30,STOCK,SELL,10,TO CLOSE,{symbol},,,STOCK,11.0,11.0,LMT\n"
+            for i, symbol in enumerate(symbols)
+        )
+
+    def statements_for_get_trades():
+        with count_queries() as statements:
+            response = client.get("/api/v1/trades", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_200_OK
+        return len(response.json()), len(statements)
+
+    # 2. Measure with 2 trades, then with 20 trades
+    upload_orders(client, token, header + round_trips(["A", "B"]))
+    trades_small, statements_small = statements_for_get_trades()
+
+    upload_orders(client, token, header + round_trips([f"S{i}" for i in range(18)]))
+    trades_large, statements_large = statements_for_get_trades()
+
+    # 3. Same number of statements: the data version, trades and one IN query for their
+    # orders (the user is cached)
+    assert (trades_small, trades_large) == (2, 20)
+    assert statements_small == statements_large == 3
+
+    # 4. Repeating the request only reads the data version
+    assert statements_for_get_trades() == (20, 1)
+
 def test_get_trade_by_id_success(client: TestClient, db_session: Session):
     # 1. Create a user and get a token
     email = "trade_by_id@example.com"
@@ -377,9 +414,10 @@ def test_upload_orders_xlsx_with_missing_values(client: TestClient):
             data={"timezone": "UTC"},
         )
 
-    # 3. Assert the response
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert response.json() == {"detail": "Missing values in required column: Side"}
+    # 3. Assert the import failed with the validation error
+    job = wait_for_import(client, token, response)
+    assert job["stage"] == "FAILED"
+    assert job["error"] == "Missing values in required column: Side"
 def test_trade_closed_across_separate_files(client: TestClient, db_session: Session):
     # 1. Create a user and get a token
     email = "separate_files@example.com"
@@ -391,8 +429,8 @@ def test_trade_closed_across_separate_files(client: TestClient, db_session: Sess
         "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
         "2025-10-08 10:00:00,STOCK,BUY,10,TO OPEN,MSFT,,,STOCK,100.0,100.0,LMT\n"
     )
-    upload_response_open = upload_orders(client, token, csv_data_open)
-    assert upload_response_open.status_code == status.HTTP_201_CREATED
+    upload_job_open = upload_orders(client, token, csv_data_open)
+    assert upload_job_open["stage"] == "COMPLETED"
 
     # 3. Verify the trade is open
     response_open = client.get("/api/v1/trades", headers={"Authorization": f"Bearer {token}"})
@@ -412,8 +450,8 @@ def test_trade_closed_across_separate_files(client: TestClient, db_session: Sess
         "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
         "2025-10-09 10:00:00,STOCK,SELL,10,TO CLOSE,MSFT,,,STOCK,110.0,110.0,LMT\n"
     )
-    upload_response_close = upload_orders(client, token, csv_data_close)
-    assert upload_response_close.status_code == status.HTTP_201_CREATED
+    upload_job_close = upload_orders(client, token, csv_data_close)
+    assert upload_job_close["stage"] == "COMPLETED"
 
     # 5. Verify the trade is closed
     response_closed = client.get("/api/v1/trades", headers={"Authorization": f"Bearer {token}"})
@@ -427,3 +465,210 @@ def test_trade_closed_across_separate_files(client: TestClient, db_session: Sess
     assert trade_closed["avg_entry_price"] == 100.0
     assert trade_closed["avg_exit_price"] == 110.0
     assert trade_closed["pnl"] == 100.0
+
+def test_get_trades_keyset_pagination_and_filters(client: TestClient, db_session: Session):
+    # 1. Create a user and get a token
+    email = "paginate@example.com"
+    password = "testpassword"
+    token, user_id = get_user_token(client, email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 2. Upload five closed trades and one open trade
+    csv_data = "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n" + "".join(
+        f"2025-10-0{day} 10:00:00,STOCK,BUY,10,TO OPEN,SYM{day},,,STOCK,10.0,10.0,LMT\n"
+        f"2025-10-0{day} 11:00:00,STOCK,SELL,10,TO CLOSE,SYM{day},,,STOCK,11.0,11.0,LMT\n"
+        for day in range(1, 6)
+    ) + "2025-10-06 10:00:00,STOCK,SELL,5,TO OPEN,SYM6,,,STOCK,20.0,20.0,LMT\n"
+    upload_orders(client, token, csv_data)
+
+    # 3. Walk the pages, newest first
+    symbols, cursor = [], None
+    while True:
+        params = {"limit": 4, "total": "exact"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/trades", headers=headers, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-Total-Count"] == "6"
+        symbols += [trade["symbol"] for trade in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert symbols == ["SYM6", "SYM5", "SYM4", "SYM3", "SYM2", "SYM1"]
+
+    # 4. Filters narrow the results on the server
+    response = client.get(
+        "/api/v1/trades", headers=headers,
+        params={"status": "CLOSED", "start": "2025-10-02T00:00:00", "end": "2025-10-04T00:00:00"},
+    )
+    assert [trade["symbol"] for trade in response.json()] == ["SYM3", "SYM2"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get("/api/v1/trades", headers=headers, params={"direction": "SHORT"})
+    assert [trade["symbol"] for trade in response.json()] == ["SYM6"]
+
+    # 5. Garbage cursors are rejected
+    response = client.get("/api/v1/trades", headers=headers, params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_read_routes_match_in_async_mode(client: TestClient, async_sessions):
+    # 1. Create a user, get a token and upload orders
+    token, user_id = get_user_token(client, "async_mode@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(
+        client, token,
+        "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+        "2025-10-01 10:00:00,STOCK,BUY,10,TO OPEN,AAPL,,,STOCK,10.0,10.0,LMT\n"
+        "2025-10-01 10:30:00,STOCK,SELL,10,TO CLOSE,AAPL,,,STOCK,11.0,11.0,LMT\n"
+        "2025-10-01 11:00:00,STOCK,BUY,5,TO OPEN,MSFT,,,STOCK,20.0,20.0,LMT\n",
+    )
+    paths = ["/api/v1/users/me", "/api/v1/trades?limit=1", "/api/v1/orders?total=exact"]
+    trade_id = client.get("/api/v1/trades", headers=headers).json()[0]["id"]
+    paths.append(f"/api/v1/trades/{trade_id}")
+
+    # 2. Read through sync sessions, then through async sessions
+    sync_responses = [client.get(path, headers=headers) for path in paths]
+    with async_sessions():
+        async_responses = [client.get(path, headers=headers) for path in paths]
+
+    # 3. Same bodies and pagination headers in both modes
+    for sync_response, async_response in zip(sync_responses, async_responses):
+        assert async_response.status_code == status.HTTP_200_OK
+        assert async_response.json() == sync_response.json()
+        for header in ("X-Next-Cursor", "X-Total-Count"):
+            assert async_response.headers.get(header) == sync_response.headers.get(header)
+
+    # 4. Writes return the trade with its orders in both modes
+    trade = {
+        "symbol": "TSLA", "status": "OPEN", "direction": "LONG", "volume": 1,
+        "avg_entry_price": 100.0, "entry_timestamp": "2025-10-02T10:00:00", "executions_count": 1,
+    }
+    sync_created = client.post("/api/v1/trades", headers=headers, json=trade)
+    with async_sessions():
+        async_created = client.post("/api/v1/trades", headers=headers, json=trade)
+        async_updated = client.put(f"/api/v1/trades/{trade_id}", headers=headers, json={"notes": "async"})
+        async_deleted = client.delete(f"/api/v1/trades/{async_created.json()['id']}", headers=headers)
+    for response in (sync_created, async_created, async_updated, async_deleted):
+        assert response.status_code == status.HTTP_200_OK
+    assert async_created.json()["orders"] == sync_created.json()["orders"] == []
+    assert async_updated.json()["notes"] == "async"
+    assert async_updated.json()["orders"] == client.get(f"/api/v1/trades/{trade_id}", headers=headers).json()["orders"]
+    assert async_deleted.json()["id"] == async_created.json()["id"]
+
+def test_rebuild_trades_replays_orders(client: TestClient, db_session: Session):
+    # 1. Create a user, get a token, upload orders and enter a trade by hand
+    token, user_id = get_user_token(client, "rebuild@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(
+        client, token,
+        "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+        "2025-10-01 10:00:00,STOCK,BUY,10,TO OPEN,AAPL,,,STOCK,10.0,10.0,LMT\n"
+        "2025-10-01 10:30:00,STOCK,SELL,-10,TO CLOSE,AAPL,,,STOCK,11.0,11.0,LMT\n"
+        "2025-10-02 10:00:00,STOCK,SELL,-5,TO OPEN,TSLA,,,STOCK,20.0,20.0,LMT\n"
+        "2025-10-02 10:30:00,STOCK,BUY,5,TO CLOSE,TSLA,,,STOCK,18.0,18.0,LMT\n"
+        "2025-10-03 10:00:00,STOCK,BUY,1,TO OPEN,MSFT,,,STOCK,100.0,100.0,LMT\n",
+    )
+    manual = client.post("/api/v1/trades", headers=headers, json={
+        "symbol": "GME", "status": "CLOSED", "direction": "LONG", "volume": 1, "avg_entry_price": 1.0,
+        "entry_timestamp": "2025-09-01T14:00:00", "pnl": 3.0, "executions_count": 0,
+    }).json()
+    before = sorted((t["symbol"], t["status"], t["pnl"]) for t in client.get("/api/v1/trades", headers=headers).json())
+
+    # 2. Damage the order-backed trades, keeping a note on one of them
+    aapl = next(t for t in trade_crud.get_trades_by_user(db_session, user_id=user_id) if t.symbol == "AAPL")
+    client.put(f"/api/v1/trades/{aapl.id}", json={"pnl": -999.0, "notes": "earnings"}, headers=headers)
+
+    # 3. Rebuild
+    response = client.post("/api/v1/trades/rebuild", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert {k: v for k, v in response.json().items() if k != "seconds"} == {"orders": 5, "trades": 3, "open_trades": 1}
+
+    # 4. The trades are recomputed from the orders, the manual trade and the note survive
+    trades = client.get("/api/v1/trades", headers=headers).json()
+    assert sorted((t["symbol"], t["status"], t["pnl"]) for t in trades) == before
+    assert next(t for t in trades if t["symbol"] == "AAPL")["notes"] == "earnings"
+    assert manual["id"] in {t["id"] for t in trades}
+    assert [len(t["orders"]) for t in sorted(trades, key=lambda t: t["symbol"])] == [2, 0, 1, 2]
+    calendar = client.get("/api/v1/calendar", params={"month": "2025-10"}, headers=headers).json()
+    assert calendar["pnl"] == 20.0
+
+def test_option_legs_are_matched_per_contract(client: TestClient):
+    # 1. Create a user, get a token and trade two SPY strikes, then add to one of them
+    token, _ = get_user_token(client, "option_legs@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    header = "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+    upload_orders(
+        client, token,
+        header
+        + "2025-10-01 10:00:00,VERTICAL,BUY,1,TO OPEN,SPY,17 OCT 25,500,CALL,2.00,0.50,LMT\n"
+        + "2025-10-01 10:00:00,VERTICAL,SELL,-1,TO OPEN,SPY,17 OCT 25,505,CALL,1.50,0.50,LMT\n",
+    )
+    upload_orders(client, token, header + "2025-10-02 10:00:00,SINGLE,SELL,-1,TO CLOSE,SPY,17 OCT 25,500,CALL,2.50,2.50,LMT\n")
+
+    # 2. One trade per contract; the later close found its leg through the contract key
+    trades = client.get("/api/v1/trades", headers=headers).json()
+    assert sorted((t["contract_key"], t["direction"], t["status"], t["pnl"]) for t in trades) == [
+        ("SPY|2025-10-17|500.0|CALL", "LONG", "CLOSED", 0.5),
+        ("SPY|2025-10-17|505.0|CALL", "SHORT", "OPEN", None),
+    ]
+
+def test_get_trades_summary_and_sparse_fields(client: TestClient, count_queries):
+    # 1. Create a user, get a token and upload two round trips
+    token, _ = get_user_token(client, "trade_fields@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(
+        client, token,
+        "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+        "2025-10-01 10:00:00,STOCK,BUY,5,TO OPEN,AAPL,,,STOCK,5.0,5.0,LMT\n"
+        "2025-10-01 10:05:00,STOCK,SELL,5,TO CLOSE,AAPL,,,STOCK,6.0,6.0,LMT\n"
+        "2025-10-02 10:00:00,STOCK,BUY,5,TO OPEN,MSFT,,,STOCK,5.0,5.0,LMT\n"
+        "2025-10-02 10:05:00,STOCK,SELL,5,TO CLOSE,MSFT,,,STOCK,4.0,4.0,LMT\n",
+    )
+    full = client.get("/api/v1/trades", headers=headers).json()
+
+    # 2. The summary view is the full view without orders, and never queries them
+    with count_queries() as statements:
+        summary = client.get("/api/v1/trades", params={"view": "summary"}, headers=headers).json()
+    assert summary == [{k: v for k, v in trade.items() if k != "orders"} for trade in full]
+    assert len(statements) == 2
+    assert not any("orders" in statement for statement in statements)
+
+    # 3. fields= returns just those columns, in schema order, and still pages by cursor
+    first = client.get("/api/v1/trades", params={"fields": "pnl, symbol", "limit": 1}, headers=headers)
+    assert first.json() == [{"symbol": "MSFT", "pnl": -5.0}]
+    second = client.get(
+        "/api/v1/trades", params={"fields": "pnl,symbol", "limit": 1, "cursor": first.headers["X-Next-Cursor"]},
+        headers=headers,
+    )
+    assert second.json() == [{"symbol": "AAPL", "pnl": 5.0}]
+
+    response = client.get("/api/v1/trades", params={"fields": "symbol,orders"}, headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "orders" in response.json()["detail"]
+
+def test_get_trade_orders(client: TestClient):
+    # 1. Create a user, get a token and upload a round trip
+    token, _ = get_user_token(client, "trade_orders@example.com", "testpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload_orders(
+        client, token,
+        "Exec Time,Spread,Side,Qty,Pos Effect,Symbol,Exp,Strike,Type,Price,Net Price,Order Type\n"
+        "2025-10-01 10:05:00,STOCK,SELL,5,TO CLOSE,AAPL,,,STOCK,6.0,6.0,LMT\n"
+        "2025-10-01 10:00:00,STOCK,BUY,5,TO OPEN,AAPL,,,STOCK,5.0,5.0,LMT\n",
+    )
+    trade = client.get("/api/v1/trades", headers=headers).json()[0]
+
+    # 2. Orders come back in execution order, the same as the nested ones
+    orders = client.get(f"/api/v1/trades/{trade['id']}/orders", headers=headers).json()
+    assert [order["side"] for order in orders] == ["BUY", "SELL"]
+    assert sorted(orders, key=lambda o: o["id"]) == sorted(trade["orders"], key=lambda o: o["id"])
+
+    # 3. A trade without orders has none; another user's trade is not found
+    manual = client.post("/api/v1/trades", json={
+        "symbol": "AMD", "status": "OPEN", "direction": "LONG", "volume": 1, "avg_entry_price": 10.0,
+        "entry_timestamp": "2025-10-05T14:00:00", "executions_count": 1,
+    }, headers=headers).json()
+    assert client.get(f"/api/v1/trades/{manual['id']}/orders", headers=headers).json() == []
+    other, _ = get_user_token(client, "trade_orders_other@example.com", "testpassword")
+    response = client.get(f"/api/v1/trades/{trade['id']}/orders", headers={"Authorization": f"Bearer {other}"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,6 +1,19 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
 from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy.orm import Session
 from starlette import status
 
+from app.core import passwords
+from app.core.processes import spawn_context
+from app.models import User
+
 # Helper function to create a user and get their token
 def get_user_token(client: TestClient, email: str, password: str) -> tuple[str, int]:
     # Create user
@@ -145,3 +158,120 @@ def test_read_users_me_invalid_token(client: TestClient):
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json() == {"detail": "Could not validate credentials"}
+
+def test_read_users_me_is_served_from_cache(client: TestClient, count_queries):
+    # 1. Create a user and get a token; the token carries the user id
+    email = "me_cached@example.com"
+    token, user_id = get_user_token(client, email, "mepassword")
+    assert jwt.get_unverified_claims(token)["uid"] == user_id
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 2. The first request resolves the user, the next ones hit the cache
+    with count_queries() as statements:
+        first = client.get("/api/v1/users/me", headers=headers)
+    with count_queries() as cached_statements:
+        second = client.get("/api/v1/users/me", headers=headers)
+
+    assert first.json() == second.json() == {"id": user_id, "email": email}
+    assert len(statements) == 1
+    assert cached_statements == []
+
+def test_cached_user_is_invalidated_on_update(client: TestClient, db_session: Session):
+    # 1. Create a user, get a token and warm the cache
+    email = "me_renamed@example.com"
+    token, user_id = get_user_token(client, email, "mepassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/users/me", headers=headers).status_code == status.HTTP_200_OK
+
+    # 2. Change the email; the token no longer matches the user
+    user = db_session.get(User, user_id)
+    user.email = "renamed@example.com"
+    db_session.commit()
+
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_token_is_rejected_after_its_email_passes_to_another_user(client: TestClient, db_session: Session):
+    # 1. User A gets a token, then changes their email
+    email = "me_reused@example.com"
+    old_token, old_id = get_user_token(client, email, "mepassword")
+    old_headers = {"Authorization": f"Bearer {old_token}"}
+    user = db_session.get(User, old_id)
+    user.email = "me_moved@example.com"
+    db_session.commit()
+
+    # 2. User B registers with the released email
+    new_token, new_id = get_user_token(client, email, "otherpassword")
+    assert new_id != old_id
+
+    # 3. A's old token is rejected on a cache miss and on a cache hit
+    response = client.get("/api/v1/users/me", headers=old_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {new_token}"})
+    assert response.json() == {"id": new_id, "email": email}
+    response = client.get("/api/v1/users/me", headers=old_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_login_rehashes_password_with_outdated_cost(client: TestClient, db_session: Session):
+    # 1. Store a user whose hash uses a lower cost than the current setting
+    email = "rehash@example.com"
+    old_hash = passwords.pwd_context.handler("bcrypt").using(rounds=4).hash("rehashpassword")
+    db_session.add(User(email=email, password_hash=old_hash))
+    db_session.commit()
+
+    # 2. Login succeeds and replaces the hash
+    response = client.post("/api/v1/login/access-token", data={"username": email, "password": "rehashpassword"})
+    assert response.status_code == status.HTTP_200_OK
+
+    new_hash = db_session.query(User).filter(User.email == email).one().password_hash
+    assert new_hash != old_hash
+    assert f"$2b${passwords.BCRYPT_ROUNDS:02d}$" in new_hash
+    assert passwords.pwd_context.verify("rehashpassword", new_hash)
+
+def test_login_is_rejected_when_hashing_queue_is_full(client: TestClient, monkeypatch):
+    # 1. Create a user
+    email = "busy@example.com"
+    get_user_token(client, email, "busypassword")
+
+    # 2. With no free slots in the hashing queue, login is shed instead of queued
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(passwords, "_pending", threading.BoundedSemaphore(1))
+    passwords._pending.acquire()
+
+    response = client.post("/api/v1/login/access-token", data={"username": email, "password": "busypassword"})
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+
+def test_login_recovers_from_a_broken_hashing_pool(client: TestClient):
+    # 1. Create a user
+    email = "brokenpool@example.com"
+    get_user_token(client, email, "brokenpassword")
+
+    # 2. Break the pool the way a killed worker does
+    broken = passwords._get_executor()
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    # 3. Login replaces the pool and succeeds
+    response = client.post("/api/v1/login/access-token", data={"username": email, "password": "brokenpassword"})
+    assert response.status_code == status.HTTP_200_OK
+    assert passwords._executor is not broken
+
+def test_login_is_rejected_when_the_hashing_pool_keeps_breaking(client: TestClient, monkeypatch):
+    # 1. Create a user
+    email = "crashing@example.com"
+    get_user_token(client, email, "crashingpassword")
+
+    # 2. Every new pool is broken too; after one retry the login is shed
+    def broken_executor():
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=spawn_context())
+        with pytest.raises(BrokenProcessPool):
+            executor.submit(os._exit, 1).result()
+        return executor
+
+    monkeypatch.setattr(passwords, "_get_executor", broken_executor)
+
+    response = client.post("/api/v1/login/access-token", data={"username": email, "password": "crashingpassword"})
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
@@ -1,15 +1,20 @@
 import sys
 import os
+from contextlib import contextmanager
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Add the project root to the sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.main import app
-from app.database.database import Base, get_db
+from app.core import result_cache
+from app.core.security import user_cache
+from app.database.database import Base, get_db, get_session_factory
 
 # Build the absolute path to the test database
 tests_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,12 +23,19 @@ TESTING_DATABASE_URL = f"sqlite:///{os.path.join(tests_dir, 'test.db')}"
 engine = create_engine(TESTING_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The same database through aiosqlite, for the DB_MODE=async code paths
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tests_dir, 'test.db')}", poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 @pytest.fixture(scope="function")
 def db_session():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
-    
+    # Ids are reused after the tables are recreated
+    user_cache.clear()
+    result_cache.cache.clear()
+
     db = TestingSessionLocal()
     try:
         yield db
@@ -37,8 +49,54 @@ def client(db_session):
         try:
             yield db_session
         finally:
-            pass
+            # Requests share this session; drop cached state so each one sees
+            # what background imports have written since.
+            db_session.expire_all()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture
+def count_queries():
+    """Returns a context manager collecting every SQL statement run against the test database."""
+    @contextmanager
+    def _count_queries():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return _count_queries
+
+
+@pytest.fixture
+def async_sessions(client):
+    """Returns a context manager that serves requests from AsyncSessions, as with DB_MODE=async.
+
+    Routes that only support the sync mode (sign-up, login, upload) must be called outside it.
+    """
+    @contextmanager
+    def _async_sessions():
+        async def override_get_db():
+            async with AsyncTestingSessionLocal() as db:
+                yield db
+
+        previous = app.dependency_overrides[get_db]
+        app.dependency_overrides[get_db] = override_get_db
+        user_cache.clear()
+        result_cache.cache.clear()
+        try:
+            yield
+        finally:
+            app.dependency_overrides[get_db] = previous
+
+    return _async_sessions
@@ -0,0 +1,65 @@
+import datetime
+from typing import List
+
+from pydantic import BaseModel, TypeAdapter, field_serializer
+
+from app.core import serialization
+from app.models.order import Order
+from app.models.trade import Trade
+from app.schemas import order as order_schema
+from app.schemas import stats as stats_schema
+from app.schemas import trade as trade_schema
+
+def pydantic_json(response_model, payload) -> bytes:
+    adapter = TypeAdapter(response_model)
+    return adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+
+def make_trade(trade_id: int) -> Trade:
+    opened = datetime.datetime(2025, 10, 1, 14, 30, 0, 250000)
+    orders = [
+        Order(
+            id=trade_id * 2 + i, user_id=1, execution_time=opened + datetime.timedelta(minutes=i), spread="SINGLE",
+            side=side, quantity=quantity, position_effect=effect, symbol="SPY", expiration_date=datetime.date(2025, 10, 17),
+            strike_price=500.0, option_type="CALL", price=2.5 + i, net_price=2.5 + i, order_type="LMT", notes=None,
+            created_at=opened, updated_at=opened.replace(tzinfo=datetime.timezone.utc),
+        )
+        for i, (side, quantity, effect) in enumerate((("BUY", 1, "TO OPEN"), ("SELL", -1, "TO CLOSE")))
+    ]
+    return Trade(
+        id=trade_id, user_id=1, symbol="SPY", contract_key="SPY|2025-10-17|500.0|CALL", status="CLOSED",
+        direction="LONG", volume=1, avg_entry_price=2, avg_exit_price=3.5, entry_timestamp=opened,
+        exit_timestamp=opened + datetime.timedelta(minutes=1), pnl=1.0, executions_count=2, notes="a \"note\"",
+        orders=orders,
+    )
+
+def test_orm_payloads_match_pydantic():
+    trades = [make_trade(i) for i in range(1, 4)]
+
+    for response_model, payload in (
+        (List[trade_schema.Trade], trades),
+        (trade_schema.Trade, trades[0]),
+        (List[order_schema.Order], trades[0].orders),
+    ):
+        assert serialization.dump_json(response_model, payload) == pydantic_json(response_model, payload)
+    # Integers stored in float columns still serialize as floats
+    assert b'"avg_entry_price":2.0' in serialization.dump_json(trade_schema.Trade, trades[0])
+
+def test_dict_payloads_fill_in_defaults():
+    stats = {
+        "trades": 1, "wins": 1, "losses": 0, "breakeven": 0, "net_pnl": 5, "gross_profit": 5.0, "gross_loss": 0.0,
+        "by_status": {"OPEN": 0, "CLOSED": 1},
+    }
+    payload = {**stats, "by_direction": {"LONG": stats, "SHORT": {**stats, "trades": 0, "wins": 0}}}
+
+    fast = serialization.dump_json(stats_schema.StatsSummary, payload)
+    assert fast == pydantic_json(stats_schema.StatsSummary, payload)
+
+def test_custom_serializers_fall_back_to_pydantic():
+    class Price(BaseModel):
+        value: float
+
+        @field_serializer("value")
+        def round_value(self, value: float) -> float:
+            return round(value, 1)
+
+    assert serialization.dump_json(Price, {"value": 1.26}) == b'{"value":1.3}'
@@ -0,0 +1,155 @@
+import datetime
+from collections import Counter
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.database.database import Base
+from app.database.migrations import MIGRATIONS, run_migrations
+from app.services.order_normalization_service import add_fingerprints
+
+
+def test_trade_running_totals_are_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+
+    # 1. Build the pre-migration schema: trades without the running totals
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for column in ("entry_quantity", "entry_notional", "exit_quantity", "exit_notional"):
+            conn.execute(text(f"ALTER TABLE trades DROP COLUMN {column}"))
+
+        now = datetime.datetime(2025, 10, 1, 10, 0)
+        conn.execute(text("INSERT INTO users (id, email, password_hash) VALUES (1, 'm@example.com', 'x')"))
+        conn.execute(
+            text(
+                "INSERT INTO trades (id, user_id, symbol, status, direction, volume, avg_entry_price, executions_count) "
+                "VALUES (1, 1, 'AAPL', 'OPEN', 'LONG', 20, 10.5, 3)"
+            )
+        )
+        for order_id, qty, effect, price in ((1, 10, "TO OPEN", 10.0), (2, 10, "TO OPEN", 11.0), (3, -5, "TO CLOSE", 12.0)):
+            conn.execute(
+                text(
+                    "INSERT INTO orders (id, user_id, execution_time, side, quantity, position_effect, symbol, price, net_price) "
+                    "VALUES (:id, 1, :t, 'BUY', :qty, :effect, 'AAPL', :price, :price)"
+                ),
+                {"id": order_id, "t": now, "qty": qty, "effect": effect, "price": price},
+            )
+            conn.execute(text("INSERT INTO trade_orders (trade_id, order_id) VALUES (1, :id)"), {"id": order_id})
+
+    # 2. Migrate twice; the second run must be a no-op
+    run_migrations(engine)
+    run_migrations(engine)
+
+    # 3. Assert the columns exist and were backfilled from the linked orders
+    assert "entry_quantity" in {c["name"] for c in inspect(engine).get_columns("trades")}
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT entry_quantity, entry_notional, exit_quantity, exit_notional FROM trades WHERE id = 1")
+        ).one()
+        versions = conn.execute(text("SELECT version FROM schema_migrations")).scalars().all()
+
+    assert tuple(row) == (20, 210.0, 5, 60.0)
+    assert sorted(versions) == sorted(version for version, _ in MIGRATIONS)
+
+
+def test_query_indexes_and_trade_orders_primary_key(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+
+    # 1. Build the pre-migration schema: no composite indexes, trade_orders without a key
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for index in ("ix_orders_user_id_execution_time", "ix_trades_user_id_entry_timestamp",
+                      "ix_trades_user_id_symbol_entry_timestamp", "ix_trades_open_user_id_contract_key"):
+            conn.execute(text(f"DROP INDEX {index}"))
+        conn.execute(text("CREATE INDEX ix_trades_symbol ON trades (symbol)"))
+        conn.execute(text("DROP TABLE trade_orders"))
+        conn.execute(text("CREATE TABLE trade_orders (trade_id INTEGER, order_id INTEGER)"))
+        conn.execute(text("INSERT INTO trade_orders VALUES (1, 1), (1, 1), (1, 2), (NULL, 3)"))
+
+    # 2. Migrate
+    run_migrations(engine)
+
+    # 3. Links are deduplicated under a composite key and the query indexes exist
+    inspector = inspect(engine)
+    assert inspector.get_pk_constraint("trade_orders")["constrained_columns"] == ["trade_id", "order_id"]
+    trade_indexes = {index["name"] for index in inspector.get_indexes("trades")}
+    # The open-position index is keyed by contract since 0007
+    assert {"ix_trades_user_id_entry_timestamp", "ix_trades_open_user_id_contract_key"} <= trade_indexes
+    assert "ix_trades_open_user_id_symbol" not in trade_indexes
+    assert "ix_trades_symbol" not in trade_indexes
+    assert "ix_orders_user_id_execution_time" in {index["name"] for index in inspector.get_indexes("orders")}
+    with engine.connect() as conn:
+        links = conn.execute(text("SELECT trade_id, order_id FROM trade_orders ORDER BY order_id")).all()
+    assert [tuple(link) for link in links] == [(1, 1), (1, 2)]
+
+
+def test_order_fingerprints_are_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+
+    # 1. Build the pre-migration schema with the same fill stored twice
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_orders_user_id_fingerprint"))
+        conn.execute(text("ALTER TABLE orders DROP COLUMN fingerprint"))
+        conn.execute(text("INSERT INTO users (id, email, password_hash) VALUES (1, 'm@example.com', 'x')"))
+        for order_id in (1, 2):
+            conn.execute(
+                text(
+                    "INSERT INTO orders (id, user_id, execution_time, side, quantity, position_effect, symbol, "
+                    "expiration_date, strike_price, option_type, price, net_price) "
+                    "VALUES (:id, 1, :t, 'BUY', 1, 'TO OPEN', 'SPY', :exp, 500.0, 'CALL', 1.25, 1.25)"
+                ),
+                {"id": order_id, "t": datetime.datetime(2025, 10, 1, 14, 0), "exp": datetime.date(2025, 10, 17)},
+            )
+
+    # 2. Migrate
+    run_migrations(engine)
+
+    # 3. Both rows are kept, with the fingerprints a new upload of the two fills would get
+    records = [
+        {"execution_time": datetime.datetime(2025, 10, 1, 14, 0, tzinfo=datetime.timezone.utc), "symbol": "SPY",
+         "side": "BUY", "quantity": 1, "position_effect": "TO OPEN", "price": 1.25,
+         "expiration_date": datetime.date(2025, 10, 17), "strike_price": 500.0, "option_type": "CALL"}
+        for _ in range(2)
+    ]
+    add_fingerprints(records, Counter())
+    assert "ux_orders_user_id_fingerprint" in {index["name"] for index in inspect(engine).get_indexes("orders")}
+    with engine.connect() as conn:
+        stored = conn.execute(text("SELECT fingerprint FROM orders ORDER BY id")).scalars().all()
+    assert stored == [r["fingerprint"] for r in records]
+    assert stored[0] != stored[1]
+
+
+def test_trade_contract_keys_are_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+
+    # 1. Build the pre-migration schema: an option trade, a stock trade and a manual trade
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_trades_open_user_id_contract_key"))
+        conn.execute(text("ALTER TABLE trades DROP COLUMN contract_key"))
+        conn.execute(text("INSERT INTO users (id, email, password_hash) VALUES (1, 'm@example.com', 'x')"))
+        for trade_id, symbol in ((1, "SPY"), (2, "AAPL"), (3, "GME")):
+            conn.execute(text(
+                "INSERT INTO trades (id, user_id, symbol, status, direction, volume, avg_entry_price, executions_count, "
+                "entry_quantity, entry_notional, exit_quantity, exit_notional) "
+                "VALUES (:id, 1, :symbol, 'OPEN', 'LONG', 1, 1.0, 1, 1, 1.0, 0, 0.0)"
+            ), {"id": trade_id, "symbol": symbol})
+        for order_id, symbol, expiration, strike, option_type in (
+            (1, "SPY", datetime.date(2025, 10, 17), 500.0, "CALL"), (2, "AAPL", None, 0.0, "STOCK"),
+        ):
+            conn.execute(text(
+                "INSERT INTO orders (id, user_id, execution_time, side, quantity, position_effect, symbol, "
+                "expiration_date, strike_price, option_type, price, net_price) "
+                "VALUES (:id, 1, :t, 'BUY', 1, 'TO OPEN', :symbol, :exp, :strike, :type, 1.0, 1.0)"
+            ), {"id": order_id, "t": datetime.datetime(2025, 10, 1, 14, 0), "symbol": symbol,
+                "exp": expiration, "strike": strike, "type": option_type})
+            conn.execute(text("INSERT INTO trade_orders (trade_id, order_id) VALUES (:id, :id)"), {"id": order_id})
+
+    # 2. Migrate
+    run_migrations(engine)
+
+    # 3. Keys come from the first order, or the symbol, and the open index uses them
+    with engine.connect() as conn:
+        keys = conn.execute(text("SELECT contract_key FROM trades ORDER BY id")).scalars().all()
+    assert keys == ["SPY|2025-10-17|500.0|CALL", "AAPL", "GME"]
+    assert "ix_trades_open_user_id_contract_key" in {index["name"] for index in inspect(engine).get_indexes("trades")}
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+
+from app.database.pool import MeteredQueuePool
+
+
+def test_metered_pool_records_checkouts_overflow_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=MeteredQueuePool,
+        pool_size=1, max_overflow=1, pool_timeout=0.05,
+    )
+
+    # 1. Hold the pooled connection and the overflow one, then ask for a third
+    first = engine.connect()
+    second = engine.connect()
+    first.execute(text("SELECT 1"))
+    busy = engine.pool.stats()
+    with pytest.raises(TimeoutError):
+        engine.connect()
+
+    # 2. Release both
+    second.close()
+    first.close()
+    stats = engine.pool.stats()
+
+    assert (busy["in_use"], busy["overflow"]) == (2, 1)
+    assert (stats["checkouts"], stats["overflow_checkouts"], stats["timeouts"]) == (2, 1, 1)
+    assert stats["in_use"] == 0
+    assert sum(stats["wait_histogram"].values()) == 2
+    assert stats["wait_seconds_max"] >= stats["wait_seconds_avg"] > 0
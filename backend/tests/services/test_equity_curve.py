@@ -0,0 +1,36 @@
+import numpy as np
+
+from app.services.equity_curve_service import _underwater_periods, lttb
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[400], y[700] = 50.0, -80.0
+
+    keep = lttb(x, y, 20)
+
+    assert len(keep) == 20
+    assert (keep[0], keep[-1]) == (0, 999)
+    assert np.all(np.diff(keep) > 0)
+    assert {400, 700} <= set(keep.tolist())
+
+
+def test_lttb_returns_every_point_below_threshold():
+    x = np.arange(5, dtype=np.float64)
+
+    assert lttb(x, x, 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_underwater_periods():
+    # Equity 10, 5, 2, 12, 8: underwater for two trades, recovered, then underwater again
+    pnl = np.array([10.0, -5.0, -3.0, 10.0, -4.0])
+    equity = np.cumsum(pnl)
+    drawdown = equity - np.maximum.accumulate(np.maximum(equity, 0.0))
+    times = np.arange(5, dtype=np.int64) * 60_000_000  # one trade a minute, in microseconds
+
+    periods = _underwater_periods(drawdown, times)
+
+    assert [(p["depth"], p["trades"], p["duration_seconds"]) for p in periods] == [(-8.0, 2, 120.0), (-4.0, 1, 0.0)]
+    assert periods[0]["end"] is not None
+    assert periods[1]["end"] is None
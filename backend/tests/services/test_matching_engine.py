@@ -0,0 +1,109 @@
+import datetime
+
+from app.services import matching_engine
+from app.services.matching_engine import OrderRecord, Position, contract_key, match_orders
+
+START = datetime.datetime(2025, 10, 1, 10, 0, tzinfo=datetime.timezone.utc)
+
+
+def order(id: int, minute: int, side: str, quantity: int, effect: str, price: float, symbol: str = "AAPL"):
+    return OrderRecord(id, START + datetime.timedelta(minutes=minute), symbol, side, quantity, effect, price)
+
+
+def test_scale_in_and_out_closes_trade():
+    positions = match_orders(
+        [
+            order(3, 5, "SELL", -10, "TO CLOSE", 9.0),
+            order(1, 0, "BUY", 5, "TO OPEN", 8.0),
+            order(2, 1, "BUY", 5, "TO OPEN", 8.5),
+        ],
+        [],
+    )
+
+    assert len(positions) == 1
+    trade = positions[0]
+    assert trade.trade_id is None
+    assert trade.status == "CLOSED"
+    assert trade.volume == 10
+    assert trade.avg_entry_price == 8.25
+    assert trade.avg_exit_price == 9.0
+    assert round(trade.pnl, 2) == 7.5
+    assert trade.exit_timestamp == START + datetime.timedelta(minutes=5)
+    assert list(trade.order_ids) == [1, 2, 3]
+
+
+def test_short_trade_and_reopen_creates_two_positions():
+    positions = match_orders(
+        [
+            order(1, 0, "SELL", -20, "TO OPEN", 5.0),
+            order(2, 1, "BUY", 20, "TO CLOSE", 4.0),
+            order(3, 2, "SELL", -10, "TO OPEN", 6.0),
+        ],
+        [],
+    )
+
+    assert [p.status for p in positions] == ["CLOSED", "OPEN"]
+    assert positions[0].direction == "SHORT"
+    assert positions[0].pnl == 20.0
+    assert positions[1].volume == 10
+
+
+def test_existing_open_position_is_updated():
+    existing = Position(
+        symbol="MSFT", direction="LONG", trade_id=7, volume=10, avg_entry_price=100.0,
+        entry_timestamp=START, executions_count=1, entry_quantity=10, entry_notional=1000.0,
+    )
+
+    positions = match_orders([order(2, 60, "SELL", -10, "TO CLOSE", 110.0, symbol="MSFT")], [existing])
+
+    assert positions == [existing]
+    assert existing.status == "CLOSED"
+    assert existing.executions_count == 2
+    assert existing.pnl == 100.0
+    assert list(existing.order_ids) == [2]
+
+
+def test_orphan_close_and_opposite_open_are_ignored():
+    positions = match_orders(
+        [
+            order(1, 0, "SELL", -5, "TO CLOSE", 10.0),
+            order(2, 1, "BUY", 5, "TO OPEN", 10.0),
+            order(3, 2, "SELL", -5, "TO OPEN", 10.0),
+        ],
+        [],
+    )
+
+    assert len(positions) == 1
+    assert list(positions[0].order_ids) == [2]
+    assert positions[0].status == "OPEN"
+
+
+def test_option_legs_on_one_symbol_are_separate_positions():
+    call = contract_key("SPY", datetime.date(2025, 10, 17), 500.0, "CALL")
+    put = contract_key("SPY", datetime.date(2025, 10, 17), 480.0, "PUT")
+
+    def leg(id, minute, side, quantity, effect, price, key):
+        return OrderRecord(id, START + datetime.timedelta(minutes=minute), "SPY", side, quantity, effect, price, key)
+
+    positions = match_orders(
+        [
+            leg(1, 0, "BUY", 1, "TO OPEN", 2.0, call),
+            leg(2, 0, "SELL", -1, "TO OPEN", 1.5, put),
+            leg(3, 5, "SELL", -1, "TO CLOSE", 3.0, call),
+        ],
+        [],
+    )
+
+    by_key = {p.contract_key: p for p in positions}
+    assert (by_key[call].status, by_key[call].direction, by_key[call].pnl) == ("CLOSED", "LONG", 1.0)
+    assert (by_key[put].status, by_key[put].direction, by_key[put].symbol) == ("OPEN", "SHORT", "SPY")
+
+
+def test_contract_key(monkeypatch):
+    expiration = datetime.date(2025, 10, 17)
+
+    assert contract_key("AAPL", None, 0.0, "STOCK") == "AAPL"
+    assert contract_key("SPY", expiration, 500.0, "CALL", "VERTICAL") == "SPY|2025-10-17|500.0|CALL"
+    monkeypatch.setattr(matching_engine, "POSITION_GROUP_BY_SPREAD", True)
+    assert contract_key("SPY", expiration, 500.0, "CALL", "VERTICAL") == "SPY|2025-10-17|500.0|CALL|VERTICAL"
+    assert contract_key("SPY", expiration, 500.0, "CALL", "SINGLE") == "SPY|2025-10-17|500.0|CALL"
@@ -0,0 +1,71 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from app.models import User
+from app.services import trade_rebuild_service
+
+START = datetime.datetime(2025, 10, 1, 14, 0, tzinfo=datetime.timezone.utc)
+
+
+def partitions(symbols: int, round_trips: int) -> list[list[tuple]]:
+    result = []
+    for s in range(symbols):
+        rows = []
+        for i in range(round_trips):
+            opened = START + datetime.timedelta(minutes=2 * i)
+            base = (s * round_trips + i) * 2
+            rows.append((base + 1, opened, f"S{s}", "BUY", 10, "TO OPEN", 10.0 + i))
+            rows.append((base + 2, opened + datetime.timedelta(minutes=1), f"S{s}", "SELL", -10, "TO CLOSE", 11.0 + i))
+        result.append(rows)
+    return result
+
+
+def test_parallel_replay_matches_inline(monkeypatch):
+    data = partitions(symbols=6, round_trips=50)
+
+    inline = trade_rebuild_service._replay(data, order_count=600)
+    monkeypatch.setattr(trade_rebuild_service, "REBUILD_PARALLEL_MIN_ORDERS", 0)
+    monkeypatch.setattr(trade_rebuild_service, "REBUILD_WORKERS", 2)
+    parallel = trade_rebuild_service._replay(data, order_count=600)
+
+    def key(p):
+        return p.symbol, p.entry_timestamp, p.pnl, list(p.order_ids)
+
+    assert len(inline) == 300
+    assert sorted(map(key, parallel)) == sorted(map(key, inline))
+
+
+def test_rebuild_runs_under_the_write_lock(db_session, monkeypatch):
+    # A user without order-backed trades: nothing is deleted before the ids are read
+    user = User(email="rebuild_lock@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.commit()
+
+    def assert_locked(db):
+        other = sqlite3.connect(db.get_bind().url.database, timeout=0)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+        finally:
+            other.close()
+
+    replay, reserve = trade_rebuild_service._replay, trade_rebuild_service._reserve_trade_ids
+    calls = []
+
+    # An import cannot commit orders between the order read and the swap
+    def replay_while_locked(partitions, order_count):
+        assert_locked(db_session)
+        calls.append("replay")
+        return replay(partitions, order_count)
+
+    def reserve_while_locked(db, count):
+        assert_locked(db)
+        calls.append("reserve")
+        return reserve(db, count)
+
+    monkeypatch.setattr(trade_rebuild_service, "_replay", replay_while_locked)
+    monkeypatch.setattr(trade_rebuild_service, "_reserve_trade_ids", reserve_while_locked)
+    assert trade_rebuild_service.rebuild_trades(db_session, user.id)["trades"] == 0
+    assert calls == ["replay", "reserve"]
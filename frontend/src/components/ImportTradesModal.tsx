@@ -1,9 +1,9 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { Box, Typography, Modal, Select, MenuItem, Button, IconButton, FormControl, InputLabel, CircularProgress } from '@mui/material';
 import CloseIcon from '@mui/icons-material/Close';
 import { useDropzone } from 'react-dropzone';
 import { useAuth } from '../contexts/AuthContext';
-import { uploadOrders } from '../services/orderService';
+import { uploadOrders, waitForImport } from '../services/orderService';
 
 interface ImportTradesModalProps {
   open: boolean;
@@ -36,6 +36,8 @@ const ImportTradesModal: React.FC<ImportTradesModalProps> = ({ open, onClose })
   const [selectedTimezone, setSelectedTimezone] = useState<string>(timezones[0]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  // Stops polling the import job when the modal is closed
+  const pollRef = useRef<AbortController | null>(null);
 
   const onDrop = (acceptedFiles: File[]) => {
     if (acceptedFiles.length > 0) {
@@ -64,7 +66,9 @@ const ImportTradesModal: React.FC<ImportTradesModalProps> = ({ open, onClose })
     setError(null);
 
     try {
-      await uploadOrders(selectedFile, selectedTimezone, token);
+      const { job_id } = await uploadOrders(selectedFile, selectedTimezone, token);
+      pollRef.current = new AbortController();
+      await waitForImport(job_id, token, { signal: pollRef.current.signal });
       onClose(); // Close modal on success
     } catch (err: any) {
       setError(err.message || 'An unexpected error occurred.');
@@ -74,6 +78,7 @@ const ImportTradesModal: React.FC<ImportTradesModalProps> = ({ open, onClose })
   };
 
   const handleClose = () => {
+    pollRef.current?.abort();
     setSelectedFile(null);
     setError(null);
     setLoading(false);
@@ -1,11 +1,13 @@
-import React from 'react';
-import { Box, Typography, Modal, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, IconButton, Grid, Chip } from '@mui/material';
+import React, { useEffect, useState } from 'react';
+import { Box, Typography, Modal, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, IconButton, Grid, Chip, CircularProgress } from '@mui/material';
 import CloseIcon from '@mui/icons-material/Close';
-import type { Trade, Order } from '../../types';
+import type { TradeSummary, Order } from '../../types';
+import { useAuth } from '../../contexts/AuthContext';
+import { getTradeOrders } from '../../services/tradeService';
 import { formatToNY } from '../../utils/dateUtils';
 
 interface OrdersModalProps {
-  trade: Trade | null;
+  trade: TradeSummary | null;
   onClose: () => void;
 }
 
@@ -28,6 +30,29 @@ const style = {
 };
 
 const OrdersModal: React.FC<OrdersModalProps> = ({ trade, onClose }) => {
+  const { token } = useAuth();
+  const [orders, setOrders] = useState<Order[] | null>(null);
+
+  // The trades list comes without orders; load this trade's executions on open
+  useEffect(() => {
+    setOrders(null);
+    if (!trade || !token) {
+      return;
+    }
+    let cancelled = false;
+    getTradeOrders(token, trade.id)
+      .then((result) => {
+        if (!cancelled) setOrders(result);
+      })
+      .catch((error) => {
+        console.error('Error fetching trade orders:', error);
+        if (!cancelled) setOrders([]);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [trade, token]);
+
   if (!trade) {
     return null;
   }
@@ -86,39 +111,45 @@ const OrdersModal: React.FC<OrdersModalProps> = ({ trade, onClose }) => {
         </Box>
 
         <Typography variant="h6" sx={{ mb: 2, color: '#94A3B8' }}>Associated Orders</Typography>
-        <TableContainer component={Paper} sx={{ overflowY: 'auto', backgroundColor: '#0F172A', color: '#F8FAFC' }}>
-          <Table sx={{ minWidth: 650 }} aria-label="simple table">
-            <TableHead>
-              <TableRow>
-                <TableCell sx={{ color: '#94A3B8' }}>Execution Time</TableCell>
-                <TableCell sx={{ color: '#94A3B8' }}>Side</TableCell>
-                <TableCell sx={{ color: '#94A3B8' }}>Quantity</TableCell>
-                <TableCell sx={{ color: '#94A3B8' }}>Position Effect</TableCell>
-                <TableCell sx={{ color: '#94A3B8' }}>Price</TableCell>
-                <TableCell sx={{ color: '#94A3B8' }}>Net Price</TableCell>
-              </TableRow>
-            </TableHead>
-            <TableBody>
-              {trade.orders.map((order: Order) => (
-                <TableRow 
-                  key={order.id}
-                  sx={{
-                    '&:hover': {
-                      backgroundColor: 'rgba(255, 255, 255, 0.04)',
-                    },
-                  }}
-                >
-                  <TableCell sx={{ color: '#F8FAFC' }}>{formatToNY(order.execution_time)}</TableCell>
-                  <TableCell sx={{ color: '#F8FAFC' }}>{order.side}</TableCell>
-                  <TableCell sx={{ color: '#F8FAFC' }}>{order.quantity}</TableCell>
-                  <TableCell sx={{ color: '#F8FAFC' }}>{order.position_effect}</TableCell>
-                  <TableCell sx={{ color: '#F8FAFC' }}>${order.price.toFixed(2)}</TableCell>
-                  <TableCell sx={{ color: '#F8FAFC' }}>${order.net_price.toFixed(2)}</TableCell>
+        {orders === null ? (
+          <Box sx={{ display: 'flex', justifyContent: 'center', p: 4 }}>
+            <CircularProgress size={32} />
+          </Box>
+        ) : (
+          <TableContainer component={Paper} sx={{ overflowY: 'auto', backgroundColor: '#0F172A', color: '#F8FAFC' }}>
+            <Table sx={{ minWidth: 650 }} aria-label="simple table">
+              <TableHead>
+                <TableRow>
+                  <TableCell sx={{ color: '#94A3B8' }}>Execution Time</TableCell>
+                  <TableCell sx={{ color: '#94A3B8' }}>Side</TableCell>
+                  <TableCell sx={{ color: '#94A3B8' }}>Quantity</TableCell>
+                  <TableCell sx={{ color: '#94A3B8' }}>Position Effect</TableCell>
+                  <TableCell sx={{ color: '#94A3B8' }}>Price</TableCell>
+                  <TableCell sx={{ color: '#94A3B8' }}>Net Price</TableCell>
                 </TableRow>
-              ))}
-            </TableBody>
-          </Table>
-        </TableContainer>
+              </TableHead>
+              <TableBody>
+                {orders.map((order: Order) => (
+                  <TableRow 
+                    key={order.id}
+                    sx={{
+                      '&:hover': {
+                        backgroundColor: 'rgba(255, 255, 255, 0.04)',
+                      },
+                    }}
+                  >
+                    <TableCell sx={{ color: '#F8FAFC' }}>{formatToNY(order.execution_time)}</TableCell>
+                    <TableCell sx={{ color: '#F8FAFC' }}>{order.side}</TableCell>
+                    <TableCell sx={{ color: '#F8FAFC' }}>{order.quantity}</TableCell>
+                    <TableCell sx={{ color: '#F8FAFC' }}>{order.position_effect}</TableCell>
+                    <TableCell sx={{ color: '#F8FAFC' }}>${order.price.toFixed(2)}</TableCell>
+                    <TableCell sx={{ color: '#F8FAFC' }}>${order.net_price.toFixed(2)}</TableCell>
+                  </TableRow>
+                ))}
+              </TableBody>
+            </Table>
+          </TableContainer>
+        )}
       </Box>
     </Modal>
   );
@@ -4,7 +4,7 @@ import { useAuth } from '../contexts/AuthContext';
 import { DataGrid, GridToolbar } from '@mui/x-data-grid';
 import type { GridColDef, GridRowParams } from '@mui/x-data-grid';
 import { Box, Paper, Typography, ThemeProvider, createTheme, Chip } from '@mui/material';
-import type { Trade } from '../types';
+import type { TradeSummary } from '../types';
 import OrdersModal from '../components/TradesGrid/OrdersModal';
 import { formatToNY } from '../utils/dateUtils';
 
@@ -68,9 +68,9 @@ const darkTheme = createTheme({
 
 const TradesPage: React.FC = () => {
   const { user, token } = useAuth();
-  const [trades, setTrades] = useState<Trade[]>([]);
+  const [trades, setTrades] = useState<TradeSummary[]>([]);
   const [loading, setLoading] = useState(true);
-  const [selectedTrade, setSelectedTrade] = useState<Trade | null>(null);
+  const [selectedTrade, setSelectedTrade] = useState<TradeSummary | null>(null);
 
   useEffect(() => {
     const fetchTrades = async () => {
@@ -91,7 +91,7 @@ const TradesPage: React.FC = () => {
   }, [user, token]);
 
   const handleRowClick = (params: GridRowParams) => {
-    setSelectedTrade(params.row as Trade);
+    setSelectedTrade(params.row as TradeSummary);
   };
 
   const columns: GridColDef[] = [
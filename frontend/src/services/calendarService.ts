@@ -0,0 +1,13 @@
+import axios from './api';
+import type { CalendarMonth } from '../types';
+
+// month is YYYY-MM
+export const getCalendarMonth = async (token: string, month: string): Promise<CalendarMonth> => {
+  const response = await axios.get('/calendar', {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+    params: { month },
+  });
+  return response.data;
+};
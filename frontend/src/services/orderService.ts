@@ -1,6 +1,7 @@
 import api from './api';
+import type { ImportJob, ImportJobCreated } from '../types';
 
-export const uploadOrders = async (file: File, timezone: string, token: string) => {
+export const uploadOrders = async (file: File, timezone: string, token: string): Promise<ImportJobCreated> => {
   const formData = new FormData();
   formData.append('file', file);
   formData.append('timezone', timezone);
@@ -32,3 +33,45 @@ export const getOrders = async (token: string) => {
     throw error;
   }
 };
+
+export const getImportJob = async (jobId: string, token: string): Promise<ImportJob> => {
+  const response = await api.get(`/imports/${jobId}`, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+  });
+  return response.data;
+};
+
+export interface WaitForImportOptions {
+  intervalMs?: number;
+  // Gives up after this long; a job the server lost would otherwise be polled forever
+  timeoutMs?: number;
+  signal?: AbortSignal;
+}
+
+// Polls an import job until it completes; rejects with the job error if it fails, when the
+// timeout passes or when `signal` is aborted.
+export const waitForImport = async (
+  jobId: string,
+  token: string,
+  { intervalMs = 1000, timeoutMs = 10 * 60 * 1000, signal }: WaitForImportOptions = {},
+): Promise<ImportJob> => {
+  const deadline = Date.now() + timeoutMs;
+  for (;;) {
+    if (signal?.aborted) {
+      throw new Error('Import status check cancelled.');
+    }
+    const job = await getImportJob(jobId, token);
+    if (job.stage === 'COMPLETED') {
+      return job;
+    }
+    if (job.stage === 'FAILED') {
+      throw new Error(job.error || 'Import failed.');
+    }
+    if (Date.now() >= deadline) {
+      throw new Error('The import is taking longer than expected. Check back later.');
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
@@ -0,0 +1,33 @@
+import axios from './api';
+import type { EquityCurve, StatsSummary } from '../types';
+
+export interface StatsFilters {
+  symbol?: string;
+  start?: string;
+  end?: string;
+}
+
+export const getStatsSummary = async (token: string, filters: StatsFilters = {}): Promise<StatsSummary> => {
+  const response = await axios.get('/stats/summary', {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+    params: filters,
+  });
+  return response.data;
+};
+
+export interface EquityCurveParams extends StatsFilters {
+  points?: number;
+  max_periods?: number;
+}
+
+export const getEquityCurve = async (token: string, params: EquityCurveParams = {}): Promise<EquityCurve> => {
+  const response = await axios.get('/stats/equity-curve', {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+    params,
+  });
+  return response.data;
+};
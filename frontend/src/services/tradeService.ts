@@ -1,11 +1,62 @@
 import axios from './api';
-import type { Trade } from '../types';
+import type { Order, TradeRebuild, TradeSummary } from '../types';
 
-export const getTrades = async (token: string): Promise<Trade[]> => {
+export interface TradeFilters {
+  symbol?: string;
+  status?: 'OPEN' | 'CLOSED';
+  direction?: 'LONG' | 'SHORT';
+  start?: string;
+  end?: string;
+}
+
+export interface TradesPage {
+  trades: TradeSummary[];
+  nextCursor?: string;
+}
+
+export const getTradesPage = async (
+  token: string,
+  filters: TradeFilters = {},
+  cursor?: string,
+  limit = 500,
+): Promise<TradesPage> => {
   const response = await axios.get('/trades', {
     headers: {
       Authorization: `Bearer ${token}`,
     },
+    // Orders are fetched per trade when needed, see getTradeOrders
+    params: { ...filters, limit, cursor, view: 'summary' },
+  });
+  return { trades: response.data, nextCursor: response.headers['x-next-cursor'] };
+};
+
+// Follows the keyset cursors until every matching trade has been fetched.
+export const getTrades = async (token: string, filters: TradeFilters = {}): Promise<TradeSummary[]> => {
+  const trades: TradeSummary[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await getTradesPage(token, filters, cursor);
+    trades.push(...page.trades);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return trades;
+};
+
+export const getTradeOrders = async (token: string, tradeId: number): Promise<Order[]> => {
+  const response = await axios.get(`/trades/${tradeId}/orders`, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+  });
+  return response.data;
+};
+
+// Replays every order and replaces the trades; manual trades and notes are kept.
+export const rebuildTrades = async (token: string): Promise<TradeRebuild> => {
+  const response = await axios.post('/trades/rebuild', null, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
   });
   return response.data;
 };
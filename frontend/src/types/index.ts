@@ -28,6 +28,7 @@ export interface Trade {
   id: number;
   user_id: number;
   symbol: string;
+  contract_key?: string;
   status: 'OPEN' | 'CLOSED';
   direction: 'LONG' | 'SHORT';
   volume: number;
@@ -40,3 +41,93 @@ export interface Trade {
   notes?: string;
   orders: Order[];
 }
+
+// GET /trades?view=summary: a trade without its orders
+export type TradeSummary = Omit<Trade, 'orders'>;
+
+export interface ImportJobCreated {
+  job_id: string;
+  status_url: string;
+}
+
+export interface TradeRebuild {
+  orders: number;
+  trades: number;
+  open_trades: number;
+  seconds: number;
+}
+
+export interface ImportJob {
+  id: string;
+  filename?: string;
+  stage: 'QUEUED' | 'PARSING' | 'MATCHING' | 'COMPLETED' | 'FAILED';
+  rows_processed: number;
+  duplicates_skipped: number;
+  rows_per_second?: number;
+  error?: string;
+  created_at: string;
+  started_at?: string;
+  finished_at?: string;
+}
+
+export interface PnlStats {
+  trades: number;
+  wins: number;
+  losses: number;
+  breakeven: number;
+  win_rate?: number;
+  net_pnl: number;
+  gross_profit: number;
+  gross_loss: number;
+  profit_factor?: number;
+  expectancy?: number;
+  average_win?: number;
+  average_loss?: number;
+  largest_win?: number;
+  largest_loss?: number;
+}
+
+export interface StatsSummary extends PnlStats {
+  by_direction: Record<'LONG' | 'SHORT', PnlStats>;
+  by_status: Record<'OPEN' | 'CLOSED', number>;
+}
+
+export interface EquityPoint {
+  timestamp: string;
+  equity: number;
+  drawdown: number;
+}
+
+export interface UnderwaterPeriod {
+  start: string;
+  end: string | null;
+  depth: number;
+  trades: number;
+  duration_seconds: number;
+}
+
+export interface EquityCurve {
+  trades: number;
+  net_pnl: number;
+  max_drawdown: number;
+  max_drawdown_at: string | null;
+  longest_drawdown_seconds: number;
+  current_drawdown: number;
+  underwater_periods: UnderwaterPeriod[];
+  points: EquityPoint[];
+}
+
+export interface CalendarDay {
+  date: string;
+  pnl: number;
+  trades: number;
+  wins: number;
+  losses: number;
+}
+
+export interface CalendarMonth {
+  month: string;
+  pnl: number;
+  trades: number;
+  days: CalendarDay[];
+}